@@ -13,7 +13,6 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-import trafilatura
 import requests
 from utils.data_generator import (
     generate_category_health_data, 
@@ -23,6 +22,7 @@ from utils.data_generator import (
     generate_price_trend_data
 )
 from utils.forecasting import simple_forecast, advanced_forecast
+from utils.scenarios import SCENARIOS, simulate_scenario
 from utils.scraper import simulated_web_scrape, get_commodity_prices
 from utils.sidebar_manager import setup_sidebar
 from pages.welcome import render_welcome_page
@@ -585,8 +585,9 @@ with tabs[3]:
         st.markdown("#### Scenario Planning")
         scenario = st.selectbox(
             "Market Scenario",
-            ["Base Case", "High Inflation", "Supply Constraint", "Demand Surge", "Economic Downturn"]
+            list(SCENARIOS)
         )
+        budget_tolerance = st.slider("Budget Tolerance (% above current price)", min_value=0, max_value=50, value=10)
         
         # Generate forecast button
         forecast_button = st.button("Generate Price Forecast", use_container_width=True)
@@ -663,56 +664,36 @@ with tabs[3]:
             # Generate forecast based on scenario
             last_price = price_data['Price'].iloc[-1]
             
-            # Different scenarios affect the forecast
-            if scenario == "Base Case":
-                forecast_trend = 0.005  # 0.5% monthly change
-                volatility = 0.02
-            elif scenario == "High Inflation":
-                forecast_trend = 0.015  # 1.5% monthly increase
-                volatility = 0.03
-            elif scenario == "Supply Constraint":
-                forecast_trend = 0.02  # 2% monthly increase
-                volatility = 0.04
-            elif scenario == "Demand Surge":
-                forecast_trend = 0.025  # 2.5% monthly increase
-                volatility = 0.035
-            elif scenario == "Economic Downturn":
-                forecast_trend = -0.01  # 1% monthly decrease
-                volatility = 0.03
-            
-            # Different forecast models affect the prediction
-            if forecast_model == "Simple Trend":
-                # Simple trend with noise
-                forecast_prices = [last_price * (1 + forecast_trend * (i+1) + np.random.normal(0, volatility)) 
-                                  for i in range(forecast_period)]
-                confidence_high = [price * 1.1 for price in forecast_prices]
-                confidence_low = [price * 0.9 for price in forecast_prices]
-                
-            elif forecast_model == "Seasonal Model":
-                # Add seasonality to the forecast
-                forecast_prices = [last_price * (1 + forecast_trend * (i+1) + 
-                                              0.05 * np.sin(2 * np.pi * (i % 12) / 12) + 
-                                              np.random.normal(0, volatility))
-                                 for i in range(forecast_period)]
-                confidence_high = [price * 1.15 for price in forecast_prices]
-                confidence_low = [price * 0.85 for price in forecast_prices]
-                
-            else:  # Advanced ML Model
-                # More complex pattern with stronger confidence intervals
-                forecast_prices = [last_price * (1 + forecast_trend * (i+1) + 
-                                              0.05 * np.sin(2 * np.pi * (i % 12) / 12) + 
-                                              0.02 * np.sin(2 * np.pi * (i % 4) / 4) +
-                                              np.random.normal(0, volatility * 0.7))
-                                 for i in range(forecast_period)]
-                confidence_high = [price * 1.08 for price in forecast_prices]
-                confidence_low = [price * 0.92 for price in forecast_prices]
+            # 90% prediction interval from the model fitted to the price history:
+            # residual-based for the trend, per-tree spread for the ML model
+            if forecast_model == "Advanced ML Model":
+                model_forecast = advanced_forecast(price_data, forecast_period, interval=0.9)
+            else:
+                model_forecast = simple_forecast(price_data, forecast_period, interval=0.9)
+            model_forecast = model_forecast[model_forecast['Type'] == 'Forecast']
+            # Half-width of a 90% normal interval is 1.645 standard deviations
+            model_sd = ((model_forecast['Upper Bound'] - model_forecast['Lower Bound']) / (2 * 1.645)).to_numpy()
+            
+            # Monte Carlo paths for the scenario, widened by the model's own uncertainty
+            forecast_trend = SCENARIOS[scenario]["trend"]
+            budget_price = last_price * (1 + budget_tolerance / 100)
+            simulation = simulate_scenario(
+                last_price, forecast_dates, scenario, forecast_model,
+                n_paths=20_000, budget=budget_price, model_sd=model_sd
+            )
+            fan = simulation['fan']
+            forecast_prices = fan['P50'].to_numpy()
+            confidence_high = fan['P95'].to_numpy()
+            confidence_low = fan['P5'].to_numpy()
             
             # Create forecast DataFrame
             forecast_df = pd.DataFrame({
                 'Date': forecast_dates,
                 'Price': forecast_prices,
                 'Upper Bound': confidence_high,
-                'Lower Bound': confidence_low
+                'Lower Bound': confidence_low,
+                'Upper Quartile': fan['P75'].to_numpy(),
+                'Lower Quartile': fan['P25'].to_numpy()
             })
             
             # Combine historical and forecast data for visualization
@@ -750,9 +731,27 @@ with tabs[3]:
                 fill='toself',
                 fillcolor='rgba(255, 107, 24, 0.2)',
                 line=dict(color='rgba(255, 107, 24, 0)', width=0),
-                name='Confidence Interval'
+                name='90% Interval'
+            ))
+            
+            fig.add_trace(go.Scatter(
+                x=forecast_df['Date'].tolist() + forecast_df['Date'].tolist()[::-1],
+                y=forecast_df['Upper Quartile'].tolist() + forecast_df['Lower Quartile'].tolist()[::-1],
+                fill='toself',
+                fillcolor='rgba(255, 107, 24, 0.3)',
+                line=dict(color='rgba(255, 107, 24, 0)', width=0),
+                name='50% Interval'
             ))
             
+            # Budget line for the exceedance metrics
+            fig.add_hline(
+                y=budget_price,
+                line_dash="dot",
+                line_color="#d62728",
+                annotation_text=f"Budget (${budget_price:.2f})",
+                annotation_position="bottom right"
+            )
+            
             # Update layout
             fig.update_layout(
                 title=f"{selected_material} Price Forecast - {scenario}",
@@ -808,6 +807,29 @@ with tabs[3]:
                     f"${min_forecast:.2f}", 
                     f"{((min_forecast / last_price) - 1) * 100:.1f}%"
                 )
+            
+            # Budget risk from the simulated paths
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                st.metric(
+                    "Chance Above Budget (Final Month)",
+                    f"{simulation['prob_exceed'].iloc[-1] * 100:.1f}%"
+                )
+            
+            with col2:
+                st.metric(
+                    "Chance Above Budget (Any Month)",
+                    f"{simulation['prob_exceed_any'] * 100:.1f}%"
+                )
+            
+            with col3:
+                st.metric(
+                    "Expected Overrun (Final Month)",
+                    f"${simulation['expected_overrun'].iloc[-1]:.2f}"
+                )
+            
+            st.caption(f"Based on {simulation['n_paths']:,} simulated price paths; the shaded bands are the 50% and 90% ranges.")
                 
             # Add forecast summary
             st.markdown("#### Forecast Summary")
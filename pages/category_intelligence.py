@@ -17,6 +17,8 @@ from utils.data_generator import (
     generate_risk_data
 )
 from utils.scraper import simulated_web_scrape
+from utils.spend_cube import load_spend_cube
+from utils.forecasting import trend_intervals
 
 # Configure page
 st.set_page_config(
@@ -868,28 +870,19 @@ with insights_tab:
             
             forecast_data = []
             
+            # Fitted trend and 90% prediction interval for every component in one pass
+            price_panel = df_prices.pivot(index="Date", columns="Component", values="Price Index")
+            trend_forecast, lower_bound, upper_bound = trend_intervals(price_panel, forecast_range, interval=0.9)
+            
             # Get the last actual prices
             for component in forecast_components:
                 last_actual = df_prices[(df_prices["Component"] == component) & (df_prices["Date"] == end_date)]["Price Index"].values[0]
                 params = components[component]
                 
-                # Baseline forecast (trend only)
-                baseline_forecast = []
-                optimistic_forecast = []
-                pessimistic_forecast = []
-                
-                for i in range(1, forecast_periods + 1):
-                    # Baseline: continue current trend
-                    baseline_price = last_actual * (1 + params["trend"] / 100 * i)
-                    baseline_forecast.append(baseline_price)
-                    
-                    # Optimistic: lower trend
-                    optimistic_price = last_actual * (1 + (params["trend"] - 0.2) / 100 * i)
-                    optimistic_forecast.append(optimistic_price)
-                    
-                    # Pessimistic: higher trend
-                    pessimistic_price = last_actual * (1 + (params["trend"] + 0.7) / 100 * i)
-                    pessimistic_forecast.append(pessimistic_price)
+                # Baseline forecast (fitted trend) and interval bounds
+                baseline_forecast = trend_forecast[component].tolist()
+                optimistic_forecast = lower_bound[component].tolist()
+                pessimistic_forecast = upper_bound[component].tolist()
                 
                 # Add historical data
                 historical = df_prices[df_prices["Component"] == component]
@@ -924,7 +917,7 @@ with insights_tab:
                     go.Scatter(
                         x=forecast_range,
                         y=pessimistic_forecast,
-                        name="Pessimistic",
+                        name="Upper 90% Bound",
                         line=dict(color="#EF4444", width=2, dash="dot"),
                         mode="lines"
                     )
@@ -934,13 +927,13 @@ with insights_tab:
                     go.Scatter(
                         x=forecast_range,
                         y=optimistic_forecast,
-                        name="Optimistic",
+                        name="Lower 90% Bound",
                         line=dict(color="#10B981", width=2, dash="dot"),
                         mode="lines"
                     )
                 )
                 
-                # Add forecast cone (shaded area between optimistic and pessimistic)
+                # Add forecast cone (shaded prediction interval)
                 fig.add_trace(
                     go.Scatter(
                         x=list(forecast_range) + list(forecast_range)[::-1],
@@ -1014,13 +1007,13 @@ with insights_tab:
                     )
                 elif component == "Fuel":
                     forecast_change = round(((baseline_forecast[-1] - last_actual) / last_actual) * 100, 1)
-                    volatility = round(np.std(pessimistic_forecast) / np.mean(pessimistic_forecast) * 100, 1)
+                    volatility = round((pessimistic_forecast[-1] - optimistic_forecast[-1]) / 2 / baseline_forecast[-1] * 100, 1)
                     st.markdown(
                         f"""
                         <div class="insight-card risk">
                             <h4>Fuel Price Risk Alert</h4>
                             <p>
-                                Forecast indicates {forecast_change}% increase in fuel prices with {volatility}% volatility.
+                                Forecast indicates {forecast_change}% increase in fuel prices with a ±{volatility}% 90% prediction interval by month six.
                                 Geopolitical tensions and seasonal demand patterns suggest potential for significant price spikes
                                 in Q3 2025.
                             </p>
@@ -1211,6 +1204,24 @@ with insights_tab:
             
             st.plotly_chart(fig, use_container_width=True)
             
+            # Headline KPIs from the pre-aggregated Heathrow spend ledger
+            try:
+                ledger_kpis = load_spend_cube().kpis()
+                st.markdown(f"### Heathrow Ledger KPIs ({ledger_kpis['month'].strftime('%b %Y')})")
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Month Spend", f"£{ledger_kpis['month_spend']/1e6:.1f}M",
+                              delta=f"{ledger_kpis['yoy_pct']:.1f}% YoY")
+                with col2:
+                    st.metric("Rolling 12M Spend", f"£{ledger_kpis['rolling_12m']/1e6:.0f}M",
+                              delta=f"{ledger_kpis['rolling_12m_change_pct']:.1f}%")
+                with col3:
+                    st.metric("Year to Date", f"£{ledger_kpis['ytd']/1e6:.0f}M")
+                with col4:
+                    st.metric("Categories Tracked", len(load_spend_cube().categories))
+            except Exception as e:
+                st.warning(f"Heathrow spend ledger unavailable: {str(e)}")
+            
             # Spend trend by month
             st.markdown("### Monthly Spend Trend")
             
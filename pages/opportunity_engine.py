@@ -5,8 +5,9 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 
-from utils.data_generator import generate_price_trend_data, generate_contract_data
-from utils.scraper import simulated_web_scrape, get_commodity_prices
+from utils.data_generator import generate_price_trend_data, generate_contract_data, EXPIRING_SOON_DAYS
+from utils.contract_index import ContractIndex
+from utils.scraper import simulated_web_scrape, get_commodity_price_panel, get_commodity_unit
 
 # Configure page
 st.set_page_config(
@@ -331,22 +332,22 @@ with tab2:
     else:
         materials = ["Steel", "Copper", "Aluminum", "Paper Pulp"]
     
+    # Fetch all materials as one aligned panel (Date x material)
+    price_panel = get_commodity_price_panel(materials)
+    
+    # Percentage change from the first price, for every material at once
+    normalized_panel = (price_panel / price_panel.iloc[0] - 1) * 100
+    
     # Create price trend visualization
     fig = go.Figure()
     
     # Plot price trends for each material (normalized to percentage change)
     for material in materials:
-        price_data = get_commodity_prices(material)
-        
-        # Calculate percentage change from first price
-        first_price = price_data["Price"].iloc[0]
-        normalized_prices = (price_data["Price"] / first_price - 1) * 100
-        
         fig.add_trace(go.Scatter(
-            x=price_data["Date"],
-            y=normalized_prices,
+            x=normalized_panel.index,
+            y=normalized_panel[material],
             mode='lines',
-            name=f"{material} ({price_data['Unit']})"
+            name=f"{material} ({get_commodity_unit(material)})"
         ))
     
     fig.update_layout(
@@ -366,10 +367,7 @@ with tab2:
     
     # Find materials with significant price changes
     for material in materials:
-        price_data = get_commodity_prices(material)
-        first_price = price_data["Price"].iloc[0]
-        last_price = price_data["Price"].iloc[-1]
-        change_pct = ((last_price / first_price) - 1) * 100
+        change_pct = normalized_panel[material].iloc[-1]
         
         # If price drop, opportunity to negotiate or spot buy
         if change_pct < -10:
@@ -445,12 +443,20 @@ with tab2:
     else:
         st.info("No high-impact news triggers detected for this category at this time.")
 
+@st.cache_resource(show_spinner=False)
+def load_contracts(as_of):
+    """Contract register and its end-date index, built once per day and shared by every session"""
+    contract_data = generate_contract_data(as_of=as_of)
+    return contract_data, ContractIndex.from_frame(contract_data)
+
 with tab3:
     # Contract opportunities section
     st.markdown("### Contract Opportunity Analysis")
     
-    # Get contract data
-    contract_data = generate_contract_data()
+    # Get contract data, indexed by end date for renewal queries. Status and the
+    # renewal query share one reference date, so they agree on which contracts expire
+    as_of = pd.Timestamp.today().normalize()
+    contract_data, contract_index = load_contracts(as_of)
     
     # Filter contracts related to the selected category
     category_contracts = contract_data[contract_data["Category"] == selected_category]
@@ -507,11 +513,10 @@ with tab3:
     # Contract renewal opportunities
     st.markdown("### Contract Renewal Opportunities")
     
-    # Filter for expiring or expired contracts
-    renewal_opportunities = category_contracts[
-        (category_contracts["Status"] == "Expiring Soon") | 
-        (category_contracts["Status"] == "Expired")
-    ]
+    # Expiring Soon or Expired contracts, via binary search on end date
+    renewal_opportunities = contract_index.expiring_within(
+        EXPIRING_SOON_DAYS, as_of=as_of, category=selected_category, include_expired=True
+    )
     
     if not renewal_opportunities.empty:
         for _, contract in renewal_opportunities.iterrows():
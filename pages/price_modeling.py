@@ -6,8 +6,10 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 
 from utils.data_generator import generate_price_trend_data
-from utils.forecasting import simple_forecast, advanced_forecast, should_cost_model
-from utils.scraper import get_commodity_prices
+from utils.forecasting import simple_forecast, advanced_forecast
+from utils.should_cost import bill_of_materials, simulate_should_cost
+from utils.rng import RNGContext, stable_seed
+from utils.scraper import get_commodity_price_panel, get_commodity_unit
 
 # Configure page
 st.set_page_config(
@@ -40,6 +42,17 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
+# Materials/items offered for each category
+CATEGORY_MATERIALS = {
+    "Electronics": ["Semiconductors", "PCBs", "Displays", "Connectors", "Batteries"],
+    "Raw Materials": ["Steel", "Aluminum", "Copper", "Zinc", "Plastic Resin"],
+    "Packaging": ["Cardboard", "PET", "HDPE", "Plastic Film", "Paper"],
+    "Chemicals": ["Solvents", "Polymers", "Catalysts", "Additives", "Resins"],
+    "Office Supplies": ["Paper", "Toner", "Furniture", "Stationery", "Equipment"],
+    "Logistics": ["Ocean Freight", "Air Freight", "Road Transport", "Warehousing", "Last Mile"],
+}
+DEFAULT_MATERIALS = ["Component A", "Component B", "Component C", "Raw Material X", "Service Y"]
+
 # Sidebar
 with st.sidebar:
     st.markdown("# 💵 Price & Cost Modeling")
@@ -51,20 +64,7 @@ with st.sidebar:
     selected_category = st.selectbox("Category", categories)
     
     # Material/item selector based on category
-    if selected_category == "Electronics":
-        materials = ["Semiconductors", "PCBs", "Displays", "Connectors", "Batteries"]
-    elif selected_category == "Raw Materials":
-        materials = ["Steel", "Aluminum", "Copper", "Zinc", "Plastic Resin"]
-    elif selected_category == "Packaging":
-        materials = ["Cardboard", "PET", "HDPE", "Plastic Film", "Paper"]
-    elif selected_category == "Chemicals":
-        materials = ["Solvents", "Polymers", "Catalysts", "Additives", "Resins"]
-    elif selected_category == "Office Supplies":
-        materials = ["Paper", "Toner", "Furniture", "Stationery", "Equipment"]
-    elif selected_category == "Logistics":
-        materials = ["Ocean Freight", "Air Freight", "Road Transport", "Warehousing", "Last Mile"]
-    else:
-        materials = ["Component A", "Component B", "Component C", "Raw Material X", "Service Y"]
+    materials = CATEGORY_MATERIALS.get(selected_category, DEFAULT_MATERIALS)
     
     selected_material = st.selectbox("Material/Item", materials)
     
@@ -246,42 +246,20 @@ with tab1:
 with tab2:
     st.markdown("### Should-Cost Modeling")
     
-    # Create sample components for should-cost model
-    if selected_material in ["Steel", "Aluminum", "Copper", "Zinc"]:
-        components = {
-            "raw_material": 0.6,
-            "energy": 0.15,
-            "labor": 0.1,
-            "overhead": 0.05,
-            "logistics": 0.05
-        }
-    elif selected_material in ["Semiconductors", "PCBs", "Displays"]:
-        components = {
-            "raw_material": 0.4,
-            "labor": 0.2,
-            "overhead": 0.15,
-            "energy": 0.05,
-            "additives": 0.15
-        }
-    elif selected_material in ["Cardboard", "PET", "HDPE", "Plastic Film", "Paper"]:
-        components = {
-            "raw_material": 0.5,
-            "labor": 0.15,
-            "energy": 0.1,
-            "overhead": 0.1,
-            "packaging": 0.05
-        }
-    else:
-        components = {
-            "raw_material": 0.45,
-            "labor": 0.25,
-            "overhead": 0.15,
-            "energy": 0.1,
-            "logistics": 0.05
-        }
-    
-    # Create should-cost model
-    should_cost = should_cost_model(selected_material, components)
+    # Component weights for the selected material
+    components = bill_of_materials(selected_material)
+    
+    # Monte Carlo should-cost: component costs and markup drawn 5,000 times. The
+    # what-if run below reuses the same draws, so its difference is the adjustment only
+    should_cost_rng = RNGContext(stable_seed(selected_material))
+    simulation = simulate_should_cost({selected_material: components}, n_draws=5000,
+                                      rng_context=should_cost_rng)
+    should_cost = {
+        'material': selected_material,
+        'breakdown': simulation['breakdown'].loc[selected_material].to_dict(),
+        'total_cost': simulation['summary'].loc[selected_material, 'Mean'],
+        'unit': 'per kg'
+    }
     
     # Display should-cost breakdown
     st.markdown(f"#### Should-Cost Model for {selected_material}")
@@ -300,7 +278,7 @@ with tab2:
         cost_df,
         x='Component',
         y='Cost',
-        title=f"Cost Breakdown for {selected_material} (Total: ${should_cost['total_cost']:.2f} {should_cost['unit']})",
+        title=f"Expected Cost Breakdown for {selected_material} (Total: ${should_cost['total_cost']:.2f} {should_cost['unit']})",
         color='Component',
         color_discrete_sequence=px.colors.qualitative.Set2
     )
@@ -323,17 +301,16 @@ with tab2:
     
     # Initialize session state for component adjustments if not exists
     if "component_adjustments" not in st.session_state:
-        st.session_state.component_adjustments = {comp: 0 for comp in components.keys()}
+        st.session_state.component_adjustments = {}
     
     # Create sliders for each component
-    adjusted_costs = {}
     for component, weight in components.items():
         base_cost = should_cost['breakdown'][component]
         adjustment = st.slider(
             f"{component.title()} (Base: ${base_cost:.2f})",
             min_value=-50,
             max_value=50,
-            value=st.session_state.component_adjustments[component],
+            value=st.session_state.component_adjustments.get(component, 0),
             step=5,
             format="%d%%",
             key=f"slider_{component}"
@@ -341,13 +318,17 @@ with tab2:
         
         # Update session state
         st.session_state.component_adjustments[component] = adjustment
-        
-        # Calculate adjusted cost
-        adjusted_cost = base_cost * (1 + adjustment/100)
-        adjusted_costs[component] = adjusted_cost
     
-    # Calculate new total cost
-    new_total_cost = sum(adjusted_costs.values())
+    # Re-simulate with the adjusted component costs (markup included)
+    adjusted = simulate_should_cost(
+        {selected_material: components},
+        n_draws=5000,
+        adjustments={c: st.session_state.component_adjustments.get(c, 0) for c in components},
+        keep_draws=True,
+        rng_context=should_cost_rng
+    )
+    adjusted_summary = adjusted['summary'].loc[selected_material]
+    new_total_cost = adjusted_summary['Mean']
     cost_difference = new_total_cost - should_cost['total_cost']
     percent_change = (cost_difference / should_cost['total_cost']) * 100
     
@@ -368,6 +349,57 @@ with tab2:
         )
         st.markdown('</div>', unsafe_allow_html=True)
     
+    # Cost distribution and sensitivities of the adjusted model
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        fig = px.histogram(
+            adjusted['draws'],
+            x=selected_material,
+            nbins=50,
+            title=f"Should-Cost Distribution ({adjusted['n_draws']:,} draws)",
+            color_discrete_sequence=['#0066cc']
+        )
+        for label in ['P5', 'P50', 'P95']:
+            fig.add_vline(
+                x=adjusted_summary[label],
+                line_dash="dash" if label != 'P50' else "solid",
+                line_color="gray",
+                annotation_text=f"{label}: ${adjusted_summary[label]:.2f}",
+                annotation_position="top"
+            )
+        fig.update_layout(xaxis_title=f"Total Cost ({should_cost['unit']})", yaxis_title="Draws", showlegend=False)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        # Tornado chart: total cost with each driver at its 10th and 90th percentile
+        tornado = adjusted['sensitivity'].iloc[::-1]
+        base_total = tornado['Base'].iloc[0]
+        fig = go.Figure()
+        fig.add_trace(go.Bar(
+            y=tornado['Driver'].str.replace('_', ' ').str.title(),
+            x=tornado['Low'] - base_total,
+            base=base_total,
+            orientation='h',
+            name='Driver at P10',
+            marker_color='#2ca02c'
+        ))
+        fig.add_trace(go.Bar(
+            y=tornado['Driver'].str.replace('_', ' ').str.title(),
+            x=tornado['High'] - base_total,
+            base=base_total,
+            orientation='h',
+            name='Driver at P90',
+            marker_color='#d62728'
+        ))
+        fig.update_layout(
+            title="Cost Sensitivity (Tornado)",
+            barmode='overlay',
+            xaxis_title=f"Total Cost ({should_cost['unit']})",
+            legend=dict(orientation="h", y=-0.2)
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
     # Negotiation recommendations based on should-cost
     st.markdown("### Negotiation Recommendations")
     
@@ -424,6 +456,34 @@ with tab2:
     
     **Recommended Tactics:**
     """ + "\n".join([f"- {tactic}" for tactic in tactics]))
+    
+    # Should-cost for every material in the catalog, evaluated in one batch
+    st.markdown("### Catalog Should-Cost Review")
+    
+    catalog = {}
+    for category, items in CATEGORY_MATERIALS.items():
+        for material in items:
+            catalog.setdefault(material, category)
+    catalog_costs = simulate_should_cost({m: bill_of_materials(m) for m in catalog}, n_draws=5000)['summary']
+    catalog_df = pd.DataFrame({
+        'Material': list(catalog),
+        'Category': list(catalog.values()),
+        'Should-Cost P5': catalog_costs['P5'].to_numpy(),
+        'Should-Cost P50': catalog_costs['P50'].to_numpy(),
+        'Should-Cost P95': catalog_costs['P95'].to_numpy(),
+    })
+    catalog_df = catalog_df.sort_values('Should-Cost P50', ascending=False)
+    
+    st.write("Bill-of-materials should-cost range per material, in $ per unit. Compare quoted prices against the P95 column: quotes above it are hard to justify from component costs.")
+    st.dataframe(
+        catalog_df.style.format({
+            'Should-Cost P5': '${:.2f}',
+            'Should-Cost P50': '${:.2f}',
+            'Should-Cost P95': '${:.2f}'
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
 
 with tab3:
     st.markdown("### Input Cost Analysis")
@@ -455,10 +515,16 @@ with tab3:
     )
     
     if selected_inputs_to_view:
-        # Generate price data for each selected input
+        # Generate price data for all selected inputs in one batch
+        input_panel = get_commodity_price_panel(selected_inputs_to_view)
         input_price_data = {}
         for input_material in selected_inputs_to_view:
-            input_price_data[input_material] = get_commodity_prices(input_material)
+            input_price_data[input_material] = pd.DataFrame({
+                'Date': input_panel.index,
+                'Price': input_panel[input_material].to_numpy(),
+                'Currency': 'USD',
+                'Unit': get_commodity_unit(input_material)
+            })
         
         # Create a combined plot
         fig = go.Figure()
@@ -472,7 +538,7 @@ with tab3:
                 x=data["Date"],
                 y=normalized_prices,
                 mode='lines',
-                name=f"{input_material} ({data['Unit']})"
+                name=f"{input_material} ({get_commodity_unit(input_material)})"
             ))
         
         fig.update_layout(
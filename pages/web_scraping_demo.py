@@ -10,6 +10,8 @@ import os
 # Add the project root to the path so we can import utils
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from utils.scraper import scrape_with_details, scrape_aviation_news
+from utils.datasets import load_dataset
+from utils.risk_matrix import load_risk_matrix
 
 def render_web_scraping_demo():
     """
@@ -565,20 +567,20 @@ def render_web_scraping_demo():
                 if selected_category == "Capital Projects":
                     # Read the capital projects data from the file we created earlier
                     try:
-                        df_projects = pd.read_csv("data/heathrow/financial/capital_projects.csv")
+                        df_projects = load_dataset("capital_projects")
                         
                         # Show the data
                         st.subheader("Heathrow Capital Projects")
-                        st.dataframe(df_projects, use_container_width=True)
+                        st.dataframe(df_projects[["project", "budget", "timeframe", "status"]], use_container_width=True)
                         
                         # Create a visualization
-                        # Convert budget to numeric by removing £ and converting to float
-                        df_projects["budget_numeric"] = df_projects["budget"].str.replace("£", "").str.replace("B", "000M").str.replace("M", "").astype(float)
+                        # Budgets are normalized to numeric amounts at load time; chart in £ millions
+                        df_projects["budget_millions"] = df_projects["budget_amount"] / 1e6
                         
                         # Create bar chart of project budgets
-                        fig = px.bar(df_projects, x="project", y="budget_numeric", 
+                        fig = px.bar(df_projects, x="project", y="budget_millions", 
                                   color="status", title="Heathrow Capital Projects by Budget",
-                                  labels={"budget_numeric": "Budget (£ Million)", "project": "Project"},
+                                  labels={"budget_millions": "Budget (£ Million)", "project": "Project"},
                                   color_discrete_sequence=px.colors.qualitative.Safe)
                         st.plotly_chart(fig, use_container_width=True)
                         
@@ -609,19 +611,14 @@ def render_web_scraping_demo():
                 elif selected_category == "Supplier Risk":
                     # Try to read the supplier risk data
                     try:
-                        df_risks = pd.read_csv("data/heathrow/suppliers/supplier_risks.csv")
+                        df_risks = load_dataset("supplier_risks")
                         
                         # Show the data
                         st.subheader("Supplier Risk Assessment")
                         st.dataframe(df_risks, use_container_width=True)
                         
-                        # Create a heatmap of risk scores by supplier and risk type
-                        pivot_risk = df_risks.pivot_table(
-                            index="Supplier", 
-                            columns="Risk_Type", 
-                            values="Risk_Score",
-                            aggfunc="mean"
-                        )
+                        # Heatmap of risk scores by supplier and risk type, served from the materialized matrix
+                        pivot_risk = load_risk_matrix().heatmap()
                         
                         # Plot the heatmap
                         fig = px.imshow(
@@ -662,7 +659,7 @@ def render_web_scraping_demo():
                 elif selected_category == "Sustainability Targets":
                     # Try to read the sustainability data
                     try:
-                        df_sustainability = pd.read_csv("data/heathrow/sustainability/targets.csv")
+                        df_sustainability = load_dataset("sustainability_targets")
                         
                         # Show the data
                         st.subheader("Heathrow Sustainability Targets")
@@ -712,17 +709,16 @@ def render_web_scraping_demo():
                 elif selected_category == "Market Trends":
                     # Try to read the commodity price data
                     try:
-                        df_prices = pd.read_csv("data/heathrow/market_intel/commodity_prices.csv")
+                        df_prices = load_dataset("commodity_prices")
                         
                         # Show the data
                         st.subheader("Market Price Trends Relevant to Heathrow Procurement")
                         
                         # Filter to just show the latest 12 months for display
-                        df_prices["Date"] = pd.to_datetime(df_prices["Date"])
                         latest_prices = df_prices[df_prices["Date"] >= (datetime.now() - timedelta(days=365))]
                         
                         # Show the data
-                        st.dataframe(latest_prices, use_container_width=True)
+                        st.dataframe(latest_prices[["Date", "Commodity", "Price", "Currency", "Unit"]], use_container_width=True)
                         
                         # Create a line chart of price trends
                         fig = px.line(
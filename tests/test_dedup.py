@@ -0,0 +1,37 @@
+import random
+from utils.dedup import FingerprintIndex
+
+
+def _article(seed, words=400):
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(5000)]
+    return [rng.choice(vocabulary) for _ in range(words)]
+
+
+def test_edited_copy_is_duplicate_and_unrelated_is_not(tmp_path):
+    index = FingerprintIndex(str(tmp_path / "minhash.parquet"))
+    original = _article(1)
+    assert index.check(" ".join(original), "https://a.example/story") == ("new", None)
+
+    # Republished with a wire header and footer, a few words edited and the ending cut
+    edited = list(original)
+    for position in range(0, len(edited), 100):
+        edited[position] = "edited"
+    edited = ["LONDON", "Reuters", "-"] + edited[:380] + ["Reporting", "by", "the", "newsdesk"]
+    assert index.check(" ".join(edited), "https://b.example/copy") == ("duplicate", "https://a.example/story")
+
+    assert index.check(" ".join(_article(2)), "https://c.example/other") == ("new", None)
+    assert index.check(" ".join(original), "https://a.example/story") == ("seen", "https://a.example/story")
+
+    # Survives a save and reload
+    index.save()
+    reloaded = FingerprintIndex(index.path)
+    assert len(reloaded) == 2
+    assert reloaded.check(" ".join(edited), "https://d.example/copy")[0] == "duplicate"
+
+
+def test_empty_texts_are_never_recorded():
+    index = FingerprintIndex()
+    assert index.check("", "a") == ("new", None)
+    assert index.check("", "b") == ("new", None)
+    assert len(index) == 0
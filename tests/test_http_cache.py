@@ -0,0 +1,12 @@
+from utils.http_cache import HttpCache
+
+
+def test_cache_stays_within_budget_during_write_burst(tmp_path):
+    cache = HttpCache(root=str(tmp_path), max_bytes=20_000)
+    for i in range(200):
+        cache.put_extraction(f"{i:032x}", "analyze_page", {"content": "x" * 1_000, "page": i})
+        assert cache.size_bytes() <= cache.max_bytes
+
+    # The most recent extraction survives eviction
+    assert cache.get_extraction(f"{199:032x}", "analyze_page")["page"] == 199
+
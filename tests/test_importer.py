@@ -0,0 +1,49 @@
+import io
+import json
+import pandas as pd
+import utils.datasets
+import utils.importer
+from utils.importer import import_csv_stream, import_json
+
+
+def test_csv_decimal_after_sample_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils.datasets, "IMPORT_ROOT", str(tmp_path))
+    monkeypatch.setattr(utils.importer, "IMPORT_ROOT", str(tmp_path))
+    lines = ["Item,Price,Quantity"] + [f"item{i},{i},{i * 2}" for i in range(50)] + ["late,12.5,"]
+    upload = io.BytesIO("\n".join(lines).encode("utf-8"))
+
+    result = import_csv_stream(upload, "prices", chunk_rows=20, sample_rows=10)
+
+    assert result["rows"] == 51
+    assert result["dtypes"]["Price"] == "float64"
+    df = pd.read_parquet(result["path"])
+    assert df["Price"].iloc[-1] == 12.5
+    assert pd.isna(df["Quantity"].iloc[-1])
+
+
+def test_csv_text_after_numeric_sample_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils.datasets, "IMPORT_ROOT", str(tmp_path))
+    monkeypatch.setattr(utils.importer, "IMPORT_ROOT", str(tmp_path))
+    upload = io.BytesIO(b"a,b\n1,x\n2,y\nfoo,z\n")
+
+    result = import_csv_stream(upload, "mixed", chunk_rows=2, sample_rows=2)
+
+    assert result["rows"] == 3
+    assert result["dtypes"]["a"] == "float64"
+    df = pd.read_parquet(result["path"])
+    assert df["a"].iloc[:2].tolist() == [1.0, 2.0]
+    assert pd.isna(df["a"].iloc[2])
+    assert df["b"].tolist() == ["x", "y", "z"]
+
+
+def test_json_decimal_in_later_chunk(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils.datasets, "IMPORT_ROOT", str(tmp_path))
+    monkeypatch.setattr(utils.importer, "IMPORT_ROOT", str(tmp_path))
+    records = [{"item": f"item{i}", "price": i} for i in range(30)] + [{"item": "late", "price": 12.5}]
+    upload = io.BytesIO("\n".join(json.dumps(r) for r in records).encode("utf-8"))
+
+    result = import_json(upload, "records", chunk_rows=10)
+
+    assert result["rows"] == 31
+    df = pd.read_parquet(result["path"])
+    assert df["price"].iloc[-1] == 12.5
@@ -0,0 +1,343 @@
+"""
+Rolling-origin backtests of the price forecasters.
+
+Every forecaster is refit at a series of forecast origins on the data known
+at that point and scored on the months that follow, alongside its wall time
+and peak memory. Runs offline against the bundled Heathrow commodity prices
+and the synthetic commodity panel. With --startup it also times a cold import
+of the forecasting modules, each in a fresh interpreter.
+
+Usage:
+    python -m utils.backtest --models simple advanced naive --horizon 6 --jobs 4 --output backtest_report
+    python -m utils.backtest --startup --output backtest_report
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import platform
+import tracemalloc
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from utils.forecasting import FORECASTERS
+from utils.datasets import load_dataset
+from utils.scraper import synthesize_price_panel
+
+# Fixed end date for the synthetic panel so reports are comparable between runs
+SYNTHETIC_END_DATE = datetime(2025, 5, 31)
+
+# Modules timed by measure_startup; all are imported when the app starts
+STARTUP_MODULES = ('utils.forecasting', 'utils.scenarios', 'utils.should_cost')
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Extra keyword arguments per forecaster: always time a real fit, never a cache hit
+MODEL_OPTIONS = {
+    'advanced': {'use_cache': False},
+}
+
+
+def naive_forecast(historical_data, periods=6):
+    """Reference forecaster: repeat the last observed price"""
+    last = historical_data['Price'].iloc[-1]
+    return pd.DataFrame({'Date': pd.NaT, 'Price': np.full(periods, last), 'Type': 'Forecast'})
+
+
+# Forecasters the harness can evaluate, by name
+BACKTEST_MODELS = {**FORECASTERS, 'naive': naive_forecast}
+
+
+def load_panels(names=('heathrow', 'synthetic'), months=36):
+    """
+    Wide monthly price panels to backtest on, all built offline.
+
+    Args:
+        names: 'heathrow' (data/heathrow/market_intel/commodity_prices.csv) and/or
+            'synthetic' (the commodity panel behind get_commodity_prices)
+        months: Length of the synthetic panel
+
+    Returns:
+        Dictionary of panel name -> DataFrame indexed by Date, one column per commodity
+    """
+    panels = {}
+    for name in names:
+        if name == 'heathrow':
+            prices = load_dataset('commodity_prices')
+            panels[name] = prices.pivot_table(index='Date', columns='Commodity', values='Price', observed=True)
+        elif name == 'synthetic':
+            panels[name] = synthesize_price_panel(months=months, end_date=SYNTHETIC_END_DATE)
+        else:
+            raise ValueError(f"Unknown panel '{name}'")
+    return panels
+
+
+def rolling_origins(n_obs, min_train, horizon, step=1):
+    """Training lengths at which a full horizon of actuals is still available"""
+    return list(range(min_train, n_obs - horizon + 1, step))
+
+
+def backtest_series(model, series, horizon=6, min_train=12, step=1, track_memory=True):
+    """
+    Rolling-origin evaluation of one forecaster on one series.
+
+    Forecast step h is compared with the h-th observation after the origin,
+    so month-end forecast dates line up with month-start actuals.
+
+    Args:
+        model: Key of BACKTEST_MODELS
+        series: DataFrame with 'Date' and 'Price' columns, oldest first
+        horizon: Months forecast at each origin
+        min_train: Observations in the first training window
+        step: Months between origins
+        track_memory: Also record peak memory of one fit at the largest origin
+            with tracemalloc (Python and NumPy allocations; native buffers inside
+            scikit-learn are not seen). It runs separately because tracing slows
+            allocation-heavy fits by an order of magnitude and would skew timings
+
+    Returns:
+        Dictionary with per-forecast errors, fit count, wall seconds and peak bytes
+    """
+    forecaster = BACKTEST_MODELS[model]
+    options = MODEL_OPTIONS.get(model, {})
+    series = series.dropna().reset_index(drop=True)
+    actual = series['Price'].to_numpy(dtype=float)
+
+    origins = rolling_origins(len(series), min_train, horizon, step)
+    errors = []
+    start_time = time.perf_counter()
+    for origin in origins:
+        result = forecaster(series.iloc[:origin], horizon, **options)
+        predicted = result.loc[result['Type'] == 'Forecast', 'Price'].to_numpy(dtype=float)
+        observed = actual[origin:origin + horizon]
+        errors.append(np.column_stack([np.arange(1, horizon + 1), predicted, observed]))
+    wall_seconds = time.perf_counter() - start_time
+
+    peak_bytes = None
+    if track_memory and origins:
+        tracemalloc.start()
+        try:
+            forecaster(series.iloc[:origins[-1]], horizon, **options)
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'errors': np.vstack(errors) if errors else np.empty((0, 3)),
+        'fits': len(errors),
+        'wall_seconds': wall_seconds,
+        'peak_bytes': peak_bytes,
+    }
+
+
+def _run_task(task):
+    """Worker entry point for one (model, panel, series) backtest"""
+    model, panel_name, series_name, series, options = task
+    result = backtest_series(model, series, **options)
+    result.update(model=model, panel=panel_name, series=series_name)
+    return result
+
+
+def _score(errors):
+    predicted, observed = errors[:, 1], errors[:, 2]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mape = np.nanmean(np.abs((predicted - observed) / observed)) * 100
+    rmse = np.sqrt(np.nanmean((predicted - observed) ** 2))
+    return mape, rmse
+
+
+def run_backtest(models=('simple', 'advanced', 'naive'), panels=None, horizon=6, min_train=12, step=1,
+                 n_jobs=None, track_memory=True):
+    """
+    Backtest several forecasters over every series of every panel.
+
+    Series are fanned out across a process pool (n_jobs=1 runs inline);
+    results come back in task order.
+
+    Args:
+        models: Keys of BACKTEST_MODELS
+        panels: Dictionary from load_panels (defaults to all panels)
+        horizon, min_train, step, track_memory: See backtest_series
+        n_jobs: Worker processes (defaults to the CPU count)
+
+    Returns:
+        (summary DataFrame per model and panel, per-series DataFrame)
+    """
+    unknown = [m for m in models if m not in BACKTEST_MODELS]
+    if unknown:
+        raise ValueError(f"Unknown models: {', '.join(unknown)}. Available: {', '.join(BACKTEST_MODELS)}")
+    panels = load_panels() if panels is None else panels
+
+    options = {'horizon': horizon, 'min_train': min_train, 'step': step, 'track_memory': track_memory}
+    tasks = [
+        (model, panel_name, series_name,
+         pd.DataFrame({'Date': panel.index, 'Price': panel[series_name].to_numpy()}), options)
+        for model in models
+        for panel_name, panel in panels.items()
+        for series_name in panel.columns
+    ]
+
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(tasks)) or 1
+    if n_jobs == 1:
+        results = [_run_task(task) for task in tasks]
+    else:
+        # Spawn rather than fork so workers start from a clean interpreter
+        with ProcessPoolExecutor(max_workers=n_jobs, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = list(executor.map(_run_task, tasks, chunksize=max(1, len(tasks) // (n_jobs * 4))))
+
+    per_series = []
+    for result in results:
+        mape, rmse = _score(result['errors'])
+        per_series.append({
+            'Model': result['model'],
+            'Panel': result['panel'],
+            'Series': result['series'],
+            'Fits': result['fits'],
+            'MAPE %': mape,
+            'RMSE': rmse,
+            'Wall Seconds': result['wall_seconds'],
+            'Peak Memory MB': result['peak_bytes'] / 1e6 if result['peak_bytes'] is not None else np.nan,
+        })
+    per_series = pd.DataFrame(per_series)
+
+    # Pool every forecast of a model and panel before scoring, so long series weigh more
+    summary = []
+    for (model, panel_name), group in pd.DataFrame(results).groupby(['model', 'panel'], sort=False):
+        errors = np.vstack(group['errors'].tolist())
+        mape, rmse = _score(errors)
+        fits = int(group['fits'].sum())
+        wall = float(group['wall_seconds'].sum())
+        summary.append({
+            'Model': model,
+            'Panel': panel_name,
+            'Series': len(group),
+            'Fits': fits,
+            'MAPE %': mape,
+            'RMSE': rmse,
+            'Wall Seconds': wall,
+            'Ms per Fit': wall / fits * 1000 if fits else np.nan,
+            'Peak Memory MB': group['peak_bytes'].astype(float).max() / 1e6 if track_memory else np.nan,
+        })
+    return pd.DataFrame(summary), per_series
+
+
+def measure_startup(modules=STARTUP_MODULES, repeats=3):
+    """
+    Cold import time of each module, each import in a fresh interpreter.
+
+    Args:
+        modules: Dotted module names importable from the repository root
+        repeats: Interpreters started per module; the median is reported
+
+    Returns:
+        DataFrame with the median and fastest import seconds per module and
+        whether the import pulled in scikit-learn
+    """
+    rows = []
+    for module in modules:
+        code = (
+            "import sys, time, warnings\n"
+            "warnings.simplefilter('ignore')\n"
+            "start = time.perf_counter()\n"
+            f"import {module}\n"
+            "print(time.perf_counter() - start, 'sklearn' in sys.modules)"
+        )
+        timings = []
+        for _ in range(repeats):
+            output = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True,
+                                    text=True, check=True).stdout.split()
+            timings.append(float(output[0]))
+        rows.append({
+            'Module': module,
+            'Import Seconds': statistics.median(timings),
+            'Fastest Seconds': min(timings),
+            'Loads scikit-learn': output[1] == 'True',
+        })
+    return pd.DataFrame(rows)
+
+
+def write_report(summary, per_series, output, settings, startup=None):
+    """
+    Write the backtest report as CSV tables plus a JSON file with run metadata.
+
+    Args:
+        output: Path prefix; writes {output}.csv, {output}_series.csv and {output}.json
+        settings: Run parameters recorded alongside the results
+        startup: Optional measure_startup result, also written to {output}_startup.csv
+    """
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    summary.to_csv(f"{output}.csv", index=False)
+    per_series.to_csv(f"{output}_series.csv", index=False)
+
+    metadata = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'cpu_count': os.cpu_count(),
+        'settings': settings,
+        'summary': json.loads(summary.to_json(orient='records')),
+    }
+    if startup is not None:
+        startup.to_csv(f"{output}_startup.csv", index=False)
+        metadata['startup'] = json.loads(startup.to_json(orient='records'))
+    with open(f"{output}.json", "w") as f:
+        json.dump(metadata, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rolling-origin backtest of the price forecasters")
+    parser.add_argument("--models", nargs="+", default=["simple", "advanced", "naive"], choices=sorted(BACKTEST_MODELS))
+    parser.add_argument("--panels", nargs="+", default=["heathrow", "synthetic"], choices=["heathrow", "synthetic"])
+    parser.add_argument("--months", type=int, default=36, help="Length of the synthetic panel")
+    parser.add_argument("--horizon", type=int, default=6, help="Months forecast at each origin")
+    parser.add_argument("--min-train", type=int, default=12, help="Observations in the first training window")
+    parser.add_argument("--step", type=int, default=1, help="Months between forecast origins")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the traced peak-memory fit")
+    parser.add_argument("--startup", action="store_true", help="Also time cold imports of the forecasting modules")
+    parser.add_argument("--output", default=None, help="Path prefix for the CSV/JSON report")
+    args = parser.parse_args(argv)
+
+    settings = {
+        'models': args.models,
+        'panels': args.panels,
+        'months': args.months,
+        'horizon': args.horizon,
+        'min_train': args.min_train,
+        'step': args.step,
+        'jobs': args.jobs,
+        'track_memory': not args.no_memory,
+        'startup': args.startup,
+    }
+    startup = measure_startup() if args.startup else None
+    summary, per_series = run_backtest(
+        models=args.models,
+        panels=load_panels(args.panels, months=args.months),
+        horizon=args.horizon,
+        min_train=args.min_train,
+        step=args.step,
+        n_jobs=args.jobs,
+        track_memory=not args.no_memory
+    )
+
+    with pd.option_context('display.width', 160, 'display.max_columns', None):
+        print(summary.round(3).to_string(index=False))
+        if startup is not None:
+            print("\nCold import times")
+            print(startup.round(3).to_string(index=False))
+    if args.output:
+        write_report(summary, per_series, args.output, settings, startup)
+        print(f"\nReport written to {args.output}.csv, {args.output}_series.csv and {args.output}.json")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
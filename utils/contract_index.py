@@ -0,0 +1,232 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from utils.datasets import load_dataset, dataset_path
+
+# Column names used inside the index
+_COLUMNS = ['Contract ID', 'Supplier', 'Category', 'Start Date', 'End Date', 'Value']
+
+# Column mapping for the bundled Heathrow register (major_contracts.csv)
+HEATHROW_CONTRACT_COLUMNS = {
+    'contract_name': 'Contract ID',
+    'supplier': 'Supplier',
+    'category': 'Category',
+    'start_date': 'Start Date',
+    'end_date': 'End Date',
+    'value_amount': 'Value',
+}
+
+
+class _Buckets:
+    """Row positions grouped by key, each group kept in end-date order"""
+
+    def __init__(self, keys, sorted_end):
+        codes, self.labels = pd.factorize(keys, sort=False)
+        self.lookup = {label: i for i, label in enumerate(self.labels)}
+        # Stable sort by key keeps the global end-date order inside each bucket
+        self.positions = np.argsort(codes, kind='stable')
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(self.labels)))])
+        self.ends = sorted_end[self.positions]
+
+    def slice(self, key):
+        """Return (positions, end dates) for one key, both in end-date order"""
+        i = self.lookup.get(key)
+        if i is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype='datetime64[ns]')
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        return self.positions[lo:hi], self.ends[lo:hi]
+
+
+class ContractIndex:
+    """
+    Contract register indexed by end date.
+
+    Contracts are sorted once by end date and bucketed by supplier and by
+    category, so "expiring in the next N days", supplier overlap and
+    value-at-risk queries are binary searches over sorted arrays instead of
+    per-row scans.
+    """
+
+    def __init__(self, contracts):
+        """
+        Args:
+            contracts: DataFrame with at least Contract ID, Supplier, Category,
+                Start Date, End Date and Value columns (see from_frame for other
+                layouts); any other columns are carried along
+        """
+        missing = [c for c in _COLUMNS if c not in contracts.columns]
+        if missing:
+            raise ValueError(f"Contract register is missing columns: {', '.join(missing)}")
+        contracts = contracts.copy()
+        contracts['Start Date'] = pd.to_datetime(contracts['Start Date'])
+        contracts['End Date'] = pd.to_datetime(contracts['End Date'])
+        contracts['Value'] = pd.to_numeric(contracts['Value'], errors='coerce').fillna(0.0)
+
+        order = np.argsort(contracts['End Date'].to_numpy(dtype='datetime64[ns]'), kind='stable')
+        self.contracts = contracts.iloc[order].reset_index(drop=True)
+        self._end = self.contracts['End Date'].to_numpy(dtype='datetime64[ns]')
+        self._start = self.contracts['Start Date'].to_numpy(dtype='datetime64[ns]')
+        self._value = self.contracts['Value'].to_numpy(dtype=float)
+        self._cumulative_value = np.concatenate([[0.0], np.cumsum(self._value)])
+        self._by_supplier = _Buckets(self.contracts['Supplier'].to_numpy(dtype=object), self._end)
+        self._by_category = _Buckets(self.contracts['Category'].to_numpy(dtype=object), self._end)
+
+    @classmethod
+    def from_frame(cls, df, columns=None):
+        """
+        Build an index from any contract register.
+
+        Args:
+            df: Contract rows
+            columns: Mapping from the frame's column names to the index columns;
+                a missing Contract ID is filled with the row number
+        """
+        df = df.rename(columns=columns or {})
+        if 'Contract ID' not in df.columns:
+            df = df.assign(**{'Contract ID': np.arange(len(df))})
+        return cls(df)
+
+    @classmethod
+    def from_frames(cls, frames):
+        """Build one index over several registers, given as (frame, columns) pairs"""
+        parts = [df.rename(columns=columns or {}) for df, columns in frames]
+        return cls.from_frame(pd.concat([p[[c for c in _COLUMNS if c in p.columns]] for p in parts],
+                                        ignore_index=True))
+
+    def __len__(self):
+        return len(self.contracts)
+
+    @staticmethod
+    def _as_datetime(value):
+        return np.datetime64(pd.Timestamp(value).to_datetime64(), 'ns')
+
+    def _candidates(self, supplier=None, category=None):
+        """Positions and end dates of the smallest applicable bucket"""
+        if supplier is not None:
+            positions, ends = self._by_supplier.slice(supplier)
+            if category is not None:
+                keep = self.contracts['Category'].to_numpy(dtype=object)[positions] == category
+                positions, ends = positions[keep], ends[keep]
+            return positions, ends
+        if category is not None:
+            return self._by_category.slice(category)
+        return None, self._end
+
+    def ending_between(self, start=None, end=None, supplier=None, category=None):
+        """
+        Contracts whose end date falls in [start, end].
+
+        Args:
+            start, end: Window bounds (open-ended when None)
+            supplier, category: Restrict to one bucket
+
+        Returns:
+            DataFrame of matching contracts in end-date order
+        """
+        positions, ends = self._candidates(supplier, category)
+        lo = 0 if start is None else np.searchsorted(ends, self._as_datetime(start), side='left')
+        hi = len(ends) if end is None else np.searchsorted(ends, self._as_datetime(end), side='right')
+        rows = np.arange(lo, hi) if positions is None else positions[lo:hi]
+        return self.contracts.iloc[rows]
+
+    def expiring_within(self, days, as_of=None, supplier=None, category=None, include_expired=False):
+        """
+        Contracts with fewer than N whole days to expiry.
+
+        The window is [as_of, as_of + days), so a contract with exactly N days
+        left is not included, matching a "Days to Expiry < N" status rule.
+
+        Args:
+            days: Look-ahead window in days
+            as_of: Reference date (defaults to now)
+            supplier, category: Restrict to one bucket
+            include_expired: Also return contracts that have already ended
+
+        Returns:
+            DataFrame of matching contracts with a Days to Expiry column
+        """
+        as_of = pd.Timestamp.now() if as_of is None else pd.Timestamp(as_of)
+        positions, ends = self._candidates(supplier, category)
+        lo = 0 if include_expired else np.searchsorted(ends, self._as_datetime(as_of), side='left')
+        hi = np.searchsorted(ends, self._as_datetime(as_of + pd.Timedelta(days=days)), side='left')
+        rows = np.arange(lo, hi) if positions is None else positions[lo:hi]
+        result = self.contracts.iloc[rows].copy()
+        result['Days to Expiry'] = (result['End Date'] - as_of).dt.days
+        return result
+
+    def overlapping(self, supplier, start=None, end=None):
+        """
+        Contracts with one supplier that overlap in time.
+
+        With a window, returns the supplier's contracts active at any point in
+        [start, end]. Without one, returns the supplier's contracts that overlap
+        at least one of its other contracts (consolidation candidates).
+        """
+        positions, ends = self._by_supplier.slice(supplier)
+        if start is not None or end is not None:
+            # Contracts still running at the window start: binary search on end date
+            lo = 0 if start is None else np.searchsorted(ends, self._as_datetime(start), side='left')
+            positions = positions[lo:]
+            if end is not None:
+                positions = positions[self._start[positions] <= self._as_datetime(end)]
+            return self.contracts.iloc[np.sort(positions)]
+
+        # Sweep in start-date order: a contract overlaps an earlier one when it starts
+        # before the latest end seen so far, and a later one when the next contract
+        # starts before it ends
+        by_start = positions[np.argsort(self._start[positions], kind='stable')]
+        starts, finishes = self._start[by_start], self._end[by_start]
+        overlaps = np.zeros(len(by_start), dtype=bool)
+        if len(by_start) > 1:
+            running_end = np.maximum.accumulate(finishes)
+            overlaps[1:] |= starts[1:] <= running_end[:-1]
+            overlaps[:-1] |= starts[1:] <= finishes[:-1]
+        return self.contracts.iloc[np.sort(by_start[overlaps])]
+
+    def value_at_risk_by_quarter(self, start=None, quarters=4, category=None, supplier=None):
+        """
+        Total contract value expiring in each quarter.
+
+        Args:
+            start: First quarter (defaults to the current quarter)
+            quarters: Number of quarters to report
+            category, supplier: Restrict to one bucket
+
+        Returns:
+            DataFrame with Quarter, Contracts and Value at Risk columns
+        """
+        first = pd.Timestamp.now() if start is None else pd.Timestamp(start)
+        periods = pd.period_range(first.to_period('Q'), periods=quarters, freq='Q')
+        bounds = np.append(periods.start_time.to_numpy(dtype='datetime64[ns]'),
+                           (periods[-1] + 1).start_time.to_datetime64())
+
+        positions, ends = self._candidates(supplier, category)
+        edges = np.searchsorted(ends, bounds, side='left')
+        if positions is None:
+            cumulative = self._cumulative_value
+        else:
+            cumulative = np.concatenate([[0.0], np.cumsum(self._value[positions])])
+
+        return pd.DataFrame({
+            'Quarter': periods.astype(str),
+            'Contracts': np.diff(edges),
+            'Value at Risk': np.diff(cumulative[edges]),
+        })
+
+
+# Process-wide index over major_contracts.csv: (source mtime, ContractIndex)
+_index_cache = {}
+_index_lock = threading.Lock()
+
+
+def load_contract_index():
+    """Return the contract index for major_contracts.csv, rebuilt only when the file changes"""
+    source_mtime = os.path.getmtime(dataset_path("major_contracts"))
+    with _index_lock:
+        cached = _index_cache.get("major_contracts")
+        if cached is not None and cached[0] == source_mtime:
+            return cached[1]
+        index = ContractIndex.from_frame(load_dataset("major_contracts"), columns=HEATHROW_CONTRACT_COLUMNS)
+        _index_cache["major_contracts"] = (source_mtime, index)
+        return index
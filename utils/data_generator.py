@@ -1,10 +1,14 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from utils.rng import resolve_rng
 
-def generate_category_health_data(category):
+# Contracts with fewer than this many days left are "Expiring Soon"
+EXPIRING_SOON_DAYS = 90
+
+def generate_category_health_data(category, rng_context=None):
     """Generate mock category health score trend data"""
-    np.random.seed(hash(category) % 100)  # Consistent seed based on category
+    rng = resolve_rng(rng_context, "category_health", category)  # Consistent seed based on category
     
     # Generate dates for the last 12 months
     end_date = datetime.now()
@@ -12,53 +16,47 @@ def generate_category_health_data(category):
     dates = pd.date_range(start=start_date, end=end_date, freq='M')
     
     # Generate health scores with some trend and noise
-    base_score = np.random.randint(70, 85)
-    trend = np.random.choice([-0.2, 0, 0.3])  # Downward, flat, or upward trend
-    noise = np.random.normal(0, 3, size=len(dates))
+    base_score = rng.integers(70, 85)
+    trend = rng.choice([-0.2, 0, 0.3])  # Downward, flat, or upward trend
+    noise = rng.normal(0, 3, size=len(dates))
     
-    scores = [
-        min(100, max(0, base_score + trend * i + noise[i]))
-        for i in range(len(dates))
-    ]
+    scores = np.clip(base_score + trend * np.arange(len(dates)) + noise, 0, 100)
     
     return pd.DataFrame({
         'Date': dates,
         'Health Score': scores
     })
 
-def generate_supplier_data(category):
+def generate_supplier_data(category, rng_context=None):
     """Generate mock supplier data for quadrant analysis"""
-    np.random.seed(hash(category) % 100)  # Consistent seed based on category
+    rng = resolve_rng(rng_context, "supplier", category)  # Consistent seed based on category
     
     # Number of suppliers varies by category
-    n_suppliers = np.random.randint(8, 15)
+    n_suppliers = rng.integers(8, 15)
     
     suppliers = [f"Supplier {i+1}" for i in range(n_suppliers)]
     
     # Generate risk scores (0-10, higher is worse)
-    risk = np.random.uniform(1, 9, size=n_suppliers)
+    risk = rng.uniform(1, 9, size=n_suppliers)
     
     # Generate performance scores (0-10, higher is better)
-    performance = np.random.uniform(1, 9, size=n_suppliers)
+    performance = rng.uniform(1, 9, size=n_suppliers)
     
     # Generate spend amounts
-    spend = np.random.uniform(100000, 5000000, size=n_suppliers)
+    spend = rng.uniform(100000, 5000000, size=n_suppliers)
     
     # Assign tiers based on spend
-    spend_sorted = sorted(spend, reverse=True)
+    spend_sorted = np.sort(spend)[::-1]
     tier_cutoffs = [
-        spend_sorted[min(len(spend_sorted)-1, int(n_suppliers * 0.2))],  # Top 20%
-        spend_sorted[min(len(spend_sorted)-1, int(n_suppliers * 0.5))]   # Top 50%
+        spend_sorted[min(n_suppliers - 1, int(n_suppliers * 0.2))],  # Top 20%
+        spend_sorted[min(n_suppliers - 1, int(n_suppliers * 0.5))]   # Top 50%
     ]
     
-    tiers = []
-    for s in spend:
-        if s >= tier_cutoffs[0]:
-            tiers.append("Tier 1")
-        elif s >= tier_cutoffs[1]:
-            tiers.append("Tier 2")
-        else:
-            tiers.append("Tier 3")
+    tiers = np.select(
+        [spend >= tier_cutoffs[0], spend >= tier_cutoffs[1]],
+        ["Tier 1", "Tier 2"],
+        default="Tier 3"
+    )
     
     return pd.DataFrame({
         'Supplier': suppliers,
@@ -68,26 +66,26 @@ def generate_supplier_data(category):
         'Tier': tiers
     })
 
-def generate_spend_data(category):
+def generate_spend_data(category, rng_context=None):
     """Generate mock spend data for pie charts"""
-    np.random.seed(hash(category) % 100)  # Consistent seed based on category
+    rng = resolve_rng(rng_context, "spend", category)  # Consistent seed based on category
     
     # Generate between 5-8 suppliers
-    n_suppliers = np.random.randint(5, 9)
+    n_suppliers = rng.integers(5, 9)
     suppliers = [f"Supplier {i+1}" for i in range(n_suppliers)]
     
     # Generate spend following a power law distribution
-    spend_raw = np.random.power(0.5, size=n_suppliers)
-    spend = spend_raw / np.sum(spend_raw) * np.random.randint(5000000, 20000000)
+    spend_raw = rng.power(0.5, size=n_suppliers)
+    spend = spend_raw / np.sum(spend_raw) * rng.integers(5000000, 20000000)
     
     return pd.DataFrame({
         'Supplier': suppliers,
         'Spend': spend
     }).sort_values('Spend', ascending=False)
 
-def generate_risk_data(category):
+def generate_risk_data(category, rng_context=None):
     """Generate mock risk heatmap data"""
-    np.random.seed(hash(category) % 100)  # Consistent seed based on category
+    rng = resolve_rng(rng_context, "risk", category)  # Consistent seed based on category
     
     # Risk categories
     risk_categories = [
@@ -100,16 +98,16 @@ def generate_risk_data(category):
     suppliers = [f"Supplier {i+1}" for i in range(n_suppliers)]
     
     # Generate risk matrix (0-10, higher is worse)
-    risk_matrix = np.random.uniform(1, 9, size=(n_suppliers, len(risk_categories)))
+    risk_matrix = rng.uniform(1, 9, size=(n_suppliers, len(risk_categories)))
     
     # Create DataFrame
     df = pd.DataFrame(risk_matrix, columns=risk_categories, index=suppliers)
     
     return df
 
-def generate_price_trend_data(category, material):
+def generate_price_trend_data(category, material, rng_context=None):
     """Generate mock price trend data for forecasting"""
-    np.random.seed(hash(f"{category}_{material}") % 100)  # Consistent seed
+    rng = resolve_rng(rng_context, "price_trend", category, material)  # Consistent seed
     
     # Generate dates for the last 24 months
     end_date = datetime.now()
@@ -119,98 +117,90 @@ def generate_price_trend_data(category, material):
     # Base price (adjusted for aviation materials)
     if category == "Aviation":
         if material in ["Jet Fuel", "Titanium", "Carbon Fiber", "Avionics"]:
-            base_price = np.random.uniform(300, 1200)  # Higher base price for aviation materials
+            base_price = rng.uniform(300, 1200)  # Higher base price for aviation materials
         else:
-            base_price = np.random.uniform(500, 800)
+            base_price = rng.uniform(500, 800)
     else:
-        base_price = np.random.uniform(50, 500)
+        base_price = rng.uniform(50, 500)
     
     # Generate price with trend, seasonality, and noise
     # Different trend types, aviation tends to have more volatility
     if category == "Aviation":
-        trend = np.random.choice([-0.8, 0.1, 1.2])  
-        seasonality_factor = np.random.uniform(0.08, 0.25)  # More seasonal effects
-        noise_factor = np.random.uniform(0.03, 0.15)  # More volatility
+        trend = rng.choice([-0.8, 0.1, 1.2])  
+        seasonality_factor = rng.uniform(0.08, 0.25)  # More seasonal effects
+        noise_factor = rng.uniform(0.03, 0.15)  # More volatility
     else:
-        trend = np.random.choice([-0.5, 0.2, 0.8])
-        seasonality_factor = np.random.uniform(0.05, 0.2)
-        noise_factor = np.random.uniform(0.01, 0.1)
-    
-    prices = []
-    for i, date in enumerate(dates):
-        # Trend component
-        trend_component = trend * i
-        
-        # Seasonality component (yearly cycle)
-        month = date.month
-        seasonality = np.sin(2 * np.pi * month / 12) * seasonality_factor * base_price
-        
-        # Random noise
-        noise = np.random.normal(0, noise_factor * base_price)
-        
-        # Calculate price
-        price = base_price + trend_component + seasonality + noise
-        prices.append(max(0.1, price))  # Ensure price is positive
+        trend = rng.choice([-0.5, 0.2, 0.8])
+        seasonality_factor = rng.uniform(0.05, 0.2)
+        noise_factor = rng.uniform(0.01, 0.1)
+    
+    # Trend, yearly seasonality and noise for every month at once
+    trend_component = trend * np.arange(len(dates))
+    seasonality = np.sin(2 * np.pi * dates.month.to_numpy() / 12) * seasonality_factor * base_price
+    noise = rng.normal(0, noise_factor * base_price, size=len(dates))
+    
+    prices = np.maximum(0.1, base_price + trend_component + seasonality + noise)  # Ensure price is positive
     
     return pd.DataFrame({
         'Date': dates,
         'Price': prices
     })
 
-def generate_supplier_details():
+def generate_supplier_details(rng_context=None):
     """Generate detailed supplier information"""
+    rng = resolve_rng(rng_context, "supplier_details", reproducible=False)
     suppliers = []
     
     for i in range(10):
         # Basic info
         supplier = {
             'name': f"Supplier {i+1}",
-            'tier': np.random.choice(["Tier 1", "Tier 2", "Tier 3"]),
-            'location': np.random.choice([
+            'tier': rng.choice(["Tier 1", "Tier 2", "Tier 3"]),
+            'location': rng.choice([
                 "United States", "China", "Germany", "Japan", 
                 "South Korea", "France", "United Kingdom", "India"
             ]),
-            'spend': np.random.randint(50000, 5000000),
-            'categories': np.random.choice([
+            'spend': rng.integers(50000, 5000000),
+            'categories': rng.choice([
                 "Raw Materials", "Electronics", "Packaging",
                 "Services", "Logistics", "MRO"
-            ], size=np.random.randint(1, 3)).tolist(),
+            ], size=rng.integers(1, 3)).tolist(),
             
             # Financial metrics
-            'revenue': f"${np.random.randint(1, 100)}B",
-            'profit_margin': f"{np.random.randint(5, 25)}%",
-            'market_share': f"{np.random.randint(1, 30)}%",
+            'revenue': f"${rng.integers(1, 100)}B",
+            'profit_margin': f"{rng.integers(5, 25)}%",
+            'market_share': f"{rng.integers(1, 30)}%",
             
             # Risk metrics
-            'financial_risk': np.random.randint(1, 10),
-            'supply_risk': np.random.randint(1, 10),
-            'geo_risk': np.random.randint(1, 10),
-            'overall_risk': np.random.randint(1, 10),
+            'financial_risk': rng.integers(1, 10),
+            'supply_risk': rng.integers(1, 10),
+            'geo_risk': rng.integers(1, 10),
+            'overall_risk': rng.integers(1, 10),
             
             # ESG metrics
-            'esg_score': np.random.randint(30, 95),
-            'carbon_footprint': f"{np.random.randint(10000, 1000000)} tons CO2e",
+            'esg_score': rng.integers(30, 95),
+            'carbon_footprint': f"{rng.integers(10000, 1000000)} tons CO2e",
             
             # Performance metrics
-            'quality_score': np.random.randint(60, 98),
-            'on_time_delivery': f"{np.random.randint(70, 99)}%",
-            'defect_rate': f"{np.random.uniform(0.1, 5):.1f}%",
+            'quality_score': rng.integers(60, 98),
+            'on_time_delivery': f"{rng.integers(70, 99)}%",
+            'defect_rate': f"{rng.uniform(0.1, 5):.1f}%",
             
             # Relationship metrics
-            'years_of_relationship': np.random.randint(1, 20),
-            'contracts': np.random.randint(1, 5)
+            'years_of_relationship': rng.integers(1, 20),
+            'contracts': rng.integers(1, 5)
         }
         
         suppliers.append(supplier)
     
     return suppliers
 
-def generate_contract_data():
-    """Generate mock contract data"""
-    np.random.seed(42)  # Fixed seed for consistent data
+def generate_contract_data(rng_context=None, as_of=None):
+    """Generate mock contract data, with Status and Days to Expiry relative to as_of (defaults to now)"""
+    rng = resolve_rng(rng_context, "contracts")  # Fixed stream for consistent data
     
     # Generate between 15-25 contracts
-    n_contracts = np.random.randint(15, 26)
+    n_contracts = rng.integers(15, 26)
     
     categories = ["Electronics", "Raw Materials", "Packaging", "Office Supplies", 
                  "IT Services", "Logistics", "Chemicals", "Machinery"]
@@ -218,36 +208,26 @@ def generate_contract_data():
     suppliers = [f"Supplier {i+1}" for i in range(15)]
     
     # Contract start dates in the past 2 years
-    now = datetime.now()
-    start_dates = [now - timedelta(days=np.random.randint(30, 730)) for _ in range(n_contracts)]
+    now = pd.Timestamp.now() if as_of is None else pd.Timestamp(as_of)
+    start_dates = now - pd.to_timedelta(rng.integers(30, 730, size=n_contracts), unit='D')
     
     # Contract durations between 6 months and 3 years
-    durations = [np.random.randint(180, 1095) for _ in range(n_contracts)]
-    
-    # Calculate end dates
-    end_dates = [start + timedelta(days=duration) for start, duration in zip(start_dates, durations)]
+    end_dates = start_dates + pd.to_timedelta(rng.integers(180, 1095, size=n_contracts), unit='D')
     
     # Contract values
-    values = [np.random.randint(50000, 5000000) for _ in range(n_contracts)]
+    values = rng.integers(50000, 5000000, size=n_contracts)
     
     # Renewal status
-    days_to_expiry = [(end - now).days for end in end_dates]
-    status = []
-    for days in days_to_expiry:
-        if days < 0:
-            status.append("Expired")
-        elif days < 90:
-            status.append("Expiring Soon")
-        else:
-            status.append("Active")
+    days_to_expiry = (end_dates - now).days
+    status = np.select([days_to_expiry < 0, days_to_expiry < EXPIRING_SOON_DAYS], ["Expired", "Expiring Soon"], default="Active")
     
     # Create DataFrame
     return pd.DataFrame({
-        'Contract ID': [f"CTR-{np.random.randint(1000, 9999)}" for _ in range(n_contracts)],
-        'Supplier': np.random.choice(suppliers, size=n_contracts),
-        'Category': np.random.choice(categories, size=n_contracts),
-        'Start Date': [d.strftime('%Y-%m-%d') for d in start_dates],
-        'End Date': [d.strftime('%Y-%m-%d') for d in end_dates],
+        'Contract ID': np.char.mod('CTR-%d', rng.integers(1000, 9999, size=n_contracts)),
+        'Supplier': rng.choice(suppliers, size=n_contracts),
+        'Category': rng.choice(categories, size=n_contracts),
+        'Start Date': start_dates.strftime('%Y-%m-%d'),
+        'End Date': end_dates.strftime('%Y-%m-%d'),
         'Value': values,
         'Status': status,
         'Days to Expiry': days_to_expiry
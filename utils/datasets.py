@@ -0,0 +1,200 @@
+import os
+import threading
+import logging
+import pandas as pd
+from utils.normalization import normalize_frame
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Root of the bundled Heathrow extracts and of the columnar copies derived from them
+DATA_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'heathrow'))
+COLUMNAR_ROOT = os.path.join(DATA_ROOT, '.columnar')
+
+# Columnar datasets written by the upload importer (utils.importer)
+IMPORT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'imports'))
+
+# Bump when the typing or normalization below changes so stale Parquet copies are ignored
+COLUMNAR_VERSION = 2
+
+# Registered datasets: relative CSV path plus the typing and normalization applied
+# when the CSV is parsed ("money" and "units" columns go through utils.normalization)
+DATASETS = {
+    "major_contracts": {
+        "path": "contracts/major_contracts.csv",
+        "parse_dates": ["start_date", "end_date"],
+        "categories": ["supplier", "category", "status"],
+        "money": ["value"],
+    },
+    "capital_projects": {
+        "path": "financial/capital_projects.csv",
+        "parse_dates": [],
+        "categories": ["status"],
+        "money": ["budget"],
+    },
+    "historical_spend": {
+        "path": "financial/historical_spend.csv",
+        "parse_dates": ["Date"],
+        "categories": ["Category", "Currency"],
+    },
+    "commodity_prices": {
+        "path": "market_intel/commodity_prices.csv",
+        "parse_dates": ["Date"],
+        "categories": ["Commodity", "Currency", "Unit"],
+        "units": ["Unit"],
+    },
+    "intelligence_items": {
+        "path": "market_intel/intelligence_items.csv",
+        "parse_dates": ["date"],
+        "categories": ["source", "category"],
+    },
+    "major_suppliers": {
+        "path": "suppliers/major_suppliers.csv",
+        "parse_dates": [],
+        "categories": ["category", "relationship"],
+    },
+    "supplier_risks": {
+        "path": "suppliers/supplier_risks.csv",
+        "parse_dates": ["Last_Assessment"],
+        "categories": ["Supplier", "Category", "Risk_Type"],
+    },
+    "sustainability_targets": {
+        "path": "sustainability/targets.csv",
+        "parse_dates": [],
+        "categories": ["area"],
+    },
+}
+
+# Process-wide cache shared by every Streamlit session: name -> (source mtime, DataFrame)
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def dataset_path(name):
+    """Return the absolute CSV path for a registered dataset"""
+    if name not in DATASETS:
+        raise KeyError(f"Unknown dataset '{name}'. Available: {', '.join(sorted(DATASETS))}")
+    return os.path.join(DATA_ROOT, DATASETS[name]["path"])
+
+
+def columnar_path(name):
+    """Return the path of the Parquet copy for a registered dataset"""
+    return os.path.join(COLUMNAR_ROOT, f"{name}.v{COLUMNAR_VERSION}.parquet")
+
+
+def _parse_csv(name):
+    """Parse the source CSV once, normalize money/unit strings and apply the registered column types"""
+    spec = DATASETS[name]
+    df = pd.read_csv(dataset_path(name), parse_dates=spec["parse_dates"] or False)
+    df = normalize_frame(df, money=spec.get("money"), units=spec.get("units"))
+    for column in spec["categories"]:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    return df
+
+
+def _read_columnar(name, source_mtime):
+    """Read the Parquet copy if it exists and is at least as new as the CSV"""
+    path = columnar_path(name)
+    try:
+        if os.path.getmtime(path) < source_mtime:
+            return None
+        return pd.read_parquet(path)
+    except (OSError, ImportError, ValueError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logger.warning(f"Ignoring columnar copy of {name}: {str(e)}")
+        return None
+
+
+def _write_columnar(name, df):
+    """Persist a typed Parquet copy; failures only cost a re-parse on the next cold start"""
+    path = columnar_path(name)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(COLUMNAR_ROOT, exist_ok=True)
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except (OSError, ImportError, ValueError) as e:
+        logger.warning(f"Could not write columnar copy of {name}: {str(e)}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_dataset(name):
+    """
+    Load a registered Heathrow dataset through the process-wide cache.
+
+    The CSV is parsed at most once per modification: the typed result is written
+    to a Parquet copy under data/heathrow/.columnar and kept in memory keyed on the
+    CSV mtime, so later calls from any session are a dictionary lookup.
+
+    Args:
+        name: Dataset name, one of DATASETS
+
+    Returns:
+        DataFrame sharing its column data with the cache. Adding or replacing
+        columns is safe; modify values in place only on an explicit .copy().
+    """
+    source_mtime = os.path.getmtime(dataset_path(name))
+
+    with _cache_lock:
+        cached = _cache.get(name)
+    if cached is not None and cached[0] == source_mtime:
+        return cached[1].copy(deep=False)
+
+    df = _read_columnar(name, source_mtime)
+    if df is None:
+        df = _parse_csv(name)
+        _write_columnar(name, df)
+        logger.info(f"Converted {DATASETS[name]['path']} to columnar format ({len(df)} rows)")
+
+    with _cache_lock:
+        _cache[name] = (source_mtime, df)
+    return df.copy(deep=False)
+
+
+def clear_dataset_cache(name=None):
+    """Drop one dataset (or all of them) from the in-memory cache"""
+    with _cache_lock:
+        if name is None:
+            _cache.clear()
+        else:
+            _cache.pop(name, None)
+
+
+def imported_dataset_path(name):
+    """Return the Parquet path of an imported dataset"""
+    return os.path.join(IMPORT_ROOT, f"{name}.parquet")
+
+
+def list_imported_datasets():
+    """Names of the datasets written by the upload importer"""
+    if not os.path.isdir(IMPORT_ROOT):
+        return []
+    return sorted(f[:-len(".parquet")] for f in os.listdir(IMPORT_ROOT) if f.endswith(".parquet"))
+
+
+def load_imported_dataset(name):
+    """
+    Load an imported dataset through the same process-wide cache as load_dataset.
+
+    Args:
+        name: Dataset name given at import time
+
+    Returns:
+        DataFrame sharing its column data with the cache
+    """
+    path = imported_dataset_path(name)
+    source_mtime = os.path.getmtime(path)
+    key = ("imports", name)
+
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None and cached[0] == source_mtime:
+        return cached[1].copy(deep=False)
+
+    df = pd.read_parquet(path)
+    with _cache_lock:
+        _cache[key] = (source_mtime, df)
+    return df.copy(deep=False)
@@ -0,0 +1,253 @@
+"""
+Near-duplicate detection for scraped articles.
+
+Each text is reduced to a MinHash signature over its word shingles: the share
+of positions on which two signatures agree estimates the Jaccard similarity
+of the two shingle sets, so a press release republished with a new header,
+a few edited words or a cut-off ending still scores far above unrelated
+articles. Signatures are kept in an LSH index split into bands of a few
+hashes each; texts above MIN_SIMILARITY almost always agree exactly on at
+least one band, so a lookup only compares against the texts sharing a band
+instead of the whole index.
+
+The index can be persisted to Parquet so that an article already stored from
+one source is recognized when another source republishes it later.
+"""
+import os
+import re
+import time
+import hashlib
+import logging
+import threading
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Signatures of stored articles, shared by every session on this machine
+FINGERPRINT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', '.dedup', 'minhash.parquet'))
+
+# Words per shingle, and estimated Jaccard similarity from which two texts are near-duplicates
+SHINGLE_SIZE = 3
+MIN_SIMILARITY = 0.6
+
+# Hashes per signature, split into LSH bands of BAND_SIZE hashes. With 16 bands
+# of 4, a pair at 0.6 similarity shares a band 89% of the time and a pair at
+# 0.8 more than 99.9% of the time
+NUM_HASHES = 64
+BAND_SIZE = 4
+
+# Signatures kept in a persistent index; the oldest are dropped beyond this
+MAX_ENTRIES = 100_000
+
+_TOKEN = re.compile(r"\w+")
+
+# Multiply-shift hash family: hash i of a 32-bit shingle hash x is the top 32 bits of a_i * x + b_i
+_PARAMS = np.random.default_rng(0x5EED).integers(1, 2 ** 63, size=(2, NUM_HASHES), dtype=np.uint64)
+_MULTIPLIERS = _PARAMS[0] | np.uint64(1)
+_OFFSETS = _PARAMS[1]
+
+
+def _shingles(text, shingle_size=SHINGLE_SIZE):
+    """Distinct word shingles of a text (case and punctuation are ignored)"""
+    tokens = _TOKEN.findall((text or "").lower())
+    return {" ".join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)}
+
+
+def minhash(text, shingle_size=SHINGLE_SIZE):
+    """
+    MinHash signature of a text over its word shingles.
+
+    Args:
+        text: Article text (case and punctuation are ignored)
+        shingle_size: Words per shingle
+
+    Returns:
+        uint32 array of NUM_HASHES values, or None for texts with fewer than
+        shingle_size words
+    """
+    shingles = _shingles(text, shingle_size)
+    if not shingles:
+        return None
+    digests = b"".join(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest() for s in shingles)
+    x = np.frombuffer(digests, dtype=np.uint32).astype(np.uint64)
+    hashed = (_MULTIPLIERS[:, None] * x[None, :] + _OFFSETS[:, None]) >> np.uint64(32)
+    return hashed.min(axis=1).astype(np.uint32)
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    return float(np.mean(a == b))
+
+
+class FingerprintIndex:
+    """
+    MinHash LSH index of article signatures.
+
+    Entries carry a key (typically the article URL or source and title) so that
+    re-scraping the same article is recognized as already seen rather than as
+    a duplicate of itself.
+    """
+
+    def __init__(self, path=None, min_similarity=MIN_SIMILARITY, max_entries=MAX_ENTRIES):
+        """
+        Args:
+            path: Optional Parquet file the index is loaded from and saved to
+            min_similarity: Estimated Jaccard similarity from which texts match
+            max_entries: Entries kept when saving; the oldest are dropped
+        """
+        self.path = path
+        self.min_similarity = min_similarity
+        self.max_entries = max_entries
+        self._signatures = []
+        self._keys = []
+        self._seen_at = []
+        self._buckets = defaultdict(list)
+        self._dirty = False
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self._load()
+
+    def __len__(self):
+        return len(self._signatures)
+
+    @staticmethod
+    def _band_keys(signature):
+        return [(start, signature[start:start + BAND_SIZE].tobytes())
+                for start in range(0, NUM_HASHES, BAND_SIZE)]
+
+    def _insert(self, signature, key, seen_at):
+        position = len(self._signatures)
+        self._signatures.append(signature)
+        self._keys.append(key)
+        self._seen_at.append(seen_at)
+        for band_key in self._band_keys(signature):
+            self._buckets[band_key].append(position)
+
+    def _nearest(self, signature):
+        """(similarity, position) of the most similar entry at or above min_similarity, or None"""
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates.update(self._buckets.get(band_key, ()))
+        if not candidates:
+            return None
+        positions = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        scores = (np.stack([self._signatures[p] for p in positions]) == signature).mean(axis=1)
+        best = int(np.argmax(scores))
+        if scores[best] < self.min_similarity:
+            return None
+        return float(scores[best]), int(positions[best])
+
+    def check(self, text, key):
+        """
+        Look a text up and record it.
+
+        Args:
+            text: Article text to fingerprint
+            key: Identity of the article (e.g. its URL)
+
+        Returns:
+            (status, matched key): status is 'new' (recorded), 'seen' (this key
+            was already recorded with near-identical text) or 'duplicate'
+            (near-identical to an article stored under another key). Texts
+            with fewer than SHINGLE_SIZE words (e.g. a failed extraction) are
+            neither matched nor recorded and always come back as 'new'.
+        """
+        signature = minhash(text)
+        if signature is None:
+            return "new", None
+        with self._lock:
+            match = self._nearest(signature)
+            if match is not None:
+                matched_key = self._keys[match[1]]
+                return ("seen" if matched_key == key else "duplicate"), matched_key
+            self._insert(signature, key, time.time())
+            self._dirty = True
+            return "new", None
+
+    def _load(self):
+        table = pd.read_parquet(self.path)
+        for signature, key, seen_at in zip(table["signature"], table["key"], table["seen_at"]):
+            self._insert(np.frombuffer(signature, dtype=np.uint32), key, float(seen_at))
+
+    def save(self):
+        """Write the index to its Parquet file atomically, keeping the newest max_entries"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            table = pd.DataFrame({
+                "signature": [signature.tobytes() for signature in self._signatures],
+                "key": self._keys,
+                "seen_at": self._seen_at,
+            })
+            if len(table) > self.max_entries:
+                table = table.nlargest(self.max_entries, "seen_at").sort_values("seen_at")
+                self._signatures, self._keys, self._seen_at = [], [], []
+                self._buckets = defaultdict(list)
+                for signature, key, seen_at in zip(table["signature"], table["key"], table["seen_at"]):
+                    self._insert(np.frombuffer(signature, dtype=np.uint32), key, float(seen_at))
+            self._dirty = False
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            table.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, self.path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def deduplicate(items, text, key, index=None, cluster=False):
+    """
+    Drop near-duplicate articles from a batch.
+
+    Args:
+        items: List of article dictionaries, in order of preference
+        text: Callable returning the text to fingerprint for an item
+        key: Callable returning an item's identity (e.g. its URL)
+        index: Optional FingerprintIndex to check against and record into
+            (saved afterwards if it has a path); defaults to a fresh index,
+            which only removes duplicates within the batch
+        cluster: Attach an 'also_reported_by' list of the dropped items' keys
+            to the item each duplicate matched within the batch
+
+    Returns:
+        Items that are not near-duplicates of an earlier item or of an article
+        already stored in the index under another key
+    """
+    index = FingerprintIndex() if index is None else index
+    kept = {}
+    dropped = 0
+    for item in items:
+        item_key = key(item)
+        status, matched_key = index.check(text(item), item_key)
+        if status == "duplicate":
+            dropped += 1
+            if cluster and matched_key in kept:
+                kept[matched_key].setdefault("also_reported_by", []).append(item_key)
+            continue
+        if item_key not in kept:
+            kept[item_key] = item
+    if dropped:
+        logger.info(f"Dropped {dropped} near-duplicate articles")
+    index.save()
+    return list(kept.values())
+
+
+_default_index = None
+_default_lock = threading.Lock()
+
+
+def get_fingerprint_index():
+    """Process-wide persistent index over FINGERPRINT_PATH"""
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = FingerprintIndex(FINGERPRINT_PATH)
+        return _default_index
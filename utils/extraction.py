@@ -0,0 +1,179 @@
+"""
+Page extraction offloaded to a process pool.
+
+trafilatura's HTML parsing is CPU-bound and holds the GIL, so running it in
+the Streamlit script thread stalls every session in the server. Here the
+extraction and the regex post-processing run in worker processes instead:
+interactive scrapes wait on a future without blocking the interpreter, and a
+batch crawl keeps every core busy.
+
+Small pages are sent to the worker with the task. Pages of at least
+SHARED_MEMORY_THRESHOLD bytes are written into a shared memory block and
+the worker copies them out of it, so large bodies are not pickled through
+the pool's pipe; the parent releases the block when the task ends.
+
+If a worker dies (a parser crash, or running out of memory on a huge page)
+the pool becomes unusable; it is replaced on the next submission, and a
+task lost with it is retried once.
+"""
+import os
+import re
+import logging
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+import trafilatura
+from trafilatura.utils import decode_file
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Worker processes; extraction is CPU-bound, so one per core
+MAX_WORKERS = os.cpu_count() or 1
+
+# Bodies at least this large are handed to workers through shared memory
+SHARED_MEMORY_THRESHOLD = 256 * 1024
+
+DATE_PATTERN = re.compile(r'\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{1,2},?\s+\d{4}\b')
+PRICE_PATTERN = re.compile(r'[\$£€¥]\s*\d+(?:,\d+)*(?:\.\d+)?|\d+(?:,\d+)*(?:\.\d+)?\s*(?:pounds|dollars|euros|GBP|USD|EUR)')
+
+_executor = None
+_lock = threading.Lock()
+
+
+def analyze_page(body):
+    """
+    Extract the main text of a page and the references scrape_with_details reports.
+
+    Args:
+        body: Raw response body (bytes) or decoded HTML
+
+    Returns:
+        Dictionary with content (extracted text or None), paragraphs,
+        word_count, dates_mentioned and financial_references
+    """
+    html = decode_file(body) if isinstance(body, (bytes, bytearray)) else body
+    content = trafilatura.extract(html)
+    return {
+        "content": content,
+        "paragraphs": [p for p in content.split('\n') if p.strip()] if content else [],
+        "word_count": len(content.split()) if content else 0,
+        "dates_mentioned": DATE_PATTERN.findall(content) if content else [],
+        "financial_references": PRICE_PATTERN.findall(content) if content else [],
+    }
+
+
+def _analyze_shared(name, size):
+    """Worker entry point for a body placed in shared memory by submit_analysis"""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        body = bytes(block.buf[:size])
+    finally:
+        block.close()
+    return analyze_page(body)
+
+
+def _get_executor():
+    """Create the worker pool on first use"""
+    global _executor
+    with _lock:
+        if _executor is None:
+            # Spawn rather than fork: the Streamlit server process is multi-threaded
+            _executor = ProcessPoolExecutor(max_workers=MAX_WORKERS,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+
+def _submit(fn, *args):
+    """Submit to the worker pool, replacing it first if a dead worker broke it"""
+    global _executor
+    executor = _get_executor()
+    try:
+        return executor.submit(fn, *args)
+    except BrokenProcessPool:
+        with _lock:
+            if _executor is executor:
+                logger.warning("Extraction pool lost a worker; starting a new pool")
+                _executor = None
+        executor.shutdown(wait=False)
+        return _get_executor().submit(fn, *args)
+
+
+def _release(block):
+    """Done-callback freeing a task's shared memory block"""
+    def release(_future):
+        block.close()
+        block.unlink()
+    return release
+
+
+def submit_analysis(body):
+    """
+    Queue analyze_page for a page body on the worker pool.
+
+    Args:
+        body: Raw response body (bytes) or decoded HTML
+
+    Returns:
+        concurrent.futures.Future resolving to the analyze_page result
+    """
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if len(body) < SHARED_MEMORY_THRESHOLD:
+        return _submit(analyze_page, body)
+
+    block = shared_memory.SharedMemory(create=True, size=len(body))
+    try:
+        block.buf[:len(body)] = body
+        future = _submit(_analyze_shared, block.name, len(body))
+    except Exception:
+        block.close()
+        block.unlink()
+        raise
+    future.add_done_callback(_release(block))
+    return future
+
+
+def analysis_result(future, body):
+    """
+    Wait for a submit_analysis future, resubmitting once if its worker died.
+
+    Args:
+        future: Future returned by submit_analysis for body
+        body: The page body that was submitted
+
+    Returns:
+        The analyze_page result
+    """
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        # The broken pool is replaced when the page is submitted again
+        return submit_analysis(body).result()
+
+
+def analyze_in_pool(body):
+    """analyze_page run on the worker pool; blocks only the calling thread"""
+    return analysis_result(submit_analysis(body), body)
+
+
+def analyze_many(bodies):
+    """
+    Analyze many page bodies across the worker pool.
+
+    Args:
+        bodies: Dictionary of key (e.g. URL) -> body
+
+    Yields:
+        (key, analyze_page result or exception) pairs, in completion order
+    """
+    futures = {submit_analysis(body): key for key, body in bodies.items()}
+    for future in as_completed(futures):
+        key = futures[future]
+        try:
+            yield key, analysis_result(future, bodies[key])
+        except Exception as e:
+            yield key, e
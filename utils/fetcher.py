@@ -0,0 +1,172 @@
+"""
+Concurrent page fetching for the scrapers.
+
+Fetches are coordinated by an asyncio event loop: a global limit and a
+per-host limit bound how many requests are in flight, every attempt has a
+timeout, and failures that are worth retrying (connection errors, timeouts,
+429 and 5xx responses) are retried with exponential backoff and jitter.
+Results are handed back as each URL finishes rather than in input order.
+
+The HTTP call itself is a blocking function run on the shared worker pool of
+utils.http_session, so it can be swapped out; point the URLs at a local
+server to exercise the engine without network access.
+"""
+import time
+import queue
+import random
+import asyncio
+import logging
+import threading
+from urllib.parse import urlsplit
+from utils import http_session
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Requests in flight overall (set with the session's connection pools) and per host
+MAX_CONCURRENCY = http_session.MAX_CONCURRENCY
+PER_HOST_LIMIT = 2
+
+# Seconds allowed for one attempt, retries after the first, and the first backoff delay
+DEFAULT_TIMEOUT = 15
+MAX_RETRIES = 2
+BACKOFF_SECONDS = 0.5
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def http_get(url, timeout=DEFAULT_TIMEOUT):
+    """
+    Blocking GET used by the fetch engine, over the shared pooled session.
+
+    Returns:
+        (status code, body bytes)
+    """
+    response = http_session.http_get(url, timeout)
+    return response.status_code, response.content
+
+
+def _host(url):
+    return urlsplit(url).netloc.lower()
+
+
+async def _fetch(url, get, limits, executor, timeout, retries, backoff):
+    """Fetch one URL under the concurrency limits, retrying transient failures"""
+    global_limit, host_limits = limits
+    start_time = time.perf_counter()
+    status, body, error = None, None, None
+    attempt = 0
+    for attempt in range(1, retries + 2):
+        # Host slot first, so a busy host never holds global slots while it waits
+        async with host_limits[_host(url)], global_limit:
+            try:
+                call = asyncio.get_running_loop().run_in_executor(executor, get, url, timeout)
+                status, body = await asyncio.wait_for(call, timeout)
+                error = None if status < 400 else f"HTTP {status}"
+            except asyncio.TimeoutError:
+                status, body, error = None, None, f"Timed out after {timeout}s"
+            except Exception as e:
+                status, body, error = None, None, str(e)
+
+        retryable = error is not None and (status is None or status in RETRY_STATUSES)
+        if not retryable or attempt > retries:
+            break
+        # Exponential backoff with jitter, outside the limits so other URLs proceed
+        delay = backoff * 2 ** (attempt - 1) * (0.5 + random.random())
+        logger.info(f"Retrying {url} in {delay:.2f}s ({error})")
+        await asyncio.sleep(delay)
+
+    return {
+        "url": url,
+        "success": error is None,
+        "status": status,
+        "body": body if error is None else None,
+        "error": error,
+        "attempts": attempt,
+        "duration_seconds": time.perf_counter() - start_time,
+    }
+
+
+async def fetch_as_completed(urls, get=http_get, max_concurrency=MAX_CONCURRENCY, per_host=PER_HOST_LIMIT,
+                             timeout=DEFAULT_TIMEOUT, retries=MAX_RETRIES, backoff=BACKOFF_SECONDS):
+    """
+    Fetch URLs concurrently, yielding each result as soon as it completes.
+
+    Args:
+        urls: URLs to fetch (duplicates are fetched once)
+        get: Blocking callable (url, timeout) -> (status, body bytes)
+        max_concurrency: Requests in flight overall
+        per_host: Requests in flight per host
+        timeout: Seconds allowed per attempt
+        retries: Retries after the first attempt for connection errors,
+            timeouts and RETRY_STATUSES responses
+        backoff: First retry delay in seconds; doubles on every retry
+
+    Yields:
+        Dictionaries with url, success, status, body, error, attempts and
+        duration_seconds, in completion order
+    """
+    global_limit = asyncio.Semaphore(max_concurrency)
+    host_limits = {}
+    for url in dict.fromkeys(urls):
+        host_limits.setdefault(_host(url), asyncio.Semaphore(per_host))
+    limits = (global_limit, host_limits)
+
+    # Blocking calls share the process-wide bounded pool with every other crawl
+    executor = http_session.get_executor()
+    tasks = [
+        asyncio.ensure_future(_fetch(url, get, limits, executor, timeout, retries, backoff))
+        for url in dict.fromkeys(urls)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def iter_fetch(urls, **options):
+    """
+    Synchronous generator over fetch_as_completed for scripts and Streamlit.
+
+    The event loop runs in a background thread, so this works whether or
+    not the caller already has a loop running.
+
+    Args:
+        urls: URLs to fetch
+        **options: Passed to fetch_as_completed
+
+    Yields:
+        Fetch results in completion order
+    """
+    results = queue.Queue()
+    done = object()
+
+    async def drain():
+        async for result in fetch_as_completed(urls, **options):
+            results.put(result)
+
+    def run():
+        try:
+            asyncio.run(drain())
+        except Exception as e:
+            logger.error(f"Fetch engine stopped: {str(e)}")
+        finally:
+            results.put(done)
+
+    thread = threading.Thread(target=run, name="fetch-engine", daemon=True)
+    thread.start()
+    while True:
+        result = results.get()
+        if result is done:
+            break
+        yield result
+    thread.join()
+
+
+def fetch_all(urls, **options):
+    """Fetch URLs concurrently and return every result, in completion order"""
+    return list(iter_fetch(urls, **options))
@@ -1,17 +1,107 @@
+import os
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
-from sklearn.linear_model import LinearRegression
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
+from importlib import metadata
 from datetime import datetime, timedelta
+from utils.rng import resolve_rng
+from utils.model_cache import fingerprint, get_model_cache
+from utils.should_cost import COMPONENT_COST_RANGES, DEFAULT_COST_RANGE, MARKUP_RANGE
 
-def simple_forecast(historical_data, periods=6):
+def _trend_fit(dates, y):
     """
-    Simple forecasting using linear regression
+    Least-squares linear trend for every column of y at once
+    
+    Args:
+        dates: DatetimeIndex of the rows of y
+        y: (len(dates), n_series) price array; NaNs are left out per series
+    
+    Returns:
+        Dictionary of per-series arrays (n, mean_x, sxx, slope, intercept, sse)
+        plus the scalar origin, all on x = days since dates.min()
+    """
+    origin = dates.min()
+    x = (dates - origin).days.to_numpy(dtype=float)
+    observed = ~np.isnan(y)
+    mask = observed.astype(float)
+    y_filled = np.where(observed, y, 0.0)
+    
+    # Per-series sums over observed points only: n, Σx, Σx², Σy, Σxy, Σy²
+    # (x is centred on its overall mean first so the sums stay well conditioned)
+    shift = x.mean()
+    xc = x - shift
+    n = mask.sum(axis=0)
+    sum_x = xc @ mask
+    sum_xx = (xc * xc) @ mask
+    sum_y = y_filled.sum(axis=0)
+    sum_xy = xc @ y_filled
+    sum_yy = (y_filled * y_filled).sum(axis=0)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_x = sum_x / n
+        mean_y = sum_y / n
+        sxx = sum_xx - n * mean_x * mean_x
+        sxy = sum_xy - n * mean_x * mean_y
+        syy = sum_yy - n * mean_y * mean_y
+        slope = np.where(sxx > 0, sxy / sxx, 0.0)
+    
+    return {
+        'origin': origin,
+        'n': n,
+        'mean_x': mean_x + shift,
+        'sxx': sxx,
+        'slope': slope,
+        'intercept': mean_y - slope * (mean_x + shift),
+        'sse': np.maximum(syy - slope * sxy, 0.0),
+    }
+
+def _trend_predict(fit, future_dates, interval=None):
+    """
+    Point forecasts and optional prediction intervals from _trend_fit
+    
+    The interval is the classical OLS prediction interval: residual standard
+    error times sqrt(1 + 1/n + (x - mean_x)² / Sxx), scaled by Student's t with
+    n - 2 degrees of freedom, so it widens with distance from the data.
+    
+    Returns:
+        (point, lower, upper) arrays of shape (len(future_dates), n_series);
+        lower and upper are None without an interval
+    """
+    x = (pd.DatetimeIndex(future_dates) - fit['origin']).days.to_numpy(dtype=float)[:, None]
+    point = fit['intercept'] + fit['slope'] * x
+    if interval is None:
+        return point, None, None
+    
+    from scipy.stats import t as student_t
+    
+    n = fit['n']
+    dof = n - 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        residual_se = np.sqrt(fit['sse'] / dof)
+        leverage = 1 + 1 / n + (x - fit['mean_x']) ** 2 / fit['sxx']
+        half_width = student_t.ppf((1 + interval) / 2, dof) * residual_se * np.sqrt(leverage)
+    half_width = np.where(dof > 0, half_width, np.nan)
+    return point, point - half_width, point + half_width
+
+def _future_dates(last_date, periods):
+    """Forecast dates used by every forecaster: month ends starting 30 days after last_date"""
+    return pd.date_range(
+        start=last_date + timedelta(days=30), 
+        periods=periods, 
+        freq='M'
+    )
+
+def simple_forecast(historical_data, periods=6, interval=None):
+    """
+    Simple forecasting using a least-squares linear trend on days since the first date
     
     Args:
         historical_data: DataFrame with 'Date' and 'Price' columns
         periods: Number of periods to forecast
+        interval: Optional prediction-interval coverage (e.g. 0.9); adds
+            'Lower Bound' and 'Upper Bound' columns to the forecast rows
     
     Returns:
         DataFrame with forecasted values
@@ -19,156 +109,593 @@ def simple_forecast(historical_data, periods=6):
     # Prepare data
     df = historical_data.copy()
     
-    # Convert dates to numeric feature (days since first date)
-    first_date = df['Date'].min()
-    df['days_feature'] = (df['Date'] - first_date).dt.days
-    
-    # Train linear regression model
-    model = LinearRegression()
-    X = df[['days_feature']]
-    y = df['Price']
-    model.fit(X, y)
+    # Closed-form least-squares trend (pure NumPy, no scikit-learn import)
+    fit = _trend_fit(pd.DatetimeIndex(df['Date']), df[['Price']].to_numpy(dtype=float))
     
     # Generate future dates for prediction
     last_date = df['Date'].max()
-    future_dates = pd.date_range(
-        start=last_date + timedelta(days=30), 
-        periods=periods, 
-        freq='M'
-    )
-    
-    # Prepare prediction data
-    future_df = pd.DataFrame({
-        'Date': future_dates,
-        'days_feature': [(d - first_date).days for d in future_dates]
-    })
+    future_dates = _future_dates(last_date, periods)
     
-    # Make predictions
-    future_df['Price'] = model.predict(future_df[['days_feature']])
+    # Make predictions, with a residual-based prediction interval if requested
+    point, lower, upper = _trend_predict(fit, future_dates, interval)
+    future_df = pd.DataFrame({'Date': future_dates, 'Price': point[:, 0]})
     future_df['Type'] = 'Forecast'
+    columns = ['Date', 'Price', 'Type']
+    
+    if interval is not None:
+        future_df['Lower Bound'] = lower[:, 0]
+        future_df['Upper Bound'] = upper[:, 0]
+        columns += ['Lower Bound', 'Upper Bound']
     
     # Mark historical data
     df['Type'] = 'Historical'
     
     # Combine historical and forecasted data
-    result = pd.concat([df[['Date', 'Price', 'Type']], future_df[['Date', 'Price', 'Type']]])
+    result = pd.concat([df[['Date', 'Price', 'Type']], future_df[columns]])
     
     return result
 
-def advanced_forecast(historical_data, periods=6):
+def trend_intervals(panel, future_dates, interval=0.9):
+    """
+    Linear-trend forecasts with prediction intervals for a whole panel
+    
+    Args:
+        panel: DataFrame indexed by Date with one price column per series
+        future_dates: Dates to forecast
+        interval: Prediction-interval coverage
+    
+    Returns:
+        (point, lower, upper) DataFrames indexed by future date, one column per series
+    """
+    panel = panel.sort_index()
+    fit = _trend_fit(pd.DatetimeIndex(panel.index), panel.to_numpy(dtype=float))
+    index = pd.DatetimeIndex(future_dates, name='Date')
+    return tuple(
+        pd.DataFrame(values, index=index, columns=panel.columns)
+        for values in _trend_predict(fit, index, interval)
+    )
+
+def forecast_many(panel, periods=6, include_history=True, interval=None):
+    """
+    Linear-trend forecasts for every column of a wide price panel at once
+
+    Fits the same model as simple_forecast (price against days since the first
+    date) for all series in one pass, using the closed-form least-squares
+    solution on column sums instead of one regression fit per series.
+    Missing prices are ignored per series.
+
+    Args:
+        panel: DataFrame indexed by Date (or with a 'Date' column) and one price
+            column per series, e.g. from get_commodity_price_panel
+        periods: Number of periods to forecast
+        include_history: Also return the historical rows, as simple_forecast does
+        interval: Optional prediction-interval coverage (e.g. 0.9); adds
+            'Lower Bound' and 'Upper Bound' columns to the forecast rows
+
+    Returns:
+        Long DataFrame with 'Series', 'Date', 'Price' and 'Type' columns, grouped
+        by series in the panel's column order and sorted by date within each
+    """
+    if 'Date' in panel.columns:
+        panel = panel.set_index('Date')
+    panel = panel.sort_index()
+    dates = pd.DatetimeIndex(panel.index)
+    y = panel.to_numpy(dtype=float)
+
+    fit = _trend_fit(dates, y)
+    future_dates = _future_dates(dates.max(), periods)
+    predictions, lower, upper = _trend_predict(fit, future_dates, interval)
+
+    series = np.asarray(panel.columns)
+    forecast = pd.DataFrame({
+        'Series': np.repeat(series, len(future_dates)),
+        'Date': np.tile(future_dates.to_numpy(), len(series)),
+        'Price': predictions.T.ravel(),
+        'Type': 'Forecast'
+    })
+    if interval is not None:
+        forecast['Lower Bound'] = lower.T.ravel()
+        forecast['Upper Bound'] = upper.T.ravel()
+    if not include_history:
+        return forecast
+
+    cols, rows = np.nonzero(~np.isnan(y).T)
+    historical = pd.DataFrame({
+        'Series': series[cols],
+        'Date': dates.to_numpy()[rows],
+        'Price': y[rows, cols],
+        'Type': 'Historical'
+    })
+    result = pd.concat([historical, forecast], ignore_index=True)
+    # Group by series in input order (not alphabetically), then by date
+    position = pd.Index(series).get_indexer(result['Series'])
+    order = np.lexsort((result['Date'].to_numpy(), position))
+    return result.iloc[order].reset_index(drop=True)
+
+class IncrementalTrend:
+    """
+    Linear price trend that absorbs new observations in O(1)
+    
+    Fits the same model as simple_forecast (price against days since the first
+    date) but keeps only running sufficient statistics, updated with Welford-
+    style centred sums, so each new price costs a handful of float operations
+    and the fit is always exactly the least-squares line over every price seen.
+    """
+    
+    # Field order of the serialized state
+    STATE_FIELDS = ('origin', 'last', 'n', 'mean_x', 'mean_y', 'sxx', 'sxy')
+    
+    def __init__(self):
+        self.origin = None  # First date, as datetime64[D]
+        self.last = None    # Latest date seen
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.sxx = 0.0      # Σ(x - mean_x)²
+        self.sxy = 0.0      # Σ(x - mean_x)(y - mean_y)
+    
+    @classmethod
+    def from_history(cls, historical_data):
+        """Build from a DataFrame with 'Date' and 'Price' columns"""
+        trend = cls()
+        for date, price in zip(historical_data['Date'], historical_data['Price']):
+            trend.update(date, price)
+        return trend
+    
+    def update(self, date, price):
+        """
+        Absorb one observation
+        
+        Args:
+            date: Observation date
+            price: Observed price (NaN is ignored)
+        
+        Returns:
+            self, to allow chaining
+        """
+        if price is None or np.isnan(price):
+            return self
+        day = np.datetime64(pd.Timestamp(date), 'D')
+        if self.origin is None:
+            self.origin = day
+        self.last = day if self.last is None else max(self.last, day)
+        
+        x = float((day - self.origin) / np.timedelta64(1, 'D'))
+        self.n += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.n
+        self.mean_y += (price - self.mean_y) / self.n
+        self.sxx += dx * (x - self.mean_x)
+        self.sxy += dx * (price - self.mean_y)
+        return self
+    
+    @property
+    def slope(self):
+        """Price change per day"""
+        return self.sxy / self.sxx if self.sxx > 0 else 0.0
+    
+    @property
+    def intercept(self):
+        """Fitted price at the first date"""
+        return self.mean_y - self.slope * self.mean_x
+    
+    def predict(self, dates):
+        """Trend prices at the given dates"""
+        days = (pd.DatetimeIndex(dates).to_numpy(dtype='datetime64[D]') - self.origin) / np.timedelta64(1, 'D')
+        return self.intercept + self.slope * days.astype(float)
+    
+    def forecast(self, periods=6):
+        """
+        Forecast from the latest observation, with simple_forecast's future dates
+        
+        Returns:
+            DataFrame with 'Date', 'Price' and 'Type' columns
+        """
+        if self.n == 0:
+            raise ValueError("No observations yet")
+        future_dates = _future_dates(pd.Timestamp(self.last), periods)
+        return pd.DataFrame({'Date': future_dates, 'Price': self.predict(future_dates), 'Type': 'Forecast'})
+    
+    def to_state(self):
+        """Compact JSON-serializable state (seven numbers)"""
+        if self.n == 0:
+            return [None, None, 0, 0.0, 0.0, 0.0, 0.0]
+        epoch = np.datetime64(0, 'D')
+        return [
+            int((self.origin - epoch) / np.timedelta64(1, 'D')),
+            int((self.last - epoch) / np.timedelta64(1, 'D')),
+            self.n, self.mean_x, self.mean_y, self.sxx, self.sxy
+        ]
+    
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild from to_state() output"""
+        trend = cls()
+        origin, last, trend.n, trend.mean_x, trend.mean_y, trend.sxx, trend.sxy = state
+        if origin is not None:
+            trend.origin = np.datetime64(origin, 'D')
+            trend.last = np.datetime64(last, 'D')
+        return trend
+
+# Features used by advanced_forecast, in model column order
+ADVANCED_FEATURES = ['days_feature', 'month', 'day_of_year',
+                     'price_lag1', 'price_lag2', 'price_lag3',
+                     'rolling_mean_3', 'rolling_mean_6']
+
+# Lag offsets and rolling-mean windows behind the price features
+PRICE_LAGS = (1, 2, 3)
+ROLLING_WINDOWS = (3, 6)
+
+# Hyperparameters of the advanced_forecast forest
+FOREST_PARAMS = {'n_estimators': 100, 'random_state': 42}
+
+class LagBuffer:
+    """
+    Fixed-size ring buffer of the latest prices
+    
+    Keeps running sums for each rolling window, so pushing a value and reading
+    lags or rolling means are O(1) regardless of how long the series has grown.
+    A 2-D history (observations x paths) tracks several paths side by side.
+    
+    A history shorter than the longest lag or window is accepted: rolling means
+    average the values seen so far and lags reaching past the oldest value
+    repeat it, until enough values have been pushed.
+    """
+    
+    def __init__(self, history, lags=PRICE_LAGS, windows=ROLLING_WINDOWS):
+        """
+        Args:
+            history: Observed prices, oldest first (at least one value)
+            lags: Lag offsets to expose
+            windows: Rolling-mean window lengths to expose
+        """
+        self.lags = tuple(lags)
+        self.windows = tuple(windows)
+        self.size = max(self.lags + self.windows)
+        history = np.asarray(history, dtype=float)
+        if len(history) == 0:
+            raise ValueError("Need at least one observation")
+        
+        # Slots before a short history hold zeros, so the window sums skip them
+        self._count = min(len(history), self.size)
+        self._buffer = np.zeros((self.size,) + history.shape[1:])
+        self._buffer[-self._count:] = history[-self._count:]
+        self._head = 0  # Position of the oldest slot
+        self._sums = np.array([self._buffer[-w:].sum(axis=0) for w in self.windows])
+        self._shape = (-1,) + (1,) * (history.ndim - 1)
+    
+    def _back(self, k):
+        """Value k steps back (1 = latest)"""
+        return self._buffer[(self._head - k) % self.size]
+    
+    def push(self, value):
+        """Append a new price (one per path), dropping the oldest"""
+        for i, w in enumerate(self.windows):
+            self._sums[i] += value - self._back(w)
+        self._buffer[self._head] = value
+        self._head = (self._head + 1) % self.size
+        self._count = min(self._count + 1, self.size)
+    
+    def features(self, out):
+        """Write lag values then rolling means into out, shape (n_features,) or (n_features, paths)"""
+        n_lags = len(self.lags)
+        for i, k in enumerate(self.lags):
+            out[i] = self._back(min(k, self._count))
+        divisors = np.minimum(self.windows, self._count).astype(float).reshape(self._shape)
+        out[n_lags:] = self._sums / divisors
+
+class ForestPredictor:
+    """
+    Random forest flattened into NumPy arrays for low-overhead prediction
+    
+    All trees are stored as one node table and walked together, one level per
+    step, so predicting a single row costs a few array operations instead of a
+    full scikit-learn predict call. Useful inside recursive forecasts, which
+    predict one row at a time.
+    """
+    
+    def __init__(self, forest):
+        """
+        Args:
+            forest: Fitted RandomForestRegressor (single output)
+        """
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        counts = np.array([tree.node_count for tree in trees])
+        offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        
+        def children(side):
+            return np.concatenate([
+                np.where(getattr(tree, side) >= 0, getattr(tree, side) + offset, -1)
+                for tree, offset in zip(trees, offsets)
+            ])
+        
+        self.left = children('children_left')
+        self.right = children('children_right')
+        self.feature = np.concatenate([np.maximum(tree.feature, 0) for tree in trees])
+        self.threshold = np.concatenate([tree.threshold for tree in trees])
+        self.value = np.concatenate([tree.value[:, 0, 0] for tree in trees])
+        self.roots = offsets
+        self.max_depth = max(tree.max_depth for tree in trees)
+    
+    @property
+    def n_trees(self):
+        return len(self.roots)
+    
+    def _walk(self, X, node, rows):
+        """Descend from node to the leaves, reading features of X at rows"""
+        # scikit-learn compares float32 inputs against its thresholds
+        X = np.asarray(X, dtype=np.float32)
+        for _ in range(self.max_depth):
+            left = self.left[node]
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(left < 0, node, np.where(go_left, left, self.right[node]))
+        return self.value[node]
+    
+    def predict_trees(self, X):
+        """Per-tree predictions, shape (n_trees, n_rows)"""
+        node = np.repeat(self.roots[:, None], len(X), axis=1)
+        return self._walk(X, node, np.arange(len(X)))
+    
+    def predict_each(self, X):
+        """Tree i's prediction for row i of X, shape (n_trees,)"""
+        return self._walk(X, self.roots.copy(), np.arange(self.n_trees))
+    
+    def predict(self, X):
+        """Forest prediction (mean over trees), shape (n_rows,)"""
+        return self.predict_trees(X).mean(axis=0)
+
+def _calendar_features(dates, first_date):
+    """days_feature, month and day_of_year as a (len(dates), 3) array"""
+    dates = pd.DatetimeIndex(dates)
+    return np.column_stack([
+        (dates - first_date).days.to_numpy(),
+        dates.month.to_numpy(),
+        dates.dayofyear.to_numpy()
+    ]).astype(float)
+
+def recursive_forecast(predict, history, calendar, lags=PRICE_LAGS, windows=ROLLING_WINDOWS):
+    """
+    Roll a one-step model forward, feeding each prediction back as a lag
+    
+    Lag and rolling-mean state live in a LagBuffer and the model is called on a
+    single preallocated row, so each step costs one predict call on raw arrays.
+    
+    Args:
+        predict: Model predict function taking a (1, n_features) array
+        history: Observed prices, oldest first
+        calendar: (periods, n_calendar) array of known future features, which
+            precede the lag and rolling-mean features in each row
+        lags, windows: Price features, as in LagBuffer
+    
+    Returns:
+        Array of predicted prices, one per calendar row
+    """
+    state = LagBuffer(history, lags, windows)
+    periods, n_calendar = calendar.shape
+    row = np.empty((1, n_calendar + len(state.lags) + len(state.windows)))
+    predictions = np.empty(periods)
+    
+    for i in range(periods):
+        row[0, :n_calendar] = calendar[i]
+        state.features(row[0, n_calendar:])
+        predictions[i] = predict(row)[0]
+        state.push(predictions[i])
+    
+    return predictions
+
+def recursive_tree_paths(forest, history, calendar, lags=PRICE_LAGS, windows=ROLLING_WINDOWS):
+    """
+    Roll every tree of a forest forward on its own recursive path
+    
+    Each tree feeds its own predictions back into its lag features, so the
+    spread across paths reflects how model uncertainty compounds over the
+    horizon. All trees advance together, one vectorized step per period.
+    
+    Args:
+        forest: ForestPredictor
+        history: Observed prices, oldest first
+        calendar: (periods, n_calendar) array of known future features
+        lags, windows: Price features, as in LagBuffer
+    
+    Returns:
+        (periods, n_trees) array of per-tree predicted prices
+    """
+    n_trees = forest.n_trees
+    history = np.asarray(history, dtype=float)
+    state = LagBuffer(np.repeat(history[:, None], n_trees, axis=1), lags, windows)
+    periods, n_calendar = calendar.shape
+    rows = np.empty((n_trees, n_calendar + len(state.lags) + len(state.windows)))
+    paths = np.empty((periods, n_trees))
+    
+    for i in range(periods):
+        rows[:, :n_calendar] = calendar[i]
+        state.features(rows[:, n_calendar:].T)
+        paths[i] = forest.predict_each(rows)
+        state.push(paths[i])
+    
+    return paths
+
+def fit_forest(X, y, use_cache=True):
+    """
+    Fit the advanced_forecast forest, reusing a cached fit for identical data
+    
+    Args:
+        X: Feature matrix in ADVANCED_FEATURES order
+        y: Target prices
+        use_cache: Look the fit up in the persistent model cache first
+    
+    Returns:
+        ForestPredictor for the fitted forest
+    """
+    def fit():
+        # Imported on first use: scikit-learn roughly doubles the module's import time
+        from sklearn.ensemble import RandomForestRegressor
+        return ForestPredictor(RandomForestRegressor(**FOREST_PARAMS).fit(X, y))
+    
+    if not use_cache:
+        return fit()
+    
+    config = {
+        'model': 'RandomForestRegressor',
+        'params': FOREST_PARAMS,
+        'features': ADVANCED_FEATURES,
+        'sklearn': metadata.version('scikit-learn')
+    }
+    return get_model_cache().get_or_fit(fingerprint(X, y, config), fit)
+
+def advanced_forecast(historical_data, periods=6, use_cache=True, interval=None):
     """
     More advanced forecasting using RandomForest with additional features
     
     Args:
         historical_data: DataFrame with 'Date' and 'Price' columns
         periods: Number of periods to forecast
+        use_cache: Reuse a forest already fitted on the same data (see fit_forest)
+        interval: Optional interval coverage (e.g. 0.9), taken as quantiles of the
+            per-tree recursive paths; adds 'Lower Bound' and 'Upper Bound' columns
     
     Returns:
         DataFrame with forecasted values
     """
     # Prepare data
     df = historical_data.copy()
+    first_date = df['Date'].min()
     
     # Extract date features
-    df['year'] = df['Date'].dt.year
+    df['days_feature'] = (df['Date'] - first_date).dt.days
     df['month'] = df['Date'].dt.month
     df['day_of_year'] = df['Date'].dt.dayofyear
-    df['days_feature'] = (df['Date'] - df['Date'].min()).dt.days
     
     # Add lag features (price from previous periods)
-    df['price_lag1'] = df['Price'].shift(1)
-    df['price_lag2'] = df['Price'].shift(2)
-    df['price_lag3'] = df['Price'].shift(3)
+    for k in PRICE_LAGS:
+        df[f'price_lag{k}'] = df['Price'].shift(k)
     
     # Add rolling means
-    df['rolling_mean_3'] = df['Price'].rolling(window=3).mean()
-    df['rolling_mean_6'] = df['Price'].rolling(window=6).mean()
+    for w in ROLLING_WINDOWS:
+        df[f'rolling_mean_{w}'] = df['Price'].rolling(window=w).mean()
     
     # Drop rows with NaN values (first few rows with lag features)
     df = df.dropna()
     
-    # Select features for training
-    features = ['days_feature', 'month', 'day_of_year', 
-                'price_lag1', 'price_lag2', 'price_lag3',
-                'rolling_mean_3', 'rolling_mean_6']
-    
-    # Train random forest model
-    model = RandomForestRegressor(n_estimators=100, random_state=42)
-    X = df[features]
-    y = df['Price']
-    model.fit(X, y)
+    # Train random forest model on raw arrays (the recursion predicts on arrays too)
+    X = df[ADVANCED_FEATURES].to_numpy(dtype=float)
+    y = df['Price'].to_numpy(dtype=float)
+    model = fit_forest(X, y, use_cache=use_cache)
     
     # Prepare future data for prediction
     last_date = df['Date'].max()
-    future_dates = pd.date_range(
-        start=last_date + timedelta(days=30), 
-        periods=periods, 
-        freq='M'
-    )
-    
-    future_df = pd.DataFrame({'Date': future_dates})
-    future_df['year'] = future_df['Date'].dt.year
-    future_df['month'] = future_df['Date'].dt.month
-    future_df['day_of_year'] = future_df['Date'].dt.dayofyear
-    future_df['days_feature'] = (future_df['Date'] - df['Date'].min()).dt.days
+    future_dates = _future_dates(last_date, periods)
     
-    # For each period in the future, predict and update lag features
-    all_data = df.copy()
+    # Predict one period at a time, feeding predictions back into the lag features
+    calendar = _calendar_features(future_dates, first_date)
+    history = df['Price'].to_numpy(dtype=float)
+    predictions = recursive_forecast(model.predict, history, calendar)
     
-    for i in range(len(future_df)):
-        # Get the current row to predict
-        current_row = future_df.iloc[[i]].copy()
-        
-        # Get the most recent actual or predicted values for lag features
-        current_row['price_lag1'] = all_data['Price'].iloc[-1]
-        current_row['price_lag2'] = all_data['Price'].iloc[-2]
-        current_row['price_lag3'] = all_data['Price'].iloc[-3]
-        
-        # Get rolling means
-        current_row['rolling_mean_3'] = all_data['Price'].iloc[-3:].mean()
-        current_row['rolling_mean_6'] = all_data['Price'].iloc[-6:].mean()
-        
-        # Make prediction
-        prediction = model.predict(current_row[features])[0]
-        current_row['Price'] = prediction
-        
-        # Add to all data for next prediction
-        all_data = pd.concat([all_data, current_row])
-    
-    # Combine with historical data
-    future_df = all_data.iloc[-periods:][['Date', 'Price']]
+    future_df = pd.DataFrame({'Date': future_dates, 'Price': predictions})
     future_df['Type'] = 'Forecast'
+    columns = ['Date', 'Price', 'Type']
+    
+    # Spread of the individual trees' recursive paths
+    if interval is not None:
+        paths = recursive_tree_paths(model, history, calendar)
+        lower, upper = np.quantile(paths, [(1 - interval) / 2, (1 + interval) / 2], axis=1)
+        future_df['Lower Bound'] = lower
+        future_df['Upper Bound'] = upper
+        columns += ['Lower Bound', 'Upper Bound']
     
     # Mark historical data
     historical_df = historical_data.copy()
     historical_df['Type'] = 'Historical'
     
     # Combine historical and forecasted data
-    result = pd.concat([historical_df[['Date', 'Price', 'Type']], future_df[['Date', 'Price', 'Type']]])
+    result = pd.concat([historical_df[['Date', 'Price', 'Type']], future_df[columns]])
     
     return result
 
-def should_cost_model(material_name, components):
+# Forecasters available to batch and parallel runs, by name
+FORECASTERS = {
+    'simple': simple_forecast,
+    'advanced': advanced_forecast,
+}
+
+def _series_items(series):
+    """(name, DataFrame with Date and Price) pairs from a dict or a wide panel"""
+    if isinstance(series, pd.DataFrame):
+        panel = series.set_index('Date') if 'Date' in series.columns else series
+        return [
+            (name, pd.DataFrame({'Date': panel.index, 'Price': panel[name].to_numpy()}).dropna())
+            for name in panel.columns
+        ]
+    return list(series.items())
+
+def _forecast_chunk(method, items, periods, interval=None):
+    """Worker task: forecast a chunk of series with one forecaster"""
+    forecaster = FORECASTERS[method]
+    return [forecaster(data, periods, interval=interval).assign(Series=name) for name, data in items]
+
+def forecast_parallel(series, periods=6, method='advanced', n_jobs=None, chunk_size=None, interval=None):
+    """
+    Forecast many series across a process pool
+    
+    Series are grouped into chunks so each worker task amortizes its
+    scheduling and pickling cost over several fits, and results are gathered
+    in input order. Forests fitted by workers land in the shared model cache.
+    
+    Args:
+        series: Dict of name -> DataFrame with 'Date' and 'Price' columns, or a
+            wide panel as taken by forecast_many
+        periods: Number of periods to forecast
+        method: Key of FORECASTERS
+        n_jobs: Worker processes (defaults to the CPU count; 1 runs inline)
+        chunk_size: Series per task (defaults to about four tasks per worker)
+        interval: Optional prediction-interval coverage, passed to the forecaster
+    
+    Returns:
+        Long DataFrame with 'Series', 'Date', 'Price' and 'Type' columns, in
+        input series order
+    """
+    if method not in FORECASTERS:
+        raise ValueError(f"Unknown forecaster '{method}'. Available: {', '.join(FORECASTERS)}")
+    
+    items = _series_items(series)
+    if not items:
+        return pd.DataFrame(columns=['Series', 'Date', 'Price', 'Type'])
+    
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(items))
+    chunk_size = chunk_size or max(1, math.ceil(len(items) / (n_jobs * 4)))
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    
+    if n_jobs == 1:
+        results = [_forecast_chunk(method, chunk, periods, interval) for chunk in chunks]
+    else:
+        # Spawn rather than fork: the Streamlit server process is multi-threaded
+        with ProcessPoolExecutor(max_workers=n_jobs, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results = list(executor.map(_forecast_chunk, [method] * len(chunks), chunks,
+                                        [periods] * len(chunks), [interval] * len(chunks)))
+    
+    frames = [frame for chunk in results for frame in chunk]
+    result = pd.concat(frames, ignore_index=True)
+    columns = ['Series', 'Date', 'Price', 'Type']
+    if interval is not None:
+        columns += ['Lower Bound', 'Upper Bound']
+    return result[columns]
+
+def should_cost_model(material_name, components, rng_context=None):
     """
     Generate a simple should-cost model based on components
     
     Args:
         material_name: Name of the material
         components: Dictionary of components and their weights
+        rng_context: Optional RNGContext (or numpy Generator) for reproducible draws
     
     Returns:
         Dictionary with cost breakdown
     """
+    rng = resolve_rng(rng_context, "should_cost", material_name, reproducible=False)
+    
     # Base costs for some common components ($/kg)
-    base_costs = {
-        'labor': np.random.uniform(20, 50),
-        'overhead': np.random.uniform(10, 30),
-        'raw_material': np.random.uniform(5, 30),
-        'packaging': np.random.uniform(1, 10),
-        'logistics': np.random.uniform(2, 15),
-        'energy': np.random.uniform(2, 10),
-        'additives': np.random.uniform(8, 25),
-    }
+    base_costs = {component: rng.uniform(low, high) for component, (low, high) in COMPONENT_COST_RANGES.items()}
     
     # Cost breakdown
     cost_breakdown = {}
@@ -178,13 +705,13 @@ def should_cost_model(material_name, components):
         if component in base_costs:
             cost = base_costs[component] * weight
         else:
-            cost = np.random.uniform(5, 30) * weight
+            cost = rng.uniform(*DEFAULT_COST_RANGE) * weight
         
         cost_breakdown[component] = cost
         total_cost += cost
     
     # Add markup
-    markup_pct = np.random.uniform(0.1, 0.3)
+    markup_pct = rng.uniform(*MARKUP_RANGE)
     markup = total_cost * markup_pct
     cost_breakdown['markup'] = markup
     total_cost += markup
@@ -0,0 +1,300 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from utils.fetcher import DEFAULT_TIMEOUT
+from utils.http_session import http_get
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Downloaded pages and their extracted text, shared by every session on this machine
+HTTP_CACHE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', '.http_cache'))
+
+# Bumped when the extraction output changes, so stale extractions are not reused
+EXTRACTION_VERSION = 1
+
+# Default disk budget and age after which unused entries are dropped
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+# Least time between TTL sweeps; the disk budget is also checked as bytes are written
+EVICT_INTERVAL_SECONDS = 10 * 60
+
+# Share of the disk budget an over-budget sweep frees down to, leaving headroom for the next writes
+EVICT_LOW_WATER = 0.9
+
+
+def body_hash(body):
+    """Content address of a response body"""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+class HttpCache:
+    """
+    On-disk HTTP cache with conditional revalidation and an extraction cache.
+
+    Layout under root:
+        bodies/{hash}.bin      response bodies, stored once per distinct content
+        urls/{key}.json        per-URL validators (ETag, Last-Modified) and body hash
+        extracted/{hash}.json  extracted text of a body, by body hash
+
+    A cached URL is always revalidated with If-None-Match / If-Modified-Since;
+    a 304 is answered from disk, so an unchanged page costs one small round
+    trip. Because extractions are keyed by body hash, an unchanged page (or
+    the same page under another URL) is never parsed twice. File modification
+    times double as last-use times for TTL and size-based eviction. The TTL
+    sweep runs at most every EVICT_INTERVAL_SECONDS while the cache is in use;
+    bytes written since the last sweep are counted, and a write that could take
+    the cache past max_bytes triggers a sweep straight away.
+    """
+
+    def __init__(self, root=HTTP_CACHE_ROOT, max_bytes=DEFAULT_MAX_BYTES, ttl_seconds=DEFAULT_TTL_SECONDS):
+        """
+        Args:
+            root: Directory holding the cache
+            max_bytes: Disk budget; least recently used files are evicted beyond it
+            ttl_seconds: Files unused for longer than this are evicted
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._last_evict = 0.0
+        # Bytes on disk at the last sweep, and bytes written since
+        self._swept_bytes = 0
+        self._written_bytes = 0
+
+    def _path(self, kind, key, suffix):
+        return os.path.join(self.root, kind, f"{key}{suffix}")
+
+    @staticmethod
+    def _url_key(url):
+        return hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _touch(path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _write(self, path, data):
+        """Atomically write bytes to path"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        finally:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+
+        with self._lock:
+            self._written_bytes += len(data)
+            over_budget = self._swept_bytes + self._written_bytes > self.max_bytes
+        if over_budget:
+            self.evict()
+        else:
+            self._maybe_evict()
+
+    def _maybe_evict(self):
+        """Run evict() if the last sweep was more than EVICT_INTERVAL_SECONDS ago"""
+        now = time.time()
+        with self._lock:
+            if now - self._last_evict < EVICT_INTERVAL_SECONDS:
+                return
+            self._last_evict = now
+        self.evict()
+
+    def _read_json(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _cached_body(self, entry):
+        """Body of a URL entry, or None if it has been evicted"""
+        if not entry:
+            return None
+        path = self._path("bodies", entry["body_hash"], ".bin")
+        try:
+            with open(path, "rb") as f:
+                body = f.read()
+        except FileNotFoundError:
+            return None
+        self._touch(path)
+        return body
+
+    def fetch(self, url, timeout=DEFAULT_TIMEOUT, session=None):
+        """
+        GET a URL, revalidating any cached copy with a conditional request.
+
+        Args:
+            url: URL to fetch
+            timeout: Request timeout in seconds
+            session: Optional requests.Session to send the request with
+                (defaults to the shared pooled session)
+
+        Returns:
+            Dictionary with status (the origin's status; 200 for a revalidated
+            copy), body bytes, body_hash and from_cache (True when served from
+            disk after a 304)
+        """
+        # Revalidated pages cause no writes, so the TTL is enforced from here too
+        self._maybe_evict()
+        index_path = self._path("urls", self._url_key(url), ".json")
+        entry = self._read_json(index_path)
+        cached_body = self._cached_body(entry)
+
+        headers = {}
+        if cached_body is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        if session is not None:
+            response = session.get(url, timeout=timeout, headers=headers)
+        else:
+            response = http_get(url, timeout, headers)
+        if response.status_code == 304 and cached_body is not None:
+            self._touch(index_path)
+            return {"status": 200, "body": cached_body, "body_hash": entry["body_hash"], "from_cache": True}
+
+        body = response.content
+        digest = body_hash(body)
+        if response.status_code == 200:
+            body_path = self._path("bodies", digest, ".bin")
+            if os.path.exists(body_path):
+                self._touch(body_path)
+            else:
+                self._write(body_path, body)
+            entry = {
+                "url": url,
+                "body_hash": digest,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+            }
+            self._write(index_path, json.dumps(entry).encode("utf-8"))
+        return {"status": response.status_code, "body": body, "body_hash": digest, "from_cache": False}
+
+    def get(self, url, timeout=DEFAULT_TIMEOUT):
+        """(status, body) for url through the cache; usable as the fetch engine's get"""
+        fetched = self.fetch(url, timeout)
+        return fetched["status"], fetched["body"]
+
+    def _extraction_path(self, digest, name):
+        return self._path("extracted", f"{digest}-{name}-v{EXTRACTION_VERSION}", ".json")
+
+    def get_extraction(self, digest, name):
+        """Cached output of extraction name for a body hash, or None"""
+        path = self._extraction_path(digest, name)
+        cached = self._read_json(path)
+        if cached is None:
+            return None
+        self._touch(path)
+        return cached["output"]
+
+    def put_extraction(self, digest, name, output):
+        """Store the JSON-serializable output of extraction name for a body hash"""
+        self._write(self._extraction_path(digest, name), json.dumps({"output": output}).encode("utf-8"))
+
+    def extract(self, digest, extractor, *args, name=None):
+        """
+        Extraction of a body, computed once per body hash.
+
+        Args:
+            digest: body_hash of the body being extracted
+            extractor: Callable producing JSON-serializable output from *args
+            *args: Arguments for extractor, typically the page body
+            name: Cache key of the extraction (defaults to the extractor's name)
+
+        Returns:
+            The (possibly cached) extractor output
+        """
+        name = name or getattr(extractor, '__name__', 'extract')
+        output = self.get_extraction(digest, name)
+        if output is None:
+            output = extractor(*args)
+            self.put_extraction(digest, name, output)
+        return output
+
+    def _entries(self):
+        """(mtime, size, path) of every cached file"""
+        entries = []
+        for kind in ("bodies", "urls", "extracted"):
+            directory = os.path.join(self.root, kind)
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self):
+        """
+        Remove files unused for ttl_seconds, then least recently used ones
+        beyond max_bytes (down to EVICT_LOW_WATER of it once over budget)
+        """
+        with self._lock:
+            self._last_evict = time.time()
+            self._written_bytes = 0
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        budget = self.max_bytes if total <= self.max_bytes else self.max_bytes * EVICT_LOW_WATER
+        cutoff = time.time() - self.ttl_seconds
+        removed = 0
+        for mtime, size, path in entries:
+            if mtime >= cutoff and total <= budget:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        with self._lock:
+            self._swept_bytes = total
+        if removed:
+            logger.info(f"Evicted {removed} HTTP cache files")
+        return removed
+
+    def size_bytes(self):
+        """Total size of the cache on disk"""
+        return sum(size for _, size, _ in self._entries())
+
+    def clear(self):
+        """Remove every cached file"""
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_http_cache():
+    """Process-wide HTTP cache over HTTP_CACHE_ROOT"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = HttpCache()
+        return _default_cache
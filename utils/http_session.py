@@ -0,0 +1,88 @@
+"""
+Shared HTTP transport for the scrapers.
+
+Every scraping function sends its requests through one process-wide
+requests.Session. Its connection pools keep sockets to each host alive, so
+repeat visits to a supplier site skip the TCP and TLS handshakes. Responses
+are requested gzip- or brotli-compressed (brotli when the brotli package is
+installed). Blocking fetches run on one bounded thread pool, so the total
+number of scraping threads stays fixed however many sessions crawl at once.
+
+urllib3 does not pipeline requests on a connection; keep-alive reuse gives
+most of the same saving, and concurrency comes from the worker pool instead.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (compatible; ProcurementCommandCenter/1.0)"
+
+# Requests one fetch engine (utils.fetcher) keeps in flight
+MAX_CONCURRENCY = 8
+
+# Hosts with a pool kept open, and idle keep-alive connections kept per host;
+# enough for a crawl that sends all of its concurrent requests to one host
+POOL_HOSTS = 64
+CONNECTIONS_PER_HOST = MAX_CONCURRENCY
+
+# Threads shared by every blocking fetch in the process
+MAX_WORKERS = 16
+
+# gzip and deflate always; br too when brotli is installed
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+_session = None
+_executor = None
+_lock = threading.Lock()
+
+
+def create_session():
+    """A requests.Session with per-host keep-alive pools and compression enabled"""
+    session = requests.Session()
+    # Retries are handled by the fetch engine, which backs off between attempts
+    adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=CONNECTIONS_PER_HOST,
+                          max_retries=0, pool_block=False)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING})
+    return session
+
+
+def get_session():
+    """Process-wide session shared by the scrapers"""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+
+def get_executor():
+    """Process-wide thread pool for blocking fetches, bounded to MAX_WORKERS"""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="http")
+        return _executor
+
+
+def http_get(url, timeout, headers=None):
+    """
+    GET through the shared session.
+
+    Args:
+        url: URL to fetch
+        timeout: Seconds allowed for connecting and for each read
+        headers: Extra request headers (e.g. conditional validators)
+
+    Returns:
+        requests.Response
+    """
+    return get_session().get(url, timeout=timeout, headers=headers)
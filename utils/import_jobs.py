@@ -0,0 +1,188 @@
+import os
+import json
+import time
+import uuid
+import shutil
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from utils.datasets import IMPORT_ROOT
+from utils.importer import IMPORTERS, dataset_name_from_filename
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Spooled uploads and job status files live next to the imported datasets
+JOB_ROOT = os.path.join(IMPORT_ROOT, '.jobs')
+
+# Imports running at once; each worker holds about one chunk in memory
+MAX_WORKERS = 2
+
+# Minimum seconds between progress writes from a worker
+_STATUS_INTERVAL = 0.25
+
+SUPPORTED_FORMATS = tuple(IMPORTERS)
+
+_executor = None
+_futures = {}
+_lock = threading.Lock()
+
+
+def _get_executor():
+    """Create the worker pool on first use"""
+    global _executor
+    with _lock:
+        if _executor is None:
+            # Spawn rather than fork: the Streamlit server process is multi-threaded
+            _executor = ProcessPoolExecutor(max_workers=MAX_WORKERS,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+
+def _status_path(job_id):
+    return os.path.join(JOB_ROOT, f"{job_id}.status.json")
+
+
+def _write_status(status):
+    """Write a job status file atomically so pollers never read half a file"""
+    path = _status_path(status["job_id"])
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(status, f)
+    os.replace(tmp_path, path)
+
+
+def _read_status(job_id):
+    with open(_status_path(job_id)) as f:
+        return json.load(f)
+
+
+def run_import_job(job_id, source_path, file_type, name, options):
+    """
+    Worker entry point: import one spooled upload and keep its status file current.
+
+    Args:
+        job_id: Job identifier
+        source_path: Spooled copy of the upload
+        file_type: Upload extension (key of IMPORTERS)
+        name: Dataset name
+        options: Keyword arguments for the importer
+
+    Returns:
+        The importer's result dictionary
+    """
+    status = _read_status(job_id)
+    status.update(state="running", started_at=time.time())
+    _write_status(status)
+
+    last_write = [0.0]
+
+    def progress(fraction, rows):
+        now = time.time()
+        if now - last_write[0] < _STATUS_INTERVAL:
+            return
+        last_write[0] = now
+        status.update(fraction=fraction, rows=rows)
+        _write_status(status)
+
+    try:
+        with open(source_path, "rb") as f:
+            result = IMPORTERS[file_type](f, name, progress=progress, **options)
+    except Exception as e:
+        status.update(state="failed", error=str(e), finished_at=time.time())
+        _write_status(status)
+        raise
+    finally:
+        os.remove(source_path)
+
+    status.update(
+        state="done",
+        fraction=1.0,
+        rows=result["rows"],
+        columns=result["columns"],
+        path=result["path"],
+        finished_at=time.time(),
+        duration_seconds=result["duration_seconds"]
+    )
+    _write_status(status)
+    return result
+
+
+def submit_import(fileobj, filename, name=None, options=None):
+    """
+    Queue an upload for import in the background worker pool.
+
+    The upload is spooled to disk in blocks so the worker process can read it
+    without the bytes being pickled across the process boundary.
+
+    Args:
+        fileobj: Binary file object (e.g. a Streamlit UploadedFile)
+        filename: Original file name; its extension picks the parser
+        name: Dataset name (derived from filename when omitted)
+        options: Keyword arguments for the importer (e.g. delimiter, header)
+
+    Returns:
+        Job identifier for job_status()
+    """
+    file_type = os.path.splitext(filename)[1].lstrip('.').lower()
+    if file_type not in IMPORTERS:
+        raise ValueError(f"Unsupported file type '{file_type}'. Supported: {', '.join(SUPPORTED_FORMATS)}")
+
+    job_id = uuid.uuid4().hex[:12]
+    name = name or dataset_name_from_filename(filename)
+    os.makedirs(JOB_ROOT, exist_ok=True)
+    source_path = os.path.join(JOB_ROOT, f"{job_id}.upload")
+    fileobj.seek(0)
+    with open(source_path, "wb") as out:
+        shutil.copyfileobj(fileobj, out, 1 << 20)
+
+    _write_status({
+        "job_id": job_id,
+        "name": name,
+        "filename": filename,
+        "file_type": file_type,
+        "state": "queued",
+        "fraction": 0.0,
+        "rows": 0,
+        "error": None,
+        "submitted_at": time.time(),
+    })
+
+    future = _get_executor().submit(run_import_job, job_id, source_path, file_type, name, options or {})
+    with _lock:
+        _futures[job_id] = future
+    logger.info(f"Queued import job {job_id} for {filename}")
+    return job_id
+
+
+def job_status(job_id):
+    """
+    Current status of an import job, cheap enough to poll on every rerun.
+
+    Returns:
+        Dictionary with job_id, name, filename, state ('queued', 'running',
+        'done' or 'failed'), fraction, rows and error; finished jobs submitted
+        from this process also carry the result preview
+    """
+    status = _read_status(job_id)
+    with _lock:
+        future = _futures.get(job_id)
+    if future is not None and future.done():
+        error = future.exception()
+        if error is not None:
+            # Covers workers that died before they could record the failure
+            if status["state"] != "failed":
+                status.update(state="failed", error=str(error) or type(error).__name__)
+        else:
+            status["preview"] = future.result()["preview"]
+    return status
+
+
+def list_import_jobs():
+    """Status of every known import job, newest first"""
+    if not os.path.isdir(JOB_ROOT):
+        return []
+    statuses = [job_status(f[:-len(".status.json")]) for f in os.listdir(JOB_ROOT) if f.endswith(".status.json")]
+    return sorted(statuses, key=lambda s: s["submitted_at"], reverse=True)
@@ -0,0 +1,465 @@
+import os
+import re
+import json
+import time
+import threading
+import logging
+import warnings
+import pandas as pd
+from utils.datasets import imported_dataset_path, IMPORT_ROOT
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Rows per chunk; peak memory is roughly one chunk plus the Parquet row group being written
+DEFAULT_CHUNK_ROWS = 100_000
+
+# Rows read up front to infer column types
+DEFAULT_SAMPLE_ROWS = 10_000
+
+# Share of non-empty sample values that must parse as dates for a text column to become a date
+_DATE_PARSE_THRESHOLD = 0.9
+
+
+def dataset_name_from_filename(filename):
+    """Turn an uploaded file name into a safe dataset name"""
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    return re.sub(r'[^A-Za-z0-9_-]+', '_', stem).strip('_').lower() or "upload"
+
+
+def infer_csv_schema(sample):
+    """
+    Infer column types from a sample frame.
+
+    Numeric columns become float64, even when every sampled value is an
+    integer: a price or quantity column may hold decimals or blanks past the
+    sample, and the Parquet schema is fixed by the first chunk. Text columns
+    that mostly parse as dates become dates, and everything else is read as
+    string.
+
+    Returns:
+        (dtype mapping for read_csv, list of date columns)
+    """
+    dtypes = {}
+    date_columns = []
+    for column in sample.columns:
+        values = sample[column]
+        if pd.api.types.is_bool_dtype(values):
+            dtypes[column] = "boolean"
+        elif pd.api.types.is_numeric_dtype(values):
+            dtypes[column] = "float64"
+        else:
+            non_empty = values.dropna()
+            with warnings.catch_warnings():
+                # Free-text columns trip pandas' "could not infer format" warning
+                warnings.simplefilter("ignore", UserWarning)
+                parsed = pd.to_datetime(non_empty, errors='coerce') if len(non_empty) else non_empty
+            if len(non_empty) and parsed.notna().mean() >= _DATE_PARSE_THRESHOLD:
+                date_columns.append(column)
+            dtypes[column] = "string"
+    return dtypes, date_columns
+
+
+def _file_size(fileobj):
+    """Total size of a seekable file object, or None"""
+    size = getattr(fileobj, "size", None)
+    if size is not None:
+        return size
+    try:
+        position = fileobj.tell()
+        fileobj.seek(0, os.SEEK_END)
+        size = fileobj.tell()
+        fileobj.seek(position)
+        return size
+    except (AttributeError, OSError):
+        return None
+
+
+def _write_dataset(chunks, name, empty, progress=None):
+    """
+    Append DataFrame chunks to the dataset's Parquet file as row groups.
+
+    The file is written next to its final path and moved into place only once
+    complete, so readers never see a partial import.
+
+    Args:
+        chunks: Iterable of (chunk, fraction done or None)
+        name: Dataset name
+        empty: Frame with the expected columns, stored when there are no chunks
+        progress: Optional callback progress(fraction, rows_done)
+
+    Returns:
+        (path, rows written)
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = imported_dataset_path(name)
+    os.makedirs(IMPORT_ROOT, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    writer = None
+    schema = None
+    rows = 0
+    try:
+        for chunk, fraction in chunks:
+            chunk.columns = [str(c) for c in chunk.columns]
+
+            # Fix the schema on the first chunk so all-null columns in later chunks still match
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                schema = table.schema
+                writer = pq.ParquetWriter(tmp_path, schema)
+            else:
+                table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            writer.write_table(table)
+            rows += len(chunk)
+
+            if progress is not None:
+                progress(fraction, rows)
+
+        if writer is None:
+            # No data rows: store an empty table with the expected columns
+            empty = empty.iloc[0:0].copy()
+            empty.columns = [str(c) for c in empty.columns]
+            pq.write_table(pa.Table.from_pandas(empty, preserve_index=False), tmp_path)
+        else:
+            writer.close()
+            writer = None
+        os.replace(tmp_path, path)
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    if progress is not None:
+        progress(1.0, rows)
+    return path, rows
+
+
+def _import_result(name, path, rows, preview, dtypes, date_columns, start_time):
+    duration = time.time() - start_time
+    logger.info(f"Imported {rows} rows into dataset '{name}' in {duration:.2f}s")
+    return {
+        "name": name,
+        "path": path,
+        "rows": rows,
+        "columns": [str(c) for c in preview.columns],
+        "dtypes": {str(k): v for k, v in dtypes.items()},
+        "date_columns": [str(c) for c in date_columns],
+        "preview": preview,
+        "duration_seconds": duration,
+    }
+
+
+def _byte_fraction(fileobj, total_bytes):
+    """Share of the file consumed so far, from the file position"""
+    try:
+        position = fileobj.tell()
+    except (AttributeError, OSError):
+        return None
+    return min(1.0, position / total_bytes) if total_bytes else None
+
+
+def import_csv_stream(fileobj, name, delimiter=',', encoding='utf-8', header=True,
+                      chunk_rows=DEFAULT_CHUNK_ROWS, sample_rows=DEFAULT_SAMPLE_ROWS, progress=None):
+    """
+    Stream a CSV upload into the columnar dataset store chunk by chunk.
+
+    The file is never decoded into one string: types are inferred from a sample,
+    then the file is re-read in chunks of chunk_rows rows, each chunk appended to
+    a Parquet file as a row group. Peak memory depends on chunk_rows, not on the
+    file size.
+
+    Args:
+        fileobj: Binary, seekable file object (e.g. a Streamlit UploadedFile)
+        name: Dataset name to store the import under
+        delimiter, encoding, header: CSV dialect
+        chunk_rows: Rows per chunk
+        sample_rows: Rows used to infer column types
+        progress: Optional callback progress(fraction, rows_done)
+
+    Returns:
+        Dictionary with name, path, rows, columns, dtypes, preview and duration_seconds
+    """
+    start_time = time.time()
+    total_bytes = _file_size(fileobj)
+    read_options = dict(sep=delimiter, encoding=encoding, header=0 if header else None)
+
+    fileobj.seek(0)
+    sample = pd.read_csv(fileobj, nrows=sample_rows, **read_options)
+    dtypes, date_columns = infer_csv_schema(sample)
+    preview = sample.head(5)
+    del sample
+
+    # Numeric columns are read as text and coerced per chunk, as _conform does, so a
+    # stray value past the sample becomes a blank instead of failing the import
+    numeric_columns = [c for c, dtype in dtypes.items() if dtype == "float64"]
+    read_dtypes = {c: (object if c in numeric_columns else dtype) for c, dtype in dtypes.items()}
+
+    def chunks():
+        fileobj.seek(0)
+        for chunk in pd.read_csv(fileobj, chunksize=chunk_rows, dtype=read_dtypes, **read_options):
+            for column in numeric_columns:
+                values = chunk[column]
+                chunk[column] = pd.to_numeric(values, errors='coerce').astype("float64")
+                unparsed = int(values.notna().sum() - chunk[column].notna().sum())
+                if unparsed:
+                    logger.warning(f"Stored {unparsed} non-numeric values in column '{column}' as blanks")
+            for column in date_columns:
+                chunk[column] = pd.to_datetime(chunk[column], errors='coerce')
+            yield chunk, _byte_fraction(fileobj, total_bytes)
+
+    path, rows = _write_dataset(chunks(), name, preview, progress)
+    return _import_result(name, path, rows, preview, dtypes, date_columns, start_time)
+
+
+def infer_record_schema(sample):
+    """
+    Infer column types for record sources (Excel, JSON, XML).
+
+    Same rules as infer_csv_schema, except that text columns whose values all
+    parse as numbers (XML has no other kind of value) are treated as numbers.
+    """
+    sample = sample.copy()
+    for column in sample.columns:
+        values = sample[column]
+        if values.dtype == object and values.notna().any():
+            numbers = pd.to_numeric(values, errors='coerce')
+            if numbers.notna().sum() == values.notna().sum():
+                sample[column] = numbers
+    return infer_csv_schema(sample)
+
+
+def _conform(chunk, columns, dtypes, date_columns):
+    """Give a record chunk the columns and types fixed by the first chunk"""
+    extra = [c for c in chunk.columns if c not in dtypes]
+    if extra:
+        logger.warning(f"Dropping fields not present in the first chunk: {', '.join(map(str, extra))}")
+    chunk = chunk.reindex(columns=columns)
+    for column in columns:
+        if column in date_columns:
+            chunk[column] = pd.to_datetime(chunk[column], errors='coerce')
+        elif dtypes[column] == "float64":
+            chunk[column] = pd.to_numeric(chunk[column], errors='coerce').astype("float64")
+        else:
+            chunk[column] = chunk[column].astype(dtypes[column])
+    return chunk
+
+
+def _import_records(records, name, chunk_rows, progress, position, columns=None, flatten=False):
+    """
+    Batch an iterator of records into chunks and write them as a dataset.
+
+    Args:
+        records: Iterator of dicts, or of tuples when columns is given
+        name: Dataset name
+        chunk_rows: Records per chunk
+        progress: Optional callback progress(fraction, rows_done)
+        position: Zero-argument callable returning the fraction of input consumed
+        columns: Column names for tuple records
+        flatten: Flatten nested dicts into dotted column names (JSON)
+    """
+    start_time = time.time()
+    state = {}
+
+    def batches():
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) == chunk_rows:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def chunks():
+        for batch in batches():
+            if flatten:
+                chunk = pd.json_normalize(batch)
+            else:
+                chunk = pd.DataFrame.from_records(batch, columns=columns)
+            if not state:
+                state["dtypes"], state["date_columns"] = infer_record_schema(chunk)
+                state["columns"] = list(chunk.columns)
+            chunk = _conform(chunk, state["columns"], state["dtypes"], state["date_columns"])
+            if "preview" not in state:
+                state["preview"] = chunk.head(5)
+            yield chunk, position()
+
+    path, rows = _write_dataset(chunks(), name, pd.DataFrame(columns=columns or []), progress)
+    return _import_result(name, path, rows, state.get("preview", pd.DataFrame(columns=columns or [])),
+                          state.get("dtypes", {}), state.get("date_columns", []), start_time)
+
+
+def _prepend(first, rows):
+    yield first
+    yield from rows
+
+
+def import_excel(fileobj, name, header=True, sheet=None, chunk_rows=DEFAULT_CHUNK_ROWS, progress=None):
+    """
+    Stream one worksheet into the columnar dataset store.
+
+    The workbook is opened in openpyxl's read-only mode, which reads rows
+    lazily instead of building the whole sheet in memory.
+
+    Args:
+        fileobj: Binary file object or path of an .xlsx workbook
+        name: Dataset name to store the import under
+        header: First row holds column names
+        sheet: Worksheet name (defaults to the active sheet)
+        chunk_rows: Rows per chunk
+        progress: Optional callback progress(fraction, rows_done)
+
+    Returns:
+        Dictionary with name, path, rows, columns, dtypes, preview and duration_seconds
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.active
+        total_rows = worksheet.max_row
+        rows = worksheet.iter_rows(values_only=True)
+        first = next(rows, None) or ()
+        if header:
+            columns = [str(c) if c is not None else f"column_{i}" for i, c in enumerate(first)]
+        else:
+            columns = [str(i) for i in range(len(first))]
+            rows = _prepend(first, rows)
+
+        seen = [0]
+
+        def records():
+            for row in rows:
+                seen[0] += 1
+                yield row[:len(columns)]
+
+        def position():
+            return min(1.0, seen[0] / total_rows) if total_rows else None
+
+        return _import_records(records(), name, chunk_rows, progress, position, columns=columns)
+    finally:
+        workbook.close()
+
+
+def _iter_json_records(fileobj):
+    """
+    Yield records from JSON lines, or from a JSON document holding a list.
+
+    JSON lines are parsed one line at a time. A single document has to be
+    parsed whole; if it is an object, its first list-valued field is used.
+    """
+    fileobj.seek(0)
+    head = fileobj.read(1 << 10).lstrip()
+    fileobj.seek(0)
+
+    if not head.startswith(b'['):
+        yielded = False
+        try:
+            for line in fileobj:
+                line = line.strip()
+                if line:
+                    record = json.loads(line)
+                    yielded = True
+                    yield record
+            return
+        except json.JSONDecodeError:
+            # A pretty-printed document rather than JSON lines
+            if yielded:
+                raise
+            fileobj.seek(0)
+
+    document = json.load(fileobj)
+    if isinstance(document, dict):
+        document = next((value for value in document.values() if isinstance(value, list)), [document])
+    yield from document
+
+
+def import_json(fileobj, name, chunk_rows=DEFAULT_CHUNK_ROWS, progress=None):
+    """
+    Stream JSON records into the columnar dataset store.
+
+    Nested objects are flattened into dotted column names; see
+    _iter_json_records for the accepted layouts.
+
+    Args:
+        fileobj: Binary, seekable file object
+        name: Dataset name to store the import under
+        chunk_rows: Records per chunk
+        progress: Optional callback progress(fraction, rows_done)
+
+    Returns:
+        Dictionary with name, path, rows, columns, dtypes, preview and duration_seconds
+    """
+    total_bytes = _file_size(fileobj)
+    return _import_records(_iter_json_records(fileobj), name, chunk_rows, progress,
+                           lambda: _byte_fraction(fileobj, total_bytes), flatten=True)
+
+
+def _local_name(tag):
+    """Element tag without its namespace"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _iter_xml_records(fileobj):
+    """
+    Yield one record per child of the root element, parsing incrementally.
+
+    A record holds the element's attributes plus the text of each of its
+    children; deeper nesting is reduced to the child's own text. Finished
+    records are cleared from the tree so memory stays flat.
+    """
+    from xml.etree.ElementTree import iterparse
+
+    fileobj.seek(0)
+    depth = 0
+    root = None
+    for event, element in iterparse(fileobj, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = element
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth != 1:
+            continue
+        record = {_local_name(k): v for k, v in element.attrib.items()}
+        for child in element:
+            record[_local_name(child.tag)] = (child.text or '').strip() or None
+            record.update({f"{_local_name(child.tag)}.{_local_name(k)}": v for k, v in child.attrib.items()})
+        if len(element) == 0 and element.text and element.text.strip():
+            record[_local_name(element.tag)] = element.text.strip()
+        yield record
+        root.clear()
+
+
+def import_xml(fileobj, name, chunk_rows=DEFAULT_CHUNK_ROWS, progress=None):
+    """
+    Stream an XML document into the columnar dataset store with iterparse.
+
+    Args:
+        fileobj: Binary, seekable file object
+        name: Dataset name to store the import under
+        chunk_rows: Records per chunk
+        progress: Optional callback progress(fraction, rows_done)
+
+    Returns:
+        Dictionary with name, path, rows, columns, dtypes, preview and duration_seconds
+    """
+    total_bytes = _file_size(fileobj)
+    return _import_records(_iter_xml_records(fileobj), name, chunk_rows, progress,
+                           lambda: _byte_fraction(fileobj, total_bytes), flatten=False)
+
+
+# Importer for each supported upload extension
+IMPORTERS = {
+    'csv': import_csv_stream,
+    'xlsx': import_excel,
+    'json': import_json,
+    'xml': import_xml,
+}
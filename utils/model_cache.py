@@ -0,0 +1,207 @@
+import os
+import json
+import pickle
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+import numpy as np
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Fitted models shared by every session and process on this machine
+MODEL_CACHE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', '.model_cache'))
+
+# Bumped when the stored model layout changes, so stale files are never loaded
+MODEL_CACHE_VERSION = 1
+
+# Default disk budget and number of models also kept unpickled in memory
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MEMORY_ENTRIES = 32
+
+
+def fingerprint(X, y, config):
+    """
+    Content hash of a training set and model configuration.
+
+    Two fits share a fingerprint only when the feature matrix, target and
+    configuration (model type, hyperparameters, feature list, library
+    versions) are identical.
+
+    Args:
+        X: Feature matrix
+        y: Target vector
+        config: JSON-serializable dict describing the model
+
+    Returns:
+        Hex digest usable as a cache key
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps({"version": MODEL_CACHE_VERSION, **config}, sort_keys=True, default=str).encode("utf-8"))
+    for array in (X, y):
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode("utf-8"))
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+class ModelCache:
+    """
+    On-disk registry of fitted models keyed by training-data fingerprint.
+
+    Models are pickled to one file per key, written atomically, so reruns,
+    other sessions and other processes reuse them. File modification times
+    double as the recency list: a hit touches the file, and when the
+    directory grows past max_bytes the least recently used files are removed.
+    A small in-memory LRU avoids unpickling on repeated hits in one process.
+    """
+
+    def __init__(self, root=MODEL_CACHE_ROOT, max_bytes=DEFAULT_MAX_BYTES, memory_entries=DEFAULT_MEMORY_ENTRIES):
+        """
+        Args:
+            root: Directory holding the cached models
+            max_bytes: Disk budget; least recently used models are evicted beyond it
+            memory_entries: Models kept unpickled in this process
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.root, f"{key}.pkl")
+
+    def _remember(self, key, model):
+        with self._lock:
+            self._memory[key] = model
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Return the cached model for key, or None"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                model = self._memory[key]
+            else:
+                model = None
+
+        path = self._path(key)
+        if model is not None:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            return model
+
+        try:
+            with open(path, "rb") as f:
+                model = pickle.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # Truncated or incompatible file: drop it and refit
+            logger.warning(f"Discarding unreadable cached model {key}: {str(e)}")
+            self._remove(path)
+            return None
+
+        self._remember(key, model)
+        return model
+
+    def put(self, key, model):
+        """Store a fitted model under key and enforce the disk budget"""
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        finally:
+            self._remove(tmp_path)
+
+        self._remember(key, model)
+        self.evict()
+
+    def get_or_fit(self, key, fit):
+        """
+        Return the cached model for key, fitting and storing it on a miss.
+
+        Args:
+            key: Fingerprint of the training data and configuration
+            fit: Zero-argument callable returning the fitted model
+        """
+        model = self.get(key)
+        if model is None:
+            model = fit()
+            self.put(key, model)
+        return model
+
+    def _entries(self):
+        """(mtime, size, path) of every cached model"""
+        entries = []
+        if not os.path.isdir(self.root):
+            return entries
+        for name in os.listdir(self.root):
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def evict(self):
+        """Remove least recently used models until the cache fits in max_bytes"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            with self._lock:
+                self._memory.pop(os.path.basename(path)[:-len(".pkl")], None)
+            total -= size
+            removed += 1
+        if removed:
+            logger.info(f"Evicted {removed} cached models to stay within {self.max_bytes} bytes")
+        return removed
+
+    def size_bytes(self):
+        """Total size of the cached models on disk"""
+        return sum(size for _, size, _ in self._entries())
+
+    def clear(self):
+        """Remove every cached model"""
+        for _, _, path in self._entries():
+            self._remove(path)
+        with self._lock:
+            self._memory.clear()
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_model_cache():
+    """Process-wide model cache over MODEL_CACHE_ROOT"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ModelCache()
+        return _default_cache
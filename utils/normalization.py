@@ -0,0 +1,142 @@
+import re
+import pandas as pd
+
+# Currency symbols seen in extracts and scraped pages, mapped to ISO 4217 codes
+CURRENCY_SYMBOLS = {
+    "£": "GBP",
+    "$": "USD",
+    "€": "EUR",
+    "¥": "JPY",
+}
+
+# Magnitude suffixes ("£250M", "£1.2B", "$3bn")
+MAGNITUDE_SUFFIXES = {
+    "k": 1e3,
+    "m": 1e6,
+    "mm": 1e6,
+    "b": 1e9,
+    "bn": 1e9,
+    "t": 1e12,
+}
+
+# Unit spellings mapped to a short canonical code
+UNIT_CODES = {
+    "tonne": "t",
+    "tonnes": "t",
+    "ton": "t",
+    "tons": "t",
+    "mt": "t",
+    "kg": "kg",
+    "lb": "lb",
+    "oz": "oz",
+    "m³": "m3",
+    "m3": "m3",
+    "cubic metre": "m3",
+    "gallon": "gal",
+    "gal": "gal",
+    "litre": "l",
+    "liter": "l",
+    "barrel": "bbl",
+    "bbl": "bbl",
+    "bushel": "bu",
+    "mmbtu": "MMBtu",
+    "mwh": "MWh",
+    "kwh": "kWh",
+    "unit": "unit",
+    "index": "index",
+}
+
+_MONEY_PATTERN = (
+    r'^\s*(?P<code_before>[A-Za-z]{3}\s+)?'
+    r'(?P<symbol>[£$€¥])?\s*'
+    r'(?P<number>[-+]?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?)\s*'
+    r'(?P<suffix>bn|mm|[kmbt])?\.?\s*'
+    r'(?P<code_after>[A-Za-z]{3})?\s*$'
+)
+
+
+def parse_money(values, default_currency=None):
+    """
+    Parse money strings such as "£75,000,000", "£1.2B" or "250M GBP" in one pass.
+
+    Args:
+        values: Series (or list) of money strings; numeric values pass through
+        default_currency: ISO code to use when a value carries no currency marker
+
+    Returns:
+        DataFrame with a float 'amount' column and a 'currency' code column,
+        aligned with the input index. Unparseable values give NaN / None.
+    """
+    values = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(values):
+        return pd.DataFrame({
+            'amount': values.astype(float),
+            'currency': pd.Series(default_currency, index=values.index, dtype=object)
+        })
+
+    parts = values.astype("string").str.extract(_MONEY_PATTERN, flags=re.IGNORECASE)
+
+    number = pd.to_numeric(parts['number'].str.replace(',', '', regex=False), errors='coerce')
+    magnitude = parts['suffix'].str.lower().map(MAGNITUDE_SUFFIXES).astype(float).fillna(1.0)
+    amount = (number * magnitude).astype(float)
+
+    code = parts['code_after'].fillna(parts['code_before'].str.strip()).str.upper()
+    currency = parts['symbol'].map(CURRENCY_SYMBOLS).fillna(code)
+    if default_currency is not None:
+        currency = currency.fillna(default_currency)
+    currency = currency.astype(object).where(amount.notna() & currency.notna(), None)
+
+    return pd.DataFrame({'amount': amount.to_numpy(), 'currency': currency.to_numpy()}, index=values.index)
+
+
+def parse_unit(values):
+    """
+    Map unit strings such as "tonne", "m³" or "per gallon" to canonical unit codes.
+
+    Args:
+        values: Series (or list) of unit strings
+
+    Returns:
+        Series of unit codes; unknown units are passed through lower-cased
+    """
+    values = pd.Series(values)
+    cleaned = (
+        values.astype("string")
+        .str.strip()
+        .str.lower()
+        .str.replace(r'^(?:per|/)\s*', '', regex=True)
+    )
+    return cleaned.map(UNIT_CODES).fillna(cleaned).astype(object).where(values.notna(), None)
+
+
+def normalize_frame(df, money=None, units=None, default_currency=None):
+    """
+    Add numeric money columns and unit codes to a freshly loaded frame.
+
+    For each money column "x" this adds "x_amount" (float) and "x_currency";
+    for each unit column "x" it adds "x_code". The original strings are kept
+    for display.
+
+    Args:
+        df: DataFrame to normalize (modified and returned)
+        money: Column names holding money strings
+        units: Column names holding unit strings
+        default_currency: ISO code assumed when a money value has no marker
+
+    Returns:
+        The same DataFrame with the normalized columns added
+    """
+    for column in money or []:
+        if column not in df.columns:
+            continue
+        parsed = parse_money(df[column], default_currency=default_currency)
+        df[f"{column}_amount"] = parsed['amount'].to_numpy()
+        df[f"{column}_currency"] = pd.Categorical(parsed['currency'])
+
+    for column in units or []:
+        if column not in df.columns:
+            continue
+        df[f"{column}_code"] = pd.Categorical(parse_unit(df[column]))
+
+    return df
+
@@ -0,0 +1,204 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from utils.datasets import load_dataset, dataset_path
+
+
+class RiskMatrix:
+    """
+    Materialized supplier x risk-type score matrix.
+
+    Scores live in a dense NumPy array with dictionaries mapping supplier and
+    risk-type names to row and column positions. Each cell remembers the date of
+    its assessment, so new Last_Assessment rows are applied as point updates
+    (newer assessments win) instead of re-pivoting the whole register.
+    """
+
+    def __init__(self, capacity=64):
+        """
+        Args:
+            capacity: Number of supplier rows to pre-allocate
+        """
+        self._suppliers = []
+        self._supplier_index = {}
+        self._risk_types = []
+        self._risk_type_index = {}
+        self._categories = []
+        self._category_index = {}
+        self._scores = np.full((capacity, 8), np.nan)
+        self._assessed = np.full((capacity, 8), np.datetime64('NaT'), dtype='datetime64[ns]')
+        self._supplier_category = np.full(capacity, -1, dtype=np.int64)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, df, **columns):
+        """Build a matrix from a risk register frame; see update() for column names"""
+        matrix = cls(capacity=max(64, df[columns.get('supplier_column', 'Supplier')].nunique()))
+        matrix.update(df, **columns)
+        return matrix
+
+    @property
+    def suppliers(self):
+        return list(self._suppliers)
+
+    @property
+    def risk_types(self):
+        return list(self._risk_types)
+
+    @staticmethod
+    def _positions(values, index, names):
+        """Map names to positions, registering unseen ones; vectorized over unique values"""
+        codes, uniques = pd.factorize(pd.Series(values), sort=False)
+        for name in uniques:
+            if name not in index:
+                index[name] = len(names)
+                names.append(name)
+        return np.array([index[name] for name in uniques], dtype=np.int64)[codes]
+
+    def _ensure_capacity(self):
+        """Grow the arrays (amortized doubling) to fit the registered suppliers and risk types"""
+        rows, cols = self._scores.shape
+        new_rows, new_cols = rows, cols
+        while new_rows < len(self._suppliers):
+            new_rows *= 2
+        while new_cols < len(self._risk_types):
+            new_cols *= 2
+        if (new_rows, new_cols) == (rows, cols):
+            return
+
+        scores = np.full((new_rows, new_cols), np.nan)
+        scores[:rows, :cols] = self._scores
+        assessed = np.full((new_rows, new_cols), np.datetime64('NaT'), dtype='datetime64[ns]')
+        assessed[:rows, :cols] = self._assessed
+        supplier_category = np.full(new_rows, -1, dtype=np.int64)
+        supplier_category[:rows] = self._supplier_category
+        self._scores, self._assessed, self._supplier_category = scores, assessed, supplier_category
+
+    def update(self, df, supplier_column='Supplier', risk_type_column='Risk_Type',
+               score_column='Risk_Score', date_column='Last_Assessment', category_column='Category'):
+        """
+        Apply assessments as point updates.
+
+        A cell is overwritten only when the incoming assessment is at least as
+        recent as the stored one; rows without a date always apply. New suppliers
+        and risk types are added on the fly.
+
+        Args:
+            df: Assessment rows
+
+        Returns:
+            Number of cells changed
+        """
+        if len(df) == 0:
+            return 0
+
+        with self._lock:
+            rows = self._positions(df[supplier_column], self._supplier_index, self._suppliers)
+            cols = self._positions(df[risk_type_column], self._risk_type_index, self._risk_types)
+            self._ensure_capacity()
+
+            scores = pd.to_numeric(df[score_column], errors='coerce').to_numpy(dtype=float)
+            if date_column in df.columns:
+                dates = pd.to_datetime(df[date_column]).to_numpy(dtype='datetime64[ns]')
+            else:
+                dates = np.full(len(df), np.datetime64('NaT'), dtype='datetime64[ns]')
+
+            # Within the batch keep only the latest assessment per cell
+            order = np.lexsort((dates.astype(np.int64), cols, rows))
+            rows, cols, scores, dates = rows[order], cols[order], scores[order], dates[order]
+            last = np.ones(len(rows), dtype=bool)
+            last[:-1] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+            rows, cols, scores, dates = rows[last], cols[last], scores[last], dates[last]
+
+            current = self._assessed[rows, cols]
+            apply = np.isnat(dates) | np.isnat(current) | (dates >= current)
+            self._scores[rows[apply], cols[apply]] = scores[apply]
+            self._assessed[rows[apply], cols[apply]] = dates[apply]
+
+            if category_column in df.columns:
+                category_rows = self._positions(df[category_column], self._category_index, self._categories)
+                self._supplier_category[rows] = category_rows[order][last]
+
+            return int(apply.sum())
+
+    def _view(self):
+        return self._scores[:len(self._suppliers), :len(self._risk_types)]
+
+    def heatmap(self, suppliers=None):
+        """
+        Supplier x risk-type scores ready for px.imshow.
+
+        Args:
+            suppliers: Optional list of supplier names to include (in that order)
+        """
+        scores = self._view().copy()
+        index = self._suppliers
+        if suppliers is not None:
+            scores = scores[[self._supplier_index[s] for s in suppliers]]
+            index = list(suppliers)
+        return pd.DataFrame(scores, index=pd.Index(index, name='Supplier'),
+                            columns=pd.Index(self._risk_types, name='Risk_Type'))
+
+    def top_risky(self, n=10, risk_type=None, how='mean'):
+        """
+        Return the n highest-risk suppliers.
+
+        Args:
+            n: Number of suppliers
+            risk_type: Rank on one risk type instead of an aggregate
+            how: Aggregate across risk types, 'mean' or 'max'
+
+        Returns:
+            Series of scores indexed by supplier, highest first
+        """
+        scores = self._view()
+        if len(self._suppliers) == 0:
+            return pd.Series(dtype=float, name='Risk_Score')
+        if risk_type is not None:
+            ranking = scores[:, self._risk_type_index[risk_type]]
+        else:
+            with np.errstate(invalid='ignore'):
+                ranking = np.nanmax(scores, axis=1) if how == 'max' else np.nanmean(scores, axis=1)
+        ranking = np.where(np.isnan(ranking), -np.inf, ranking)
+
+        n = min(n, len(ranking))
+        top = np.argpartition(-ranking, n - 1)[:n]
+        top = top[np.argsort(-ranking[top], kind='stable')]
+        return pd.Series(np.where(np.isinf(ranking[top]), np.nan, ranking[top]),
+                         index=[self._suppliers[i] for i in top], name='Risk_Score')
+
+    def category_averages(self):
+        """Mean score per supplier category and risk type (ignoring missing cells)"""
+        scores = self._view()
+        categories = self._supplier_category[:len(self._suppliers)]
+        known = categories >= 0
+        present = ~np.isnan(scores[known])
+
+        n_categories = len(self._categories)
+        totals = np.zeros((n_categories, scores.shape[1]))
+        counts = np.zeros((n_categories, scores.shape[1]))
+        np.add.at(totals, categories[known], np.where(present, scores[known], 0.0))
+        np.add.at(counts, categories[known], present)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            averages = totals / counts
+        return pd.DataFrame(averages, index=pd.Index(self._categories, name='Category'),
+                            columns=pd.Index(self._risk_types, name='Risk_Type'))
+
+
+# Process-wide matrix over supplier_risks.csv: (source mtime, RiskMatrix)
+_matrix_cache = {}
+_matrix_lock = threading.Lock()
+
+
+def load_risk_matrix():
+    """Return the risk matrix for supplier_risks.csv, rebuilt only when the file changes"""
+    source_mtime = os.path.getmtime(dataset_path("supplier_risks"))
+    with _matrix_lock:
+        cached = _matrix_cache.get("supplier_risks")
+        if cached is not None and cached[0] == source_mtime:
+            return cached[1]
+        matrix = RiskMatrix.from_frame(load_dataset("supplier_risks"))
+        _matrix_cache["supplier_risks"] = (source_mtime, matrix)
+        return matrix
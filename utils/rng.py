@@ -0,0 +1,73 @@
+import hashlib
+import numpy as np
+
+
+def stable_seed(*parts):
+    """
+    Derive a 64-bit seed from arbitrary key parts (category names, materials, ...).
+
+    Unlike the built-in hash(), which is salted per process, the result is the
+    same in every worker and on every restart.
+    """
+    key = "\x1f".join(str(part) for part in parts).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def make_rng(*parts):
+    """Return an independent numpy Generator seeded from the given key parts"""
+    return np.random.default_rng(stable_seed(*parts))
+
+
+class RNGContext:
+    """
+    Explicit source of randomness for one session, job or worker thread.
+    
+    Generators take a context instead of touching the global NumPy state, so
+    concurrent Streamlit sessions never reseed each other. Every call to rng()
+    returns a fresh Generator, which keeps callers free of shared mutable state
+    without any locking.
+    """
+    
+    def __init__(self, seed=None):
+        """
+        Args:
+            seed: Int or string key for reproducible streams; None draws fresh OS entropy
+        """
+        self.seed = seed
+        if seed is None:
+            self._entropy = np.random.SeedSequence().entropy
+        else:
+            self._entropy = stable_seed("rng_context", seed)
+    
+    def rng(self, *key):
+        """
+        Return a Generator for a named stream.
+        
+        The same key on contexts with the same seed always yields the same
+        numbers; different keys are statistically independent streams.
+        """
+        sequence = np.random.SeedSequence(entropy=self._entropy, spawn_key=(stable_seed(*key),))
+        return np.random.default_rng(sequence)
+    
+    def spawn(self, n):
+        """Return n independent child contexts, e.g. one per worker thread"""
+        return [RNGContext(seed=(self._entropy, "child", i)) for i in range(n)]
+
+
+def resolve_rng(rng_context, *key, reproducible=True):
+    """
+    Return the Generator a generator function should draw from.
+    
+    Args:
+        rng_context: RNGContext, numpy Generator or None
+        key: Stream name, used with a context and for the shared stable stream
+        reproducible: Without a context, True gives the shared stable stream
+            for key (make_rng) and False gives fresh entropy on every call
+    """
+    if isinstance(rng_context, np.random.Generator):
+        return rng_context
+    if rng_context is not None:
+        return rng_context.rng(*key)
+    if reproducible:
+        return make_rng(*key)
+    return np.random.default_rng()
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+from utils.rng import resolve_rng
+
+# Monthly price drift and volatility of each market scenario
+SCENARIOS = {
+    "Base Case": {"trend": 0.005, "volatility": 0.02},
+    "High Inflation": {"trend": 0.015, "volatility": 0.03},
+    "Supply Constraint": {"trend": 0.02, "volatility": 0.04},
+    "Demand Surge": {"trend": 0.025, "volatility": 0.035},
+    "Economic Downturn": {"trend": -0.01, "volatility": 0.03},
+}
+
+# Shape of the path for each forecast model: yearly and quarterly seasonal
+# amplitudes and a multiplier on the scenario volatility
+MODEL_SHAPES = {
+    "Simple Trend": {"yearly": 0.0, "quarterly": 0.0, "noise_scale": 1.0},
+    "Seasonal Model": {"yearly": 0.05, "quarterly": 0.0, "noise_scale": 1.0},
+    "Advanced ML Model": {"yearly": 0.05, "quarterly": 0.02, "noise_scale": 0.7},
+}
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+# Paths simulated per batch; bounds the float64 temporaries to BATCH_PATHS * periods
+BATCH_PATHS = 25_000
+
+
+def _path_batch(rng, n_paths, last_price, trend, volatility, shape, seasonal, model_sd):
+    """One (n_paths, periods) block of simulated prices"""
+    periods = len(seasonal)
+    step = np.arange(1, periods + 1)
+    expected = last_price * (1 + trend * step + seasonal)
+    noise = rng.standard_normal((n_paths, periods)) * (last_price * volatility * shape["noise_scale"])
+    if model_sd is not None:
+        noise += rng.standard_normal((n_paths, periods)) * model_sd
+    return expected + noise
+
+
+def simulate_scenario(last_price, dates, scenario="Base Case", model="Simple Trend", n_paths=20_000,
+                      budget=None, model_sd=None, percentiles=DEFAULT_PERCENTILES, rng_context=None):
+    """
+    Monte Carlo price paths for one market scenario, returned as summaries.
+
+    Each month's price is the scenario trend plus the model's seasonal shape
+    plus normal noise at the scenario volatility, optionally widened by the
+    forecasting model's own uncertainty (model_sd). Paths are drawn in blocks
+    of BATCH_PATHS as NumPy arrays, kept as float32 only until the percentiles
+    are taken, and never returned: callers get summaries only.
+
+    Args:
+        last_price: Latest observed price
+        dates: Forecast dates (one per simulated month)
+        scenario: Key of SCENARIOS, or a dict with trend and volatility
+        model: Key of MODEL_SHAPES
+        n_paths: Number of simulated paths
+        budget: Optional budget price for exceedance metrics
+        model_sd: Optional per-month standard deviation of the forecasting model
+            (e.g. from a prediction interval), in price units
+        percentiles: Percentiles for the fan chart
+        rng_context: Optional RNGContext; defaults to a stable stream per
+            scenario and model so reruns show the same fan
+
+    Returns:
+        Dictionary with 'fan' (DataFrame of percentiles and mean by date),
+        'prob_exceed' (Series of monthly P(price > budget)), 'prob_exceed_any'
+        (P(any month above budget)), 'expected_overrun' (mean price above
+        budget per month) and 'final' (percentiles of the last month)
+    """
+    params = SCENARIOS[scenario] if isinstance(scenario, str) else scenario
+    shape = MODEL_SHAPES[model]
+    dates = pd.DatetimeIndex(dates, name='Date')
+    periods = len(dates)
+    months_ahead = np.arange(periods)
+    seasonal = (shape["yearly"] * np.sin(2 * np.pi * (months_ahead % 12) / 12) +
+                shape["quarterly"] * np.sin(2 * np.pi * (months_ahead % 4) / 4))
+    if model_sd is not None:
+        model_sd = np.broadcast_to(np.asarray(model_sd, dtype=float), (periods,))
+
+    rng = resolve_rng(rng_context, "price_scenario", str(scenario), model)
+    blocks = []
+    total = 0.0
+    exceed = np.zeros(periods)
+    exceed_any = 0
+    overrun = np.zeros(periods)
+    for start in range(0, n_paths, BATCH_PATHS):
+        block = _path_batch(rng, min(BATCH_PATHS, n_paths - start), last_price,
+                            params["trend"], params["volatility"], shape, seasonal, model_sd)
+        total += block.sum(axis=0)
+        if budget is not None:
+            above = block > budget
+            exceed += above.sum(axis=0)
+            exceed_any += int(above.any(axis=1).sum())
+            overrun += np.maximum(block - budget, 0.0).sum(axis=0)
+        # float32 halves the memory kept for the percentile pass
+        blocks.append(block.astype(np.float32))
+
+    paths = np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+    del blocks
+    quantiles = np.percentile(paths, percentiles, axis=0)
+    fan = pd.DataFrame(quantiles.T, index=dates, columns=[f"P{p}" for p in percentiles])
+    fan["Mean"] = total / n_paths
+    final = dict(zip([f"P{p}" for p in percentiles], quantiles[:, -1].astype(float)))
+    del paths
+
+    summary = {"fan": fan, "final": final, "n_paths": n_paths}
+    if budget is not None:
+        summary["prob_exceed"] = pd.Series(exceed / n_paths, index=dates, name="P(price > budget)")
+        summary["prob_exceed_any"] = exceed_any / n_paths
+        summary["expected_overrun"] = pd.Series(overrun / n_paths, index=dates, name="Expected overrun")
+    return summary
+
+
+def simulate_scenarios(last_price, dates, scenarios=None, model="Simple Trend", n_paths=20_000,
+                       budget=None, model_sd=None, rng_context=None):
+    """
+    Run simulate_scenario for several scenarios.
+
+    Returns:
+        Dictionary of scenario name -> summary
+    """
+    scenarios = list(SCENARIOS) if scenarios is None else scenarios
+    return {
+        name: simulate_scenario(last_price, dates, name, model, n_paths=n_paths, budget=budget,
+                                model_sd=model_sd, rng_context=rng_context)
+        for name in scenarios
+    }
@@ -1,18 +1,22 @@
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import time
-import random
 import logging
-import trafilatura
+from concurrent.futures import as_completed
+from trafilatura.utils import decode_file
+from utils.rng import resolve_rng
+from utils.fetcher import iter_fetch
+from utils.http_cache import get_http_cache, body_hash
+from utils.extraction import analyze_page, analyze_in_pool, analysis_result, submit_analysis
+from utils.dedup import deduplicate, get_fingerprint_index
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def simulated_web_scrape(category):
+def simulated_web_scrape(category, rng_context=None):
     """
     Simulates web scraping for category intelligence.
     In a real implementation, this would use actual web scraping libraries
@@ -20,13 +24,24 @@ def simulated_web_scrape(category):
     
     Args:
         category: The procurement category to scrape information for
+        rng_context: Optional RNGContext (or numpy Generator) for reproducible items
     
     Returns:
-        A list of news/intelligence items related to the category
+        A list of news/intelligence items related to the category; near-duplicate
+        stories list their other sources under 'also_reported_by'
     """
     # Simulate a delay as if we're actually scraping
     time.sleep(0.5)
     
+    # Per-call generator instead of the process-wide random module state
+    rng = resolve_rng(rng_context, "web_scrape", category, reproducible=False)
+    
+    def pick(options):
+        return options[rng.integers(len(options))]
+    
+    def randint(low, high):
+        return int(rng.integers(low, high + 1))
+    
     # Create simulated news/intelligence items
     news_sources = [
         "Industry Journal", "Market Watch", "Supply Chain Weekly", 
@@ -82,45 +97,45 @@ def simulated_web_scrape(category):
     ]
     
     # Generate random news items
-    num_items = random.randint(6, 12)
+    num_items = randint(6, 12)
     news_items = []
     
     for _ in range(num_items):
         # Pick random elements
-        template = random.choice(news_templates)
-        keyword = random.choice(keywords)
-        source = random.choice(news_sources)
-        days_ago = random.randint(1, 30)
+        template = pick(news_templates)
+        keyword = pick(keywords)
+        source = pick(news_sources)
+        days_ago = randint(1, 30)
         date = (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
-        impact = random.choice(["High", "Medium", "Low"])
-        impact_score = random.randint(1, 10)
-        direction = random.choice(["increase", "decrease", "surge", "drop", "rise", "fall"])
-        percent = random.randint(5, 30)
-        reason = random.choice([
+        impact = pick(["High", "Medium", "Low"])
+        impact_score = randint(1, 10)
+        direction = pick(["increase", "decrease", "surge", "drop", "rise", "fall"])
+        percent = randint(5, 30)
+        reason = pick([
             "increased demand", "supply constraints", "weather events", 
             "geopolitical tensions", "labor shortages", "transportation issues",
             "energy costs", "raw material shortages", "manufacturing delays",
             "trade restrictions", "regulatory changes"
         ])
-        region = random.choice([
+        region = pick([
             "North America", "Europe", "Asia", "China", "Southeast Asia", 
             "Latin America", "Middle East", "Africa", "Global"
         ])
-        company = random.choice([
+        company = pick([
             "Industry Leader Corp", "Global Supplies Inc", "PrimeMaterials Ltd", 
             "TechSupply Co", "Manufacturing Giants", "ChemWorks International",
             "LogiTech Solutions", "RawSource Partners", "PackWorks Industries"
         ])
-        event = random.choice([
+        event = pick([
             "expansion", "contraction", "new facility", "plant closure", 
             "innovation", "merger", "acquisition", "strategic partnership",
             "price increase", "production cut", "capacity increase"
         ])
-        improvement = random.choice([
+        improvement = pick([
             "cost reduction", "quality improvement", "lead time reduction", 
             "capacity increase", "efficiency gain", "sustainability improvement"
         ])
-        impact = random.choice([
+        impact = pick([
             "significantly impact", "disrupt", "delay", "improve", 
             "temporarily affect", "constrain", "enhance"
         ])
@@ -152,103 +167,131 @@ def simulated_web_scrape(category):
         
         news_items.append(news_item)
     
+    # The same story often comes from several sources; keep one copy
+    news_items = deduplicate(news_items, text=lambda item: item["title"],
+                             key=lambda item: f"{item['source']}|{item['title']}", cluster=True)
+    
     # Sort by date (most recent first)
     news_items.sort(key=lambda x: x["days_ago"])
     
     return news_items
 
-def get_commodity_prices(commodity):
+# Base price and volatility by commodity type
+COMMODITY_BASE_PRICES = {
+    "Steel": {"base": 700, "volatility": 0.05},
+    "Aluminum": {"base": 2000, "volatility": 0.07},
+    "Copper": {"base": 6500, "volatility": 0.08},
+    "Zinc": {"base": 2500, "volatility": 0.06},
+    "Nickel": {"base": 14000, "volatility": 0.09},
+    "Gold": {"base": 1800, "volatility": 0.04},
+    "Silver": {"base": 25, "volatility": 0.07},
+    "Crude Oil": {"base": 60, "volatility": 0.1},
+    "Natural Gas": {"base": 3.5, "volatility": 0.15},
+    "Cotton": {"base": 80, "volatility": 0.08},
+    "Wheat": {"base": 650, "volatility": 0.12},
+    "Corn": {"base": 550, "volatility": 0.1},
+    "Soybeans": {"base": 1400, "volatility": 0.09},
+    "Coffee": {"base": 120, "volatility": 0.14},
+    "Sugar": {"base": 16, "volatility": 0.11},
+    "Ethanol": {"base": 1.6, "volatility": 0.08},
+    "PET Resin": {"base": 1000, "volatility": 0.06},
+    "Polypropylene": {"base": 1200, "volatility": 0.05},
+    "HDPE": {"base": 1100, "volatility": 0.06},
+    "Paper Pulp": {"base": 850, "volatility": 0.04}
+}
+
+# Generic model for commodities not in COMMODITY_BASE_PRICES
+DEFAULT_COMMODITY_PROFILE = {"base": 1000, "volatility": 0.08}
+
+# AR(1) coefficient of the month-to-month deviation from trend + seasonality
+MEAN_REVERSION = 0.85
+
+def synthesize_price_panel(commodities=None, months=24, end_date=None, rng_context=None):
     """
-    Simulates getting commodity price data.
-    In a real implementation, this would use API calls or web scraping
-    to get actual commodity price data.
+    Build an aligned monthly price panel for many commodities in one vectorized pass.
+    
+    Each series is trend + yearly seasonality + an AR(1) mean-reverting deviation,
+    with the AR(1) recursion applied to all columns at once as a linear filter.
+    Every commodity draws from its own stable random stream, so its series is the
+    same whether it is requested alone or alongside thousands of others.
     
     Args:
-        commodity: The commodity to get price data for
+        commodities: Commodity names (defaults to every key of COMMODITY_BASE_PRICES)
+        months: Number of month-end observations
+        end_date: Last date of the panel (defaults to now)
+        rng_context: Optional RNGContext; each commodity still gets its own stream
     
     Returns:
-        DataFrame with historical price data
+        DataFrame indexed by Date with one price column per commodity
     """
-    # Simulate API call delay
-    time.sleep(0.3)
-    
-    # Generate some random but realistic price data
-    np.random.seed(hash(commodity) % 1000)  # Use commodity name as seed
-    
-    # Generate dates for the last 2 years (monthly data)
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=730)
-    dates = pd.date_range(start=start_date, end=end_date, freq='M')
-    
-    # Base price and volatility based on commodity type
-    commodity_base_prices = {
-        "Steel": {"base": 700, "volatility": 0.05},
-        "Aluminum": {"base": 2000, "volatility": 0.07},
-        "Copper": {"base": 6500, "volatility": 0.08},
-        "Zinc": {"base": 2500, "volatility": 0.06},
-        "Nickel": {"base": 14000, "volatility": 0.09},
-        "Gold": {"base": 1800, "volatility": 0.04},
-        "Silver": {"base": 25, "volatility": 0.07},
-        "Crude Oil": {"base": 60, "volatility": 0.1},
-        "Natural Gas": {"base": 3.5, "volatility": 0.15},
-        "Cotton": {"base": 80, "volatility": 0.08},
-        "Wheat": {"base": 650, "volatility": 0.12},
-        "Corn": {"base": 550, "volatility": 0.1},
-        "Soybeans": {"base": 1400, "volatility": 0.09},
-        "Coffee": {"base": 120, "volatility": 0.14},
-        "Sugar": {"base": 16, "volatility": 0.11},
-        "Ethanol": {"base": 1.6, "volatility": 0.08},
-        "PET Resin": {"base": 1000, "volatility": 0.06},
-        "Polypropylene": {"base": 1200, "volatility": 0.05},
-        "HDPE": {"base": 1100, "volatility": 0.06},
-        "Paper Pulp": {"base": 850, "volatility": 0.04}
-    }
+    from scipy.signal import lfilter
+    
+    commodities = list(COMMODITY_BASE_PRICES) if commodities is None else list(commodities)
+    end_date = end_date if end_date is not None else datetime.now()
+    dates = pd.date_range(end=end_date, periods=months, freq='M', name='Date')
+    n_periods, n_series = len(dates), len(commodities)
+    
+    profiles = [COMMODITY_BASE_PRICES.get(c, DEFAULT_COMMODITY_PROFILE) for c in commodities]
+    base_price = np.array([p["base"] for p in profiles], dtype=float)
+    volatility = np.array([p["volatility"] for p in profiles], dtype=float)
+    
+    # Per-commodity parameters and standard-normal shocks from independent streams
+    trend = np.empty(n_series)
+    seasonality_amplitude = np.empty(n_series)
+    shocks = np.empty((n_periods, n_series))
+    for j, commodity in enumerate(commodities):
+        rng = resolve_rng(rng_context, "commodity_prices", commodity)
+        trend[j] = rng.choice([-1, 1]) * rng.uniform(0.001, 0.004)
+        seasonality_amplitude[j] = rng.uniform(0.02, 0.1)
+        shocks[:, j] = rng.standard_normal(n_periods)
+    
+    # Deterministic path: trend + yearly seasonality, shape (months, commodities)
+    step = np.arange(n_periods)[:, None]
+    month = dates.month.to_numpy()[:, None]
+    expected = base_price * (1 + trend * step) + np.sin(2 * np.pi * month / 12) * seasonality_amplitude * base_price
+    
+    # Mean-reverting deviation d[t] = MEAN_REVERSION * d[t-1] + shock[t] for every column
+    deviation = lfilter([1.0], [1.0, -MEAN_REVERSION], shocks * volatility * base_price, axis=0)
+    
+    prices = np.maximum(0.1 * base_price, expected + deviation)  # Ensure price doesn't go too low
+    return pd.DataFrame(prices, index=dates, columns=commodities)
+
+def get_commodity_price_panel(commodities=None, months=24, rng_context=None):
+    """
+    Simulates getting price data for several commodities in a single API call.
     
-    # If commodity not in our list, use a generic model
-    if commodity not in commodity_base_prices:
-        base_price = 1000
-        volatility = 0.08
-    else:
-        base_price = commodity_base_prices[commodity]["base"]
-        volatility = commodity_base_prices[commodity]["volatility"]
+    Args:
+        commodities: Commodity names (defaults to every known commodity)
+        months: Number of monthly observations
+        rng_context: Optional RNGContext for per-session streams
     
-    # Generate price with trend, seasonality, and random walk
-    prices = []
+    Returns:
+        DataFrame indexed by Date with one price column per commodity
+    """
+    # Simulate API call delay (once per batch rather than once per commodity)
+    time.sleep(0.3)
     
-    # Random trend direction
-    trend = np.random.choice([-1, 1]) * np.random.uniform(0.001, 0.004)
+    return synthesize_price_panel(commodities, months=months, rng_context=rng_context)
+
+def get_commodity_prices(commodity, rng_context=None):
+    """
+    Simulates getting commodity price data.
+    In a real implementation, this would use API calls or web scraping
+    to get actual commodity price data.
     
-    # Random seasonality amplitude
-    seasonality_amplitude = np.random.uniform(0.02, 0.1)
+    Args:
+        commodity: The commodity to get price data for
+        rng_context: Optional RNGContext for per-session streams
     
-    current_price = base_price
-    for i, date in enumerate(dates):
-        # Trend component
-        trend_component = base_price * trend * i
-        
-        # Seasonality component (yearly cycle)
-        month = date.month
-        seasonality = np.sin(2 * np.pi * month / 12) * seasonality_amplitude * base_price
-        
-        # Random walk component (month-to-month volatility)
-        if i == 0:
-            random_walk = 0
-        else:
-            random_walk = prices[-1] - (base_price + trend_component + seasonality)
-            # Mean reversion
-            random_walk = random_walk * 0.85
-            
-        # Add new random shock
-        shock = np.random.normal(0, volatility * base_price)
-        
-        # Calculate price
-        price = base_price + trend_component + seasonality + random_walk + shock
-        prices.append(max(0.1 * base_price, price))  # Ensure price doesn't go too low
+    Returns:
+        DataFrame with historical price data
+    """
+    panel = get_commodity_price_panel([commodity], rng_context=rng_context)
     
     # Create DataFrame
     df = pd.DataFrame({
-        'Date': dates,
-        'Price': prices,
+        'Date': panel.index,
+        'Price': panel[commodity].to_numpy(),
         'Currency': 'USD',
         'Unit': get_commodity_unit(commodity)
     })
@@ -295,13 +338,84 @@ def get_website_text_content(url: str) -> str:
     MLB scores: https://www.mlb.com/scores/YYYY-MM-DD
     """
     try:
-        # Send a request to the website
-        downloaded = trafilatura.fetch_url(url)
-        text = trafilatura.extract(downloaded)
+        # Send a (conditional) request to the website; unchanged pages come from the cache
+        cache = get_http_cache()
+        fetched = cache.fetch(url)
+        if fetched["status"] != 200 or not fetched["body"]:
+            return "No content could be extracted from the URL."
+        analysis = cache.extract(fetched["body_hash"], analyze_in_pool, fetched["body"], name="analyze_page")
+        text = analysis["content"]
         return text if text else "No content could be extracted from the URL."
     except Exception as e:
         return f"Error scraping content: {str(e)}"
         
+def _request_metadata(url, category=None):
+    """Metadata recorded for every scrape request"""
+    import hashlib
+    
+    return {
+        "url": url,
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "category": category if category else "Uncategorized",
+        "request_id": hashlib.md5(f"{url}{time.time()}".encode()).hexdigest()[:8]
+    }
+
+def _structure_content(url, downloaded, category, metadata, start_time, analysis=None):
+    """
+    Structure and summarize a downloaded page (steps 3-9 of scrape_with_details)
+    
+    Args:
+        url: The URL the page was fetched from
+        downloaded: Page HTML as text
+        category: Optional category to classify the content
+        metadata: Request metadata recorded before the fetch
+        start_time: time.time() when scraping started
+        analysis: analyze_page result for the page; computed inline if missing
+    
+    Returns:
+        Successful scrape_with_details result dictionary
+    """
+    # Steps 3-4: Extract text content using trafilatura and split it into paragraphs
+    if analysis is None:
+        analysis = analyze_page(downloaded)
+    content = analysis["content"]
+    paragraphs = analysis["paragraphs"]
+    
+    # Step 5: Create structured dataset with metadata
+    structured_data = {
+        "title": paragraphs[0] if paragraphs else "No title extracted",
+        "paragraphs": paragraphs,
+        "word_count": analysis["word_count"],
+        "paragraph_count": len(paragraphs),
+        "source_url": url,
+        "category": category if category else "Uncategorized",
+        "date_scraped": metadata["timestamp"]
+    }
+    
+    # Steps 6-7: Dates, time references and financial information found in the text
+    structured_data["dates_mentioned"] = analysis["dates_mentioned"]
+    structured_data["financial_references"] = analysis["financial_references"]
+    
+    # Step 8: Calculate statistics on the scraping operation
+    scraping_stats = {
+        "duration_seconds": time.time() - start_time,
+        "content_size_bytes": len(downloaded) if downloaded else 0,
+        "extracted_text_size_bytes": len(content) if content else 0,
+        "extraction_ratio": len(content) / len(downloaded) if downloaded and content else 0
+    }
+    
+    # Step 9: Compile results
+    result = {
+        "success": True,
+        "raw_html": downloaded[:5000] + "..." if len(downloaded) > 5000 else downloaded,  # Truncate large HTML
+        "raw_text": content,
+        "structured_data": structured_data,
+        "metadata": metadata,
+        "scraping_stats": scraping_stats
+    }
+    
+    return result
+    
 def scrape_with_details(url: str, category: str = None):
     """
     Enhanced scraping function that returns detailed information about the scraping process
@@ -315,76 +429,29 @@ def scrape_with_details(url: str, category: str = None):
     Returns:
         Dictionary containing raw data, structured data, metadata, and scraping stats
     """
-    import time
-    from datetime import datetime
-    import hashlib
-    
     start_time = time.time()
     
     try:
         # Step 1: Record metadata about the request
-        metadata = {
-            "url": url,
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "category": category if category else "Uncategorized",
-            "request_id": hashlib.md5(f"{url}{time.time()}".encode()).hexdigest()[:8]
-        }
+        metadata = _request_metadata(url, category)
         
-        # Step 2: Fetch raw content
-        downloaded = trafilatura.fetch_url(url)
-        if not downloaded:
+        # Step 2: Fetch raw content, revalidating any cached copy
+        cache = get_http_cache()
+        fetched = cache.fetch(url)
+        if fetched["status"] != 200 or not fetched["body"]:
             return {
                 "success": False,
-                "error": "Failed to download content",
+                "error": f"Failed to download content (HTTP {fetched['status']})",
                 "metadata": metadata,
                 "scraping_stats": {"duration_seconds": time.time() - start_time}
             }
-            
-        # Step 3: Extract text content using trafilatura
-        content = trafilatura.extract(downloaded)
+        downloaded = decode_file(fetched["body"])
         
-        # Step 4: Split into useful segments
-        paragraphs = [p for p in content.split('\n') if p.strip()] if content else []
-        
-        # Step 5: Create structured dataset with metadata
-        structured_data = {
-            "title": paragraphs[0] if paragraphs else "No title extracted",
-            "paragraphs": paragraphs,
-            "word_count": len(content.split()) if content else 0,
-            "paragraph_count": len(paragraphs),
-            "source_url": url,
-            "category": category if category else "Uncategorized",
-            "date_scraped": metadata["timestamp"]
-        }
-        
-        # Step 6: Attempt to extract dates or time references 
-        import re
-        date_pattern = r'\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{1,2},?\s+\d{4}\b'
-        dates_found = re.findall(date_pattern, content) if content else []
-        structured_data["dates_mentioned"] = dates_found
-        
-        # Step 7: Attempt to extract price or financial information
-        price_pattern = r'[\$£€¥]\s*\d+(?:,\d+)*(?:\.\d+)?|\d+(?:,\d+)*(?:\.\d+)?\s*(?:pounds|dollars|euros|GBP|USD|EUR)'
-        prices_found = re.findall(price_pattern, content) if content else []
-        structured_data["financial_references"] = prices_found
-        
-        # Step 8: Calculate statistics on the scraping operation
-        scraping_stats = {
-            "duration_seconds": time.time() - start_time,
-            "content_size_bytes": len(downloaded) if downloaded else 0,
-            "extracted_text_size_bytes": len(content) if content else 0,
-            "extraction_ratio": len(content) / len(downloaded) if downloaded and content else 0
-        }
-        
-        # Step 9: Compile results
-        result = {
-            "success": True,
-            "raw_html": downloaded[:5000] + "..." if len(downloaded) > 5000 else downloaded,  # Truncate large HTML
-            "raw_text": content,
-            "structured_data": structured_data,
-            "metadata": metadata,
-            "scraping_stats": scraping_stats
-        }
+        # Steps 3-9: Extract in a worker process (once per distinct page body), then structure and summarize
+        analysis = cache.extract(fetched["body_hash"], analyze_in_pool, fetched["body"], name="analyze_page")
+        result = _structure_content(url, downloaded, category, metadata, start_time, analysis)
+        scraping_stats = result["scraping_stats"]
+        scraping_stats["served_from_cache"] = fetched["from_cache"]
         
         logger.info(f"Successfully scraped {url} in {scraping_stats['duration_seconds']:.2f}s")
         return result
@@ -399,75 +466,139 @@ def scrape_with_details(url: str, category: str = None):
             "scraping_stats": {"duration_seconds": end_time - start_time}
         }
         
-def scrape_aviation_news(source_type="industry"):
+# Aviation news sources by type
+AVIATION_NEWS_SOURCES = {
+    "industry": [
+        "https://www.airport-technology.com/news/",
+        "https://simpleflying.com/category/aviation-news/",
+        "https://www.flightglobal.com/news/",
+    ],
+    "supplier": [
+        "https://www.airport-suppliers.com/press-releases/",
+        "https://www.aviationpros.com/airports/",
+    ],
+    "regulatory": [
+        "https://www.caa.co.uk/news/",
+        "https://www.iata.org/en/pressroom/",
+    ],
+    "heathrow": [
+        "https://mediacentre.heathrow.com/pressreleases/all",
+    ]
+}
+
+def _news_item(url, scraped_data):
+    """Structured news item from a successful scrape_with_details result"""
+    data = scraped_data["structured_data"]
+    raw_text = scraped_data.get("raw_text") or ""
+    return {
+        "title": data.get("title", "Untitled"),
+        "source": url,
+        "date_scraped": data.get("date_scraped"),
+        "content_summary": " ".join(data["paragraphs"][:3]) if data.get("paragraphs") else "",
+        "financial_references": data.get("financial_references", []),
+        "dates_mentioned": data.get("dates_mentioned", []),
+        "word_count": data.get("word_count", 0),
+        "category": "Aviation News",
+        "raw_data_sample": raw_text[:500] + "..." if len(raw_text) > 500 else raw_text
+    }
+
+def iter_aviation_news(source_type="industry", dedup_index=None, **fetch_options):
     """
-    Scrapes aviation industry news relevant to procurement from predefined sources
+    Scrape aviation news sources concurrently, yielding news items as they complete
     
     Args:
-        source_type: Type of source to scrape ("industry", "supplier", "regulatory")
+        source_type: Type of source to scrape ("industry", "supplier", "regulatory",
+            "heathrow"), or "all" for every configured source
+        dedup_index: FingerprintIndex used to skip articles already stored from
+            another source (defaults to the persistent index; False disables)
+        **fetch_options: Passed to utils.fetcher.fetch_as_completed (limits,
+            timeout, retries, or a custom get function; pages go through the
+            HTTP cache by default)
         
-    Returns:
-        List of structured news items
+    Yields:
+        Structured news items, in the order their sources finish
     """
-    sources = {
-        "industry": [
-            "https://www.airport-technology.com/news/",
-            "https://simpleflying.com/category/aviation-news/",
-            "https://www.flightglobal.com/news/",
-        ],
-        "supplier": [
-            "https://www.airport-suppliers.com/press-releases/",
-            "https://www.aviationpros.com/airports/",
-        ],
-        "regulatory": [
-            "https://www.caa.co.uk/news/",
-            "https://www.iata.org/en/pressroom/",
-        ],
-        "heathrow": [
-            "https://mediacentre.heathrow.com/pressreleases/all",
-        ]
-    }
-    
-    # Select sources based on type
-    urls_to_scrape = sources.get(source_type, sources["industry"])
-    
-    # Limit to 2 sources to avoid overwhelming the system
-    urls_to_scrape = urls_to_scrape[:2]
-    
-    # Process each source
-    results = []
-    for url in urls_to_scrape:
+    cache = get_http_cache()
+    fetch_options.setdefault("get", cache.get)
+    if dedup_index is None:
+        dedup_index = get_fingerprint_index()
+    elif dedup_index is False:
+        dedup_index = None
+
+    if source_type == "all":
+        urls_to_scrape = [url for urls in AVIATION_NEWS_SOURCES.values() for url in urls]
+    else:
+        urls_to_scrape = AVIATION_NEWS_SOURCES.get(source_type, AVIATION_NEWS_SOURCES["industry"])
+    
+    def news_item(fetched, analysis):
+        url = fetched["url"]
+        if dedup_index is not None:
+            status, matched = dedup_index.check(analysis["content"] or "", url)
+            if status == "duplicate":
+                logger.info(f"Skipping {url}: near-duplicate of {matched}")
+                return None
+        start_time = time.time() - fetched["duration_seconds"]
+        scraped_data = _structure_content(url, decode_file(fetched["body"]), "Aviation News",
+                                          _request_metadata(url, "Aviation News"), start_time, analysis)
+        logger.info(f"Successfully processed news from {url}")
+        return _news_item(url, scraped_data)
+    
+    def finish(future):
+        fetched, digest = pending.pop(future)
         try:
-            logger.info(f"Scraping aviation news from: {url}")
-            scraped_data = scrape_with_details(url, category="Aviation News")
-            
-            if scraped_data["success"]:
-                # Process the scraped content into structured news items
-                if "structured_data" in scraped_data:
-                    data = scraped_data["structured_data"]
-                    
-                    # Create a news item from the scraped data
-                    news_item = {
-                        "title": data.get("title", "Untitled"),
-                        "source": url,
-                        "date_scraped": data.get("date_scraped"),
-                        "content_summary": " ".join(data["paragraphs"][:3]) if data.get("paragraphs") else "",
-                        "financial_references": data.get("financial_references", []),
-                        "dates_mentioned": data.get("dates_mentioned", []),
-                        "word_count": data.get("word_count", 0),
-                        "category": "Aviation News",
-                        "raw_data_sample": scraped_data["raw_text"][:500] + "..." if len(scraped_data.get("raw_text", "")) > 500 else scraped_data.get("raw_text", "")
-                    }
-                    
-                    results.append(news_item)
-                    
-                    logger.info(f"Successfully processed news from {url}")
-                else:
-                    logger.warning(f"No structured data found in scraped content from {url}")
+            analysis = analysis_result(future, fetched["body"])
+            cache.put_extraction(digest, "analyze_page", analysis)
+            return news_item(fetched, analysis)
+        except Exception as e:
+            logger.error(f"Error processing {fetched['url']}: {str(e)}")
+            return None
+    
+    # Pages are extracted on the worker pool while the remaining sources download
+    pending = {}
+    try:
+        logger.info(f"Scraping aviation news from {len(urls_to_scrape)} sources")
+        for fetched in iter_fetch(urls_to_scrape, **fetch_options):
+            if not fetched["success"]:
+                logger.warning(f"Failed to scrape {fetched['url']}: {fetched['error']}")
             else:
-                logger.warning(f"Failed to scrape {url}: {scraped_data.get('error', 'Unknown error')}")
+                digest = body_hash(fetched["body"])
+                analysis = cache.get_extraction(digest, "analyze_page")
+                if analysis is not None:
+                    item = news_item(fetched, analysis)
+                    if item is not None:
+                        yield item
+                else:
+                    pending[submit_analysis(fetched["body"])] = (fetched, digest)
+            
+            for future in [f for f in pending if f.done()]:
+                item = finish(future)
+                if item is not None:
+                    yield item
         
-        except Exception as e:
-            logger.error(f"Error processing {url}: {str(e)}")
+        for future in as_completed(list(pending)):
+            item = finish(future)
+            if item is not None:
+                yield item
+    finally:
+        # Keep what was recorded even when the consumer stops early
+        if dedup_index is not None:
+            dedup_index.save()
+
+def scrape_aviation_news(source_type="industry", dedup_index=None, **fetch_options):
+    """
+    Scrapes aviation industry news relevant to procurement from predefined sources
+    
+    Every source of the requested type is fetched concurrently (see
+    iter_aviation_news); use that generator to show items as they arrive.
     
-    return results
+    Args:
+        source_type: Type of source to scrape ("industry", "supplier", "regulatory",
+            "heathrow", or "all")
+        dedup_index: See iter_aviation_news
+        **fetch_options: Passed to utils.fetcher.fetch_as_completed
+        
+    Returns:
+        List of structured news items, in completion order, without
+        near-duplicates of articles already stored from other sources
+    """
+    return list(iter_aviation_news(source_type, dedup_index, **fetch_options))
@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+from utils.rng import resolve_rng
+
+# Uniform range of the base cost of common components ($/kg)
+COMPONENT_COST_RANGES = {
+    'labor': (20, 50),
+    'overhead': (10, 30),
+    'raw_material': (5, 30),
+    'packaging': (1, 10),
+    'logistics': (2, 15),
+    'energy': (2, 10),
+    'additives': (8, 25),
+}
+
+# Range for components without a listed base cost
+DEFAULT_COST_RANGE = (5, 30)
+
+# Supplier markup as a fraction of the component subtotal
+MARKUP_RANGE = (0.1, 0.3)
+
+# Component weights of each material family
+BOM_TEMPLATES = {
+    'metals': {"raw_material": 0.6, "energy": 0.15, "labor": 0.1, "overhead": 0.05, "logistics": 0.05},
+    'electronics': {"raw_material": 0.4, "labor": 0.2, "overhead": 0.15, "energy": 0.05, "additives": 0.15},
+    'packaging': {"raw_material": 0.5, "labor": 0.15, "energy": 0.1, "overhead": 0.1, "packaging": 0.05},
+    'general': {"raw_material": 0.45, "labor": 0.25, "overhead": 0.15, "energy": 0.1, "logistics": 0.05},
+}
+
+MATERIAL_FAMILIES = {
+    'metals': ["Steel", "Aluminum", "Copper", "Zinc"],
+    'electronics': ["Semiconductors", "PCBs", "Displays"],
+    'packaging': ["Cardboard", "PET", "HDPE", "Plastic Film", "Paper"],
+}
+
+# Items evaluated together; bounds the draws held in memory to n_draws * ITEM_BATCH
+ITEM_BATCH = 256
+
+
+def bill_of_materials(material):
+    """Component weights for a material, from its family template"""
+    for family, members in MATERIAL_FAMILIES.items():
+        if material in members:
+            return dict(BOM_TEMPLATES[family])
+    return dict(BOM_TEMPLATES['general'])
+
+
+def component_range(component):
+    """Uniform (low, high) base cost range of a component"""
+    return COMPONENT_COST_RANGES.get(component, DEFAULT_COST_RANGE)
+
+
+def _weight_matrix(boms):
+    """Items, components and the (n_items, n_components) weight matrix of a catalog"""
+    items = list(boms)
+    components = []
+    for bom in boms.values():
+        components.extend(c for c in bom if c not in components)
+    index = {component: j for j, component in enumerate(components)}
+    weights = np.zeros((len(items), len(components)))
+    for i, item in enumerate(items):
+        for component, weight in boms[item].items():
+            weights[i, index[component]] = weight
+    return items, components, weights
+
+
+def simulate_should_cost(boms, n_draws=5000, adjustments=None, percentiles=(5, 50, 95),
+                         keep_draws=False, rng_context=None):
+    """
+    Monte Carlo should-cost for a whole catalog of bills of materials.
+
+    Component base costs are drawn once per draw and shared by every item, so
+    a labor or energy shock moves the whole catalog together; markups are drawn
+    per item. Totals are a matrix product of the draws with the weight matrix,
+    evaluated ITEM_BATCH items at a time.
+
+    Args:
+        boms: Dictionary of item -> {component: weight}
+        n_draws: Number of Monte Carlo draws
+        adjustments: Optional {component: percent} what-if changes to component costs
+        percentiles: Percentiles of the total cost to report
+        keep_draws: Also return the (n_draws, n_items) matrix of simulated totals
+        rng_context: Optional RNGContext (or numpy Generator) for reproducible draws
+
+    Returns:
+        Dictionary with 'summary' (DataFrame per item: Mean, Std and percentiles
+        of total cost), 'breakdown' (expected cost per item and component,
+        including markup), 'sensitivity' (tornado swings per item and driver)
+        and optionally 'draws'
+    """
+    rng = resolve_rng(rng_context, "should_cost_mc", reproducible=False)
+    items, components, weights = _weight_matrix(boms)
+    adjustments = adjustments or {}
+
+    ranges = np.array([component_range(c) for c in components], dtype=float).reshape(-1, 2)
+    factor = np.array([1 + adjustments.get(c, 0) / 100 for c in components])
+    low, high = ranges[:, 0] * factor, ranges[:, 1] * factor
+    unit_costs = rng.uniform(low, high, size=(n_draws, len(components)))
+    mean_cost = (low + high) / 2
+    markup_low, markup_high = MARKUP_RANGE
+    mean_markup = (markup_low + markup_high) / 2
+
+    columns = [f"P{p}" for p in percentiles]
+    stats = np.empty((len(items), 2 + len(percentiles)))
+    draws = np.empty((n_draws, len(items))) if keep_draws else None
+    for start in range(0, len(items), ITEM_BATCH):
+        block = slice(start, start + ITEM_BATCH)
+        subtotal = unit_costs @ weights[block].T
+        total = subtotal * (1 + rng.uniform(markup_low, markup_high, size=subtotal.shape))
+        stats[block, 0] = total.mean(axis=0)
+        stats[block, 1] = total.std(axis=0)
+        stats[block, 2:] = np.percentile(total, percentiles, axis=0).T
+        if keep_draws:
+            draws[:, block] = total
+    summary = pd.DataFrame(stats, index=pd.Index(items, name='Item'), columns=['Mean', 'Std'] + columns)
+
+    # Expected cost of each component, and markup on the expected subtotal
+    breakdown = pd.DataFrame(weights * mean_cost, index=summary.index, columns=components)
+    breakdown['markup'] = breakdown.sum(axis=1) * mean_markup
+
+    # Tornado: total at the 10th and 90th percentile of one driver, others at their mean.
+    # The model is linear in each driver, so the swings follow from the ranges directly.
+    expected_subtotal = weights @ mean_cost
+    expected_total = expected_subtotal * (1 + mean_markup)
+    spread = 0.4 * (high - low)
+    swing = weights * spread * (1 + mean_markup)
+    markup_swing = expected_subtotal * 0.4 * (markup_high - markup_low)
+    drivers = len(components) + 1
+    sensitivity = pd.DataFrame({
+        'Item': np.repeat(items, drivers),
+        'Driver': np.tile(components + ['markup'], len(items)),
+        'Swing': np.column_stack([swing, markup_swing]).ravel(),
+        'Base': np.repeat(expected_total, drivers),
+    })
+    sensitivity['Low'] = sensitivity['Base'] - sensitivity['Swing']
+    sensitivity['High'] = sensitivity['Base'] + sensitivity['Swing']
+    # Largest swing first within each item, items in catalog order
+    order = np.lexsort((-sensitivity['Swing'].to_numpy(), np.repeat(np.arange(len(items)), drivers)))
+    sensitivity = sensitivity.iloc[order]
+    sensitivity = sensitivity[sensitivity['Swing'] > 0].reset_index(drop=True)
+
+    result = {'summary': summary, 'breakdown': breakdown, 'sensitivity': sensitivity, 'n_draws': n_draws}
+    if keep_draws:
+        result['draws'] = pd.DataFrame(draws, columns=summary.index)
+    return result
@@ -1,8 +1,8 @@
 import streamlit as st
 import pandas as pd
 import base64
-from io import StringIO
 import time
+from utils.import_jobs import submit_import, job_status
 
 def setup_sidebar():
     """Configure and display the sidebar elements"""
@@ -106,25 +106,41 @@ def setup_data_management():
                 
                 # Add import button
                 if st.button("Import Data", use_container_width=True):
-                    with st.spinner("Importing data..."):
-                        time.sleep(1.5)  # Simulate processing
-                        
-                        # Show success message
-                        st.success(f"Successfully imported data from {uploaded_file.name}")
-                        
-                        # Display preview
-                        try:
-                            if file_type == 'csv':
-                                # Read CSV
-                                data = pd.read_csv(StringIO(uploaded_file.getvalue().decode('utf-8')), 
-                                                delimiter=csv_delimiter)
-                                st.dataframe(data.head(5), use_container_width=True)
-                            elif file_type == 'xlsx':
-                                # Read Excel
-                                data = pd.read_excel(uploaded_file)
-                                st.dataframe(data.head(5), use_container_width=True)
-                        except Exception as e:
-                            st.error(f"Error previewing file: {str(e)}")
+                    options = {}
+                    if file_type == 'csv':
+                        options = {"delimiter": csv_delimiter, "encoding": encoding, "header": header_row}
+                    elif file_type == 'xlsx':
+                        options = {"header": header_row}
+                    try:
+                        # Parse in the background worker pool; this session only polls the job status
+                        job_id = submit_import(uploaded_file, uploaded_file.name, options=options)
+                        st.session_state.setdefault('import_jobs', []).append(job_id)
+                    except Exception as e:
+                        st.error(f"Error importing file: {str(e)}")
+            
+            # Status of this session's import jobs
+            import_jobs = st.session_state.get('import_jobs', [])
+            if import_jobs:
+                st.write("Import jobs:")
+                pending = False
+                for job_id in reversed(import_jobs):
+                    try:
+                        status = job_status(job_id)
+                    except FileNotFoundError:
+                        continue
+                    if status["state"] in ("queued", "running"):
+                        pending = True
+                        st.progress(status["fraction"] or 0.0,
+                                    text=f"{status['filename']}: {status['state']} ({status['rows']:,} rows)")
+                    elif status["state"] == "done":
+                        st.success(f"Successfully imported {status['rows']:,} rows from {status['filename']}")
+                        if "preview" in status:
+                            with st.expander(f"Preview: {status['name']}"):
+                                st.dataframe(status["preview"], use_container_width=True)
+                    else:
+                        st.error(f"Error importing {status['filename']}: {status['error']}")
+                if pending:
+                    st.button("Refresh import status", use_container_width=True)
                             
         # Database Connection section                
         elif data_section == "Database Connection":
@@ -0,0 +1,244 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from utils.datasets import load_dataset, dataset_path
+
+
+def _month_ordinals(dates):
+    """Convert dates to integer months (year * 12 + month - 1)"""
+    dates = pd.DatetimeIndex(pd.to_datetime(dates))
+    return dates.year.to_numpy() * 12 + dates.month.to_numpy() - 1
+
+
+def _ordinal_to_period(ordinals, freq='M'):
+    """Turn integer months back into a PeriodIndex"""
+    ordinals = np.asarray(ordinals)
+    starts = pd.to_datetime(pd.DataFrame({'year': ordinals // 12, 'month': ordinals % 12 + 1, 'day': 1}))
+    return pd.PeriodIndex(starts.dt.to_period(freq))
+
+
+class SpendCube:
+    """
+    Pre-aggregated spend rollups by category and month.
+
+    Monthly, quarterly and yearly totals, rolling 12-month spend and year-over-year
+    change are kept as dense (category x period) arrays, so KPI lookups are array
+    indexing rather than a groupby over the ledger. New ledger rows are folded in
+    with append(), which only touches the periods they affect.
+    """
+
+    def __init__(self, categories=(), capacity=24):
+        """
+        Args:
+            categories: Initial category names (more are added on append)
+            capacity: Number of months to pre-allocate
+        """
+        self._categories = list(categories)
+        self._category_index = {c: i for i, c in enumerate(self._categories)}
+        self._first = None
+        self._n_months = 0
+        self._monthly = np.zeros((len(self._categories), capacity))
+        self._cumulative = np.zeros((len(self._categories), capacity + 1))
+        self._rolling_12m = np.zeros((len(self._categories), capacity))
+        self._yoy = np.full((len(self._categories), capacity), np.nan)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, df, date_column='Date', category_column='Category', value_column='Spend'):
+        """Build a cube from a ledger frame in one vectorized pass"""
+        cube = cls()
+        cube.append(df, date_column=date_column, category_column=category_column, value_column=value_column)
+        return cube
+
+    @property
+    def categories(self):
+        return list(self._categories)
+
+    @property
+    def months(self):
+        if self._first is None:
+            return pd.PeriodIndex([], freq='M')
+        return _ordinal_to_period(np.arange(self._first, self._first + self._n_months))
+
+    def _ensure_capacity(self, n_categories, first, n_months):
+        """
+        Grow the arrays (amortized doubling) to hold the requested shape.
+
+        Returns True when months were shifted and derived arrays need a full refresh.
+        """
+        shift = 0 if self._first is None else self._first - first
+        rows, cols = self._monthly.shape
+        new_rows, new_cols = max(rows, 1), max(cols, 1)
+        while new_rows < n_categories:
+            new_rows *= 2
+        while new_cols < n_months:
+            new_cols *= 2
+        if (new_rows, new_cols) == (rows, cols) and shift == 0:
+            return False
+
+        def grow(array, fill, extra=0):
+            grown = np.full((new_rows, new_cols + extra), fill)
+            used = self._n_months + extra
+            grown[:rows, shift:shift + used] = array[:, :used]
+            return grown
+
+        self._monthly = grow(self._monthly, 0.0)
+        self._cumulative = grow(self._cumulative, 0.0, extra=1)
+        self._rolling_12m = grow(self._rolling_12m, 0.0)
+        self._yoy = grow(self._yoy, np.nan)
+        return shift > 0
+
+    def append(self, df, date_column='Date', category_column='Category', value_column='Spend'):
+        """
+        Fold new ledger rows into the cube.
+
+        Rows may belong to new months, new categories or late postings for months
+        already loaded; derived rollups are recomputed only from the earliest
+        affected month onwards.
+
+        Args:
+            df: Ledger rows with date, category and value columns
+
+        Returns:
+            self, to allow chaining
+        """
+        if len(df) == 0:
+            return self
+
+        ordinals = _month_ordinals(df[date_column])
+        values = pd.to_numeric(df[value_column], errors='coerce').fillna(0).to_numpy(dtype=float)
+        codes, uniques = pd.factorize(df[category_column], sort=False)
+
+        with self._lock:
+            for category in uniques:
+                if category not in self._category_index:
+                    self._category_index[category] = len(self._categories)
+                    self._categories.append(category)
+            category_rows = np.array([self._category_index[c] for c in uniques])[codes]
+
+            lo, hi = int(ordinals.min()), int(ordinals.max())
+            first = lo if self._first is None else min(self._first, lo)
+            last = hi if self._first is None else max(self._first + self._n_months - 1, hi)
+            n_months = last - first + 1
+            had_data = self._first is not None
+            shifted = self._ensure_capacity(len(self._categories), first, n_months)
+            self._first = first
+            self._n_months = n_months
+
+            # Sum the new rows per (category, month) with one bincount
+            n_cols = self._monthly.shape[1]
+            flat = category_rows * n_cols + (ordinals - first)
+            self._monthly += np.bincount(flat, weights=values, minlength=self._monthly.size).reshape(self._monthly.shape)
+
+            self._refresh(lo - first if had_data and not shifted else 0)
+        return self
+
+    def _refresh(self, start):
+        """Recompute cumulative, rolling 12M and YoY arrays from month index start"""
+        n = self._n_months
+        monthly = self._monthly[:, :n]
+        self._cumulative[:, start + 1:n + 1] = self._cumulative[:, start:start + 1] + np.cumsum(monthly[:, start:], axis=1)
+
+        idx = np.arange(start, n)
+        window_start = np.maximum(idx - 11, 0)
+        self._rolling_12m[:, start:n] = self._cumulative[:, idx + 1] - self._cumulative[:, window_start]
+
+        prior = idx - 12
+        yoy = np.full((monthly.shape[0], len(idx)), np.nan)
+        valid = prior >= 0
+        if valid.any():
+            previous = monthly[:, prior[valid]]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                yoy[:, valid] = np.where(previous != 0, (monthly[:, idx[valid]] / previous - 1) * 100, np.nan)
+        self._yoy[:, start:n] = yoy
+
+    def _rows(self, category):
+        if category is None:
+            return slice(0, len(self._categories))
+        if category not in self._category_index:
+            raise KeyError(f"Unknown category '{category}'")
+        return [self._category_index[category]]
+
+    def _frame(self, array, category, index):
+        data = array[self._rows(category), :len(index)]
+        if category is not None:
+            return pd.Series(data[0], index=index, name=category)
+        return pd.DataFrame(data.T, index=index, columns=self._categories)
+
+    def monthly(self, category=None):
+        """Monthly spend: Series for one category, or a month x category frame"""
+        return self._frame(self._monthly, category, self.months)
+
+    def rolling_12m(self, category=None):
+        """Trailing 12-month spend at each month"""
+        return self._frame(self._rolling_12m, category, self.months)
+
+    def yoy(self, category=None):
+        """Month-over-same-month-last-year change in percent (NaN for the first year)"""
+        return self._frame(self._yoy, category, self.months)
+
+    def _rollup(self, category, freq):
+        monthly = self.monthly(category)
+        return monthly.groupby(monthly.index.asfreq(freq)).sum()
+
+    def quarterly(self, category=None):
+        """Quarterly spend totals"""
+        return self._rollup(category, 'Q')
+
+    def yearly(self, category=None):
+        """Calendar-year spend totals"""
+        return self._rollup(category, 'Y')
+
+    def kpis(self, category=None, month=None):
+        """
+        Headline spend KPIs for one category (or all categories combined).
+
+        Args:
+            category: Category name, or None for the total across categories
+            month: Month to report on (defaults to the latest month in the cube)
+
+        Returns:
+            Dictionary with month, month_spend, rolling_12m, prior_rolling_12m,
+            rolling_12m_change_pct, yoy_pct and ytd
+        """
+        if self._n_months == 0:
+            return {}
+        t = self._n_months - 1 if month is None else int(_month_ordinals([month])[0]) - self._first
+        if not 0 <= t < self._n_months:
+            raise KeyError(f"Month {month} is outside the cube")
+
+        rows = self._rows(category)
+        month_spend = self._monthly[rows, t].sum()
+        previous_year = self._monthly[rows, t - 12].sum() if t >= 12 else np.nan
+        rolling = self._rolling_12m[rows, t].sum()
+        prior_rolling = self._rolling_12m[rows, t - 12].sum() if t >= 23 else np.nan
+        year_start = t - (self._first + t) % 12
+        ytd = (self._cumulative[rows, t + 1] - self._cumulative[rows, max(year_start, 0)]).sum()
+
+        return {
+            'month': _ordinal_to_period([self._first + t])[0],
+            'month_spend': float(month_spend),
+            'rolling_12m': float(rolling),
+            'prior_rolling_12m': float(prior_rolling),
+            'rolling_12m_change_pct': float((rolling / prior_rolling - 1) * 100) if prior_rolling else np.nan,
+            'yoy_pct': float((month_spend / previous_year - 1) * 100) if previous_year else np.nan,
+            'ytd': float(ytd),
+        }
+
+
+# Process-wide cube over historical_spend.csv: (source mtime, SpendCube)
+_cube_cache = {}
+_cube_lock = threading.Lock()
+
+
+def load_spend_cube():
+    """Return the spend cube for historical_spend.csv, rebuilt only when the file changes"""
+    source_mtime = os.path.getmtime(dataset_path("historical_spend"))
+    with _cube_lock:
+        cached = _cube_cache.get("historical_spend")
+        if cached is not None and cached[0] == source_mtime:
+            return cached[1]
+        cube = SpendCube.from_frame(load_dataset("historical_spend"))
+        _cube_cache["historical_spend"] = (source_mtime, cube)
+        return cube
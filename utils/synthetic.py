@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+from utils.rng import stable_seed
+
+# Rows generated per random stream. Each block has its own SeedSequence child, so
+# a block's rows depend only on (seed, table, block index, block length) and large
+# tables can be produced batch by batch or in parallel with identical results.
+BLOCK_ROWS = 1 << 20
+
+CATEGORIES = ["Electronics", "Raw Materials", "Packaging", "Office Supplies",
+              "IT Services", "Logistics", "Chemicals", "Machinery", "Aviation"]
+
+REGIONS = ["North America", "Europe", "Asia Pacific", "Latin America", "Middle East & Africa"]
+
+CURRENCIES = ["USD", "EUR", "GBP"]
+
+
+def _resolve_seed(seed):
+    """Accept an int seed or any string key and return an int seed"""
+    if isinstance(seed, (int, np.integer)):
+        return int(seed)
+    return stable_seed(seed)
+
+
+def _block_rng(seed, table, block):
+    """Generator for one block of one table, independent of every other block"""
+    sequence = np.random.SeedSequence(
+        entropy=_resolve_seed(seed),
+        spawn_key=(stable_seed(table) & 0xFFFFFFFF, block)
+    )
+    return np.random.default_rng(sequence)
+
+
+def _iter_blocks(n_rows, block_rows):
+    """Yield (block index, first row, row count) covering n_rows"""
+    for block, start in enumerate(range(0, n_rows, block_rows)):
+        yield block, start, min(block_rows, n_rows - start)
+
+
+def generate_suppliers_table(n_suppliers, seed="synthetic", block_rows=BLOCK_ROWS):
+    """
+    Generate a supplier master table of any size.
+
+    Args:
+        n_suppliers: Number of suppliers to generate
+        seed: Int seed or string key; the same seed always gives the same table
+        block_rows: Rows per random stream (part of the table's identity)
+
+    Returns:
+        DataFrame with Supplier ID, Supplier, Category, Region, Annual Spend,
+        Risk, Performance and Tier columns
+    """
+    frames = []
+    for block, start, count in _iter_blocks(n_suppliers, block_rows):
+        rng = _block_rng(seed, "suppliers", block)
+        ids = np.arange(start + 1, start + count + 1)
+        frames.append(pd.DataFrame({
+            'Supplier ID': np.char.mod('SUP-%07d', ids),
+            'Supplier': np.char.mod('Supplier %d', ids),
+            'Category': pd.Categorical.from_codes(rng.integers(0, len(CATEGORIES), count), CATEGORIES),
+            'Region': pd.Categorical.from_codes(rng.integers(0, len(REGIONS), count), REGIONS),
+            # Heavy-tailed spend: a few suppliers carry most of the volume
+            'Annual Spend': np.round(rng.lognormal(mean=12.5, sigma=1.4, size=count), 2),
+            'Risk': rng.uniform(1, 9, size=count),
+            'Performance': rng.uniform(1, 9, size=count),
+        }))
+
+    suppliers = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+        columns=['Supplier ID', 'Supplier', 'Category', 'Region', 'Annual Spend', 'Risk', 'Performance'])
+
+    # Tiers by spend rank: top 20% Tier 1, next 30% Tier 2, rest Tier 3
+    spend_rank = suppliers['Annual Spend'].rank(ascending=False, pct=True, method='first')
+    suppliers['Tier'] = pd.Categorical(
+        np.select([spend_rank <= 0.2, spend_rank <= 0.5], ["Tier 1", "Tier 2"], default="Tier 3"),
+        categories=["Tier 1", "Tier 2", "Tier 3"]
+    )
+    return suppliers
+
+
+def iter_spend_batches(n_lines, suppliers=None, seed="synthetic", start_date=None,
+                       end_date=None, block_rows=BLOCK_ROWS):
+    """
+    Generate spend lines in vectorized batches of block_rows rows.
+
+    Suppliers are drawn in proportion to their Annual Spend, and each line takes
+    the category of its supplier, so rollups over the lines look like a real ledger.
+
+    Args:
+        n_lines: Total number of spend lines
+        suppliers: Supplier table from generate_suppliers_table (generated if None)
+        seed: Int seed or string key
+        start_date, end_date: Posting date range (defaults to the last 3 years)
+        block_rows: Rows per batch and per random stream
+
+    Yields:
+        DataFrames with Line ID, Date, Supplier ID, Supplier, Category, Amount, Currency
+    """
+    if suppliers is None:
+        suppliers = generate_suppliers_table(max(1, n_lines // 250), seed=seed)
+
+    end_date = pd.Timestamp(end_date) if end_date is not None else pd.Timestamp.now().normalize()
+    start_date = pd.Timestamp(start_date) if start_date is not None else end_date - pd.DateOffset(years=3)
+    n_days = max(1, (end_date - start_date).days + 1)
+
+    weights = suppliers['Annual Spend'].to_numpy(dtype=float)
+    cumulative = np.cumsum(weights / weights.sum())
+    # Supplier attributes as (codes, categories) so each batch is a pure integer take
+    lookups = {
+        column: (values.cat.codes.to_numpy(), values.cat.categories)
+        for column, values in (
+            (column, suppliers[column].astype('category')) for column in ('Supplier ID', 'Supplier', 'Category')
+        )
+    }
+
+    for block, start, count in _iter_blocks(n_lines, block_rows):
+        rng = _block_rng(seed, "spend", block)
+        # Inverse-CDF sampling keeps supplier selection O(log n) per line
+        picks = np.minimum(np.searchsorted(cumulative, rng.random(count)), len(cumulative) - 1)
+        yield pd.DataFrame({
+            'Line ID': np.arange(start + 1, start + count + 1, dtype=np.int64),
+            'Date': start_date + pd.to_timedelta(rng.integers(0, n_days, count), unit='D'),
+            **{column: pd.Categorical.from_codes(codes[picks], categories)
+               for column, (codes, categories) in lookups.items()},
+            'Amount': np.round(rng.lognormal(mean=7.5, sigma=1.2, size=count), 2),
+            'Currency': pd.Categorical.from_codes(rng.choice(len(CURRENCIES), count, p=[0.5, 0.3, 0.2]),
+                                                  CURRENCIES),
+        })
+
+
+def generate_spend_table(n_lines, suppliers=None, seed="synthetic", start_date=None,
+                         end_date=None, block_rows=BLOCK_ROWS):
+    """Generate a full spend-line table; see iter_spend_batches for the arguments"""
+    batches = list(iter_spend_batches(n_lines, suppliers=suppliers, seed=seed, start_date=start_date,
+                                      end_date=end_date, block_rows=block_rows))
+    if not batches:
+        return pd.DataFrame(columns=['Line ID', 'Date', 'Supplier ID', 'Supplier', 'Category', 'Amount', 'Currency'])
+    return pd.concat(batches, ignore_index=True)
+
+
+def generate_contracts_table(n_contracts, suppliers=None, seed="synthetic", as_of=None,
+                             block_rows=BLOCK_ROWS):
+    """
+    Generate a contract register of any size.
+
+    Args:
+        n_contracts: Number of contracts
+        suppliers: Supplier table from generate_suppliers_table (generated if None)
+        seed: Int seed or string key
+        as_of: Reference date for status and days to expiry (defaults to today)
+        block_rows: Rows per random stream
+
+    Returns:
+        DataFrame with Contract ID, Supplier ID, Supplier, Category, Start Date,
+        End Date, Value, Status and Days to Expiry columns
+    """
+    if suppliers is None:
+        suppliers = generate_suppliers_table(max(1, n_contracts // 3), seed=seed)
+    as_of = pd.Timestamp(as_of) if as_of is not None else pd.Timestamp.now().normalize()
+
+    supplier_ids = suppliers['Supplier ID'].to_numpy()
+    supplier_names = suppliers['Supplier'].to_numpy()
+    supplier_categories = suppliers['Category'].to_numpy()
+
+    frames = []
+    for block, start, count in _iter_blocks(n_contracts, block_rows):
+        rng = _block_rng(seed, "contracts", block)
+        picks = rng.integers(0, len(suppliers), count)
+        start_dates = as_of - pd.to_timedelta(rng.integers(30, 730, count), unit='D')
+        end_dates = start_dates + pd.to_timedelta(rng.integers(180, 1095, count), unit='D')
+        frames.append(pd.DataFrame({
+            'Contract ID': np.char.mod('CTR-%07d', np.arange(start + 1, start + count + 1)),
+            'Supplier ID': supplier_ids[picks],
+            'Supplier': supplier_names[picks],
+            'Category': supplier_categories[picks],
+            'Start Date': start_dates,
+            'End Date': end_dates,
+            'Value': rng.integers(50000, 5000000, count),
+        }))
+
+    if not frames:
+        return pd.DataFrame(columns=['Contract ID', 'Supplier ID', 'Supplier', 'Category', 'Start Date',
+                                     'End Date', 'Value', 'Status', 'Days to Expiry'])
+
+    contracts = pd.concat(frames, ignore_index=True)
+    days_to_expiry = (contracts['End Date'] - as_of).dt.days
+    contracts['Status'] = np.select([days_to_expiry < 0, days_to_expiry < 90],
+                                    ["Expired", "Expiring Soon"], default="Active")
+    contracts['Days to Expiry'] = days_to_expiry
+    return contracts